@@ -0,0 +1,70 @@
+"""Per-call latency of run_skill: ``uv run`` vs the resolved venv interpreter.
+
+    uv run python benchmarks/bench_env_resolution.py --skill cal --script main -- --a 1 --b 2 --o +
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill.environments import ENV_MODE_ENV, environment_registry
+from mcp_multiskill.load_skill import get_skill_dir, run_skill_script
+from mcp_multiskill.memo import MEMO_ENV
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+	ordered = sorted(samples)
+	return {
+		"runs": len(ordered),
+		"min_ms": round(ordered[0] * 1000, 2),
+		"median_ms": round(statistics.median(ordered) * 1000, 2),
+		"p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+		"mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+	}
+
+
+async def measure(mode: str, args: argparse.Namespace) -> dict[str, object]:
+	os.environ[ENV_MODE_ENV] = mode
+	environment_registry.invalidate()
+	started = time.perf_counter()
+	first = await run_skill_script(args.skill, args.script, args.argv)
+	first_call = time.perf_counter() - started
+	if first["returncode"] != 0:
+		raise SystemExit(f"{mode}: script failed: {first['stderr']}")
+
+	samples = []
+	for _ in range(args.runs):
+		started = time.perf_counter()
+		await run_skill_script(args.skill, args.script, args.argv)
+		samples.append(time.perf_counter() - started)
+	return {"mode": mode, "command": first["command"][:2], "first_call_ms": round(first_call * 1000, 2), **summarize(samples)}
+
+
+async def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--skill", default="cal")
+	parser.add_argument("--script", default="main")
+	parser.add_argument("--runs", type=int, default=20)
+	parser.add_argument("argv", nargs="*", default=["--a", "1", "--b", "2", "--o", "+"])
+	args = parser.parse_args()
+	get_skill_dir(args.skill)
+	# cal 声明了 cacheable，不关掉结果缓存时除第一次外测到的都是缓存命中
+	os.environ[MEMO_ENV] = "0"
+
+	results = [await measure("uv", args), await measure("direct", args)]
+	uv_median, direct_median = results[0]["median_ms"], results[1]["median_ms"]
+	print(json.dumps({"results": results, "speedup": round(uv_median / direct_median, 2)}, indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(asyncio.run(main()))
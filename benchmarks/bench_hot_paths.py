@@ -0,0 +1,185 @@
+"""Latency and throughput of the server hot paths on a synthetic skill tree.
+
+    python benchmarks/bench_hot_paths.py                       # compare with benchmarks/baseline.json
+    python benchmarks/bench_hot_paths.py --write-baseline      # record a new baseline
+    python benchmarks/bench_hot_paths.py --output result.json --fail-on-regression
+
+Runs offline: ``uv`` is replaced by a local stand-in (see ``skill_tree.py``)
+that executes scripts with the current interpreter. Timings are medians over
+``--repeat`` rounds; each metric is compared with the stored baseline and
+flagged when it is worse by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.schema_cache import CACHE_DIR_ENV, schema_cache
+from mcp_multiskill.scratch import SCRATCH_DIR_ENV
+from skill_tree import install_fake_uv, make_skill_tree
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+# 越小越好的指标以 _ms 结尾，其余（吞吐）越大越好
+LOWER_IS_BETTER_SUFFIX = "_ms"
+
+
+def median_ms(samples: list[float]) -> float:
+	return round(statistics.median(samples) * 1000, 3)
+
+
+async def bench_index(root: Path, repeat: int) -> dict[str, float]:
+	cold, warm = [], []
+	for _ in range(repeat):
+		load_skill._registries.pop(root, None)
+		started = time.perf_counter()
+		load_skill.list_skills_summary(root)
+		cold.append(time.perf_counter() - started)
+		started = time.perf_counter()
+		load_skill.list_skills_summary(root)
+		warm.append(time.perf_counter() - started)
+	return {"index_cold_ms": median_ms(cold), "index_warm_ms": median_ms(warm)}
+
+
+async def bench_render(root: Path, skills: list[str], repeat: int) -> dict[str, float]:
+	cold, disk, warm = [], [], []
+	for round_index in range(repeat):
+		name = skills[round_index % len(skills)]
+		# cold：无内存缓存、无磁盘缓存；disk：仅磁盘 schema 缓存；warm：内存中已渲染
+		schema_cache.clear()
+		load_skill._schema_tasks.clear()
+		load_skill._render_tasks.clear()
+		load_skill.render_cache.clear()
+		started = time.perf_counter()
+		await load_skill.render_skill_for_client(name, root)
+		cold.append(time.perf_counter() - started)
+
+		load_skill._schema_tasks.clear()
+		load_skill._render_tasks.clear()
+		load_skill.render_cache.clear()
+		started = time.perf_counter()
+		await load_skill.render_skill_for_client(name, root)
+		disk.append(time.perf_counter() - started)
+
+		started = time.perf_counter()
+		await load_skill.render_skill_for_client(name, root)
+		warm.append(time.perf_counter() - started)
+	return {"render_cold_ms": median_ms(cold), "render_disk_cache_ms": median_ms(disk), "render_warm_ms": median_ms(warm)}
+
+
+async def bench_run(root: Path, skill: str, concurrency: int, calls: int) -> dict[str, float]:
+	semaphore = asyncio.Semaphore(concurrency)
+	latencies: list[float] = []
+
+	async def one(index: int) -> None:
+		async with semaphore:
+			started = time.perf_counter()
+			result = await load_skill.run_skill_script(skill, "script_00", ["--input", f"file-{index}"], skills_root=root)
+			latencies.append(time.perf_counter() - started)
+			if result["returncode"] != 0:
+				raise SystemExit(f"run_skill failed: {result['stderr']}")
+
+	started = time.perf_counter()
+	await asyncio.gather(*(one(index) for index in range(calls)))
+	elapsed = time.perf_counter() - started
+	return {
+		f"run_c{concurrency}_p50_ms": median_ms(latencies),
+		f"run_c{concurrency}_calls_per_s": round(calls / elapsed, 2),
+	}
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> dict[str, dict]:
+	report = {}
+	for name, value in results.items():
+		base = baseline.get(name)
+		if not base:
+			continue
+		if name.endswith(LOWER_IS_BETTER_SUFFIX):
+			change = value / base
+		else:
+			change = base / value if value else float("inf")
+		report[name] = {
+			"baseline": base,
+			"current": value,
+			"slowdown": round(change, 3),
+			"regressed": change > 1 + tolerance,
+		}
+	return report
+
+
+async def run(args: argparse.Namespace) -> dict[str, float]:
+	with tempfile.TemporaryDirectory() as tmp:
+		workdir = Path(tmp)
+		install_fake_uv(workdir / "bin")
+		os.environ[CACHE_DIR_ENV] = str(workdir / "cache")
+		os.environ[SCRATCH_DIR_ENV] = str(workdir / "scratch")
+		root = make_skill_tree(workdir / "skills", args.skills, args.scripts, args.markdown_bytes)
+		skills = [item["name"] for item in load_skill.list_skills_summary(root)]
+
+		results: dict[str, float] = {}
+		results.update(await bench_index(root, args.repeat))
+		results.update(await bench_render(root, skills, args.repeat))
+		for concurrency in args.concurrency:
+			results.update(await bench_run(root, skills[0], concurrency, args.calls))
+		return results
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--skills", type=int, default=50)
+	parser.add_argument("--scripts", type=int, default=8)
+	parser.add_argument("--markdown-bytes", type=int, default=8192)
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--calls", type=int, default=32, help="run_skill calls per concurrency level")
+	parser.add_argument("--concurrency", type=lambda text: [int(part) for part in text.split(",")], default=[1, 4, 16])
+	parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+	parser.add_argument("--write-baseline", action="store_true")
+	parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a metric counts as regressed")
+	parser.add_argument("--fail-on-regression", action="store_true")
+	parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+	args = parser.parse_args()
+
+	results = asyncio.run(run(args))
+	report = {
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"config": {
+			"skills": args.skills,
+			"scripts": args.scripts,
+			"markdown_bytes": args.markdown_bytes,
+			"repeat": args.repeat,
+			"calls": args.calls,
+		},
+		"results": results,
+	}
+	if args.write_baseline:
+		args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+	elif args.baseline.exists():
+		baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+		report["comparison"] = compare(results, baseline.get("results", {}), args.tolerance)
+
+	text = json.dumps(report, indent=2)
+	print(text)
+	if args.output:
+		args.output.write_text(text + "\n", encoding="utf-8")
+	regressed = [name for name, item in report.get("comparison", {}).items() if item["regressed"]]
+	if regressed and args.fail_on_regression:
+		print(f"regressed: {', '.join(regressed)}", file=sys.stderr)
+		return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,305 @@
+"""Load test of the shared HTTP server with many simulated local clients.
+
+    python benchmarks/bench_http_clients.py                          # 16 light clients + 1 heavy client
+    python benchmarks/bench_http_clients.py --clients 64 --stdio-clients 4
+    python benchmarks/bench_http_clients.py --output result.json
+
+Starts ``python -m mcp_multiskill serve --transport streamable-http`` on a
+synthetic skill tree (``uv`` replaced by the offline stand-in from
+``skill_tree.py``) and connects real MCP clients to it. Light clients run
+``run_skill`` calls one after another while a heavy client keeps many
+calls queued; with fair scheduling the light clients' latency stays close
+to the script's own run time. ``--stdio-clients`` measures the first call
+of clients that each start their own stdio server, for comparison with
+the first call of a client joining the warm HTTP server. Finally the
+server gets SIGTERM while calls are running, and the report shows whether
+they all completed before it exited.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from skill_tree import SRC_DIR, install_fake_uv, make_skill_tree
+
+
+WORK_SCRIPT = """
+import argparse
+import time
+from mcp_multiskill.parser_to_schema import get_parser_json
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Sleep, then echo the request id.")
+	parser.add_argument("--id", required=True, help="Request id to echo")
+	parser.add_argument("--ms", type=int, default=50, help="Milliseconds to sleep")
+	if get_parser_json(parser):
+		exit(0)
+	args = parser.parse_args()
+	time.sleep(args.ms / 1000)
+	print(args.id)
+"""
+
+
+def make_work_skill(root: Path) -> None:
+	skill_dir = root / "load"
+	skill_dir.mkdir(parents=True)
+	(skill_dir / "SKILL.md").write_text("Sleeps for a while to simulate work.\n", encoding="utf-8")
+	(skill_dir / "pyproject.toml").write_text(
+		'[project]\nname = "load"\nversion = "0.1.0"\nrequires-python = ">=3.10"\n',
+		encoding="utf-8",
+	)
+	(skill_dir / "work.py").write_text(WORK_SCRIPT, encoding="utf-8")
+
+
+def free_port() -> int:
+	with socket.socket() as sock:
+		sock.bind(("127.0.0.1", 0))
+		return sock.getsockname()[1]
+
+
+def percentile_ms(samples: list[float], fraction: float) -> float | None:
+	if not samples:
+		return None
+	ordered = sorted(samples)
+	return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 1)
+
+
+def latency_report(samples: list[float]) -> dict[str, Any]:
+	return {
+		"calls": len(samples),
+		"p50_ms": percentile_ms(samples, 0.5),
+		"p95_ms": percentile_ms(samples, 0.95),
+		"max_ms": percentile_ms(samples, 1.0),
+	}
+
+
+def rss_mb(pid: int) -> float | None:
+	try:
+		for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+			if line.startswith("VmRSS:"):
+				return round(int(line.split()[1]) / 1024, 1)
+	except OSError:
+		return None
+	return None
+
+
+def tool_result(result: Any) -> dict[str, Any]:
+	if result.isError:
+		return {"error": result.content[0].text if result.content else "error"}
+	if result.structuredContent is not None:
+		return result.structuredContent
+	return json.loads(result.content[0].text)
+
+
+@contextlib.asynccontextmanager
+async def http_session(url: str) -> AsyncIterator[ClientSession]:
+	async with streamablehttp_client(url) as (read, write, _session_id):
+		async with ClientSession(read, write) as session:
+			await session.initialize()
+			yield session
+
+
+async def run_call(session: ClientSession, request_id: str, sleep_ms: int) -> tuple[float, dict[str, Any]]:
+	started = time.perf_counter()
+	result = await session.call_tool(
+		"run_skill",
+		{"skill_name": "load", "script_name": "work", "argv": ["--id", request_id, "--ms", str(sleep_ms)]},
+	)
+	return time.perf_counter() - started, tool_result(result)
+
+
+async def light_client(url: str, index: int, calls: int, sleep_ms: int) -> dict[str, Any]:
+	async with http_session(url) as session:
+		latencies, failures = [], 0
+		for call in range(calls):
+			seconds, payload = await run_call(session, f"light-{index}-{call}", sleep_ms)
+			latencies.append(seconds)
+			failures += payload.get("returncode") != 0
+	return {"latencies": latencies, "failures": failures}
+
+
+async def heavy_client(url: str, calls: int, parallel: int, sleep_ms: int) -> dict[str, Any]:
+	async with http_session(url) as session:
+		semaphore = asyncio.Semaphore(parallel)
+
+		async def one(call: int) -> tuple[float, dict[str, Any]]:
+			async with semaphore:
+				return await run_call(session, f"heavy-{call}", sleep_ms)
+
+		results = await asyncio.gather(*(one(call) for call in range(calls)))
+	return {
+		"latencies": [seconds for seconds, _payload in results],
+		"failures": sum(payload.get("returncode") != 0 for _seconds, payload in results),
+	}
+
+
+async def first_call(session: ClientSession, started: float) -> float:
+	await session.call_tool("get_skill", {"skill_name": "load"})
+	await run_call(session, "first", 0)
+	return time.perf_counter() - started
+
+
+async def http_first_call(url: str) -> float:
+	started = time.perf_counter()
+	async with http_session(url) as session:
+		return await first_call(session, started)
+
+
+async def stdio_first_call(env: dict[str, str]) -> float:
+	params = StdioServerParameters(command=sys.executable, args=["-m", "mcp_multiskill", "serve"], env=env)
+	started = time.perf_counter()
+	async with stdio_client(params) as (read, write):
+		async with ClientSession(read, write) as session:
+			await session.initialize()
+			return await first_call(session, started)
+
+
+async def drain_check(url: str, server: subprocess.Popen, calls: int, sleep_ms: int) -> dict[str, Any]:
+	async with http_session(url) as session:
+		running = [asyncio.ensure_future(run_call(session, f"drain-{call}", sleep_ms)) for call in range(calls)]
+		await asyncio.sleep(min(0.3, sleep_ms / 3000))
+		signalled = time.perf_counter()
+		server.send_signal(signal.SIGTERM)
+		await asyncio.sleep(0.05)
+		rejected = tool_result(await session.call_tool(
+			"run_skill",
+			{"skill_name": "load", "script_name": "work", "argv": ["--id", "late"]},
+		))
+		results = await asyncio.gather(*running, return_exceptions=True)
+	completed = sum(1 for item in results if not isinstance(item, BaseException) and item[1].get("returncode") == 0)
+	returncode = await asyncio.to_thread(server.wait, 60)
+	return {
+		"in_flight": calls,
+		"completed": completed,
+		"late_call_rejected": "error" in rejected,
+		"exit_seconds": round(time.perf_counter() - signalled, 2),
+		"returncode": returncode,
+	}
+
+
+async def wait_for_port(port: int, server: subprocess.Popen, timeout: float = 60.0) -> None:
+	deadline = time.monotonic() + timeout
+	while time.monotonic() < deadline:
+		if server.poll() is not None:
+			raise SystemExit(f"server exited with {server.returncode}")
+		with contextlib.suppress(OSError):
+			_reader, writer = await asyncio.open_connection("127.0.0.1", port)
+			writer.close()
+			return
+		await asyncio.sleep(0.1)
+	raise SystemExit("server did not start listening")
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+	with tempfile.TemporaryDirectory() as tmp:
+		workdir = Path(tmp)
+		install_fake_uv(workdir / "bin")
+		root = make_skill_tree(workdir / "skills", args.skills, 4)
+		make_work_skill(root)
+		env = dict(os.environ)
+		env.update({
+			"PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])),
+			"MCP_MULTISKILL_SKILL_ROOTS": str(root),
+			"MCP_MULTISKILL_CACHE_DIR": str(workdir / "cache"),
+			"MCP_MULTISKILL_SCRATCH_DIR": str(workdir / "scratch"),
+			"MCP_MULTISKILL_MAX_CONCURRENCY": str(args.max_concurrency),
+		})
+		port = free_port()
+		url = f"http://127.0.0.1:{port}/mcp"
+		server = subprocess.Popen(
+			[sys.executable, "-m", "mcp_multiskill", "serve", "--transport", "streamable-http", "--port", str(port)],
+			env=env,
+			stdout=subprocess.DEVNULL,
+			stderr=subprocess.DEVNULL if not args.verbose else None,
+		)
+		try:
+			await wait_for_port(port, server)
+			started = time.perf_counter()
+			heavy = asyncio.ensure_future(heavy_client(url, args.heavy_calls, args.heavy_parallel, args.sleep_ms))
+			light = await asyncio.gather(*(
+				light_client(url, index, args.calls, args.sleep_ms) for index in range(args.clients)
+			))
+			heavy_result = await heavy
+			elapsed = time.perf_counter() - started
+			total_calls = args.clients * args.calls + args.heavy_calls
+			async with http_session(url) as session:
+				stats = tool_result(await session.call_tool("get_server_stats", {}))
+			server_rss = rss_mb(server.pid)
+
+			# 空闲时新客户端加入：连接、get_skill 与一次 run_skill 的总耗时
+			http = [await http_first_call(url) for _ in range(3)]
+			stdio = [await stdio_first_call(env) for _ in range(args.stdio_clients)]
+			drain = await drain_check(url, server, args.drain_calls, args.drain_ms)
+		finally:
+			if server.poll() is None:
+				server.kill()
+				server.wait()
+
+	light_latencies = [seconds for item in light for seconds in item["latencies"]]
+	return {
+		"config": {
+			"clients": args.clients,
+			"calls_per_client": args.calls,
+			"heavy_calls": args.heavy_calls,
+			"heavy_parallel": args.heavy_parallel,
+			"sleep_ms": args.sleep_ms,
+			"max_concurrency": args.max_concurrency,
+		},
+		"calls_per_s": round(total_calls / elapsed, 1),
+		"failures": sum(item["failures"] for item in light) + heavy_result["failures"],
+		"light_clients": latency_report(light_latencies),
+		"heavy_client": latency_report(heavy_result["latencies"]),
+		"first_call_ms": {
+			"http_shared": round(statistics.median(http) * 1000, 1),
+			"stdio_own_process": round(statistics.median(stdio) * 1000, 1) if stdio else None,
+		},
+		"server_rss_mb": server_rss,
+		"scheduler": stats.get("clients"),
+		"drain": drain,
+	}
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--skills", type=int, default=50, help="Synthetic skills besides the load skill")
+	parser.add_argument("--clients", type=int, default=16, help="Light clients running calls one at a time")
+	parser.add_argument("--calls", type=int, default=10, help="run_skill calls per light client")
+	parser.add_argument("--heavy-calls", type=int, default=200)
+	parser.add_argument("--heavy-parallel", type=int, default=64, help="Calls the heavy client keeps in flight")
+	parser.add_argument("--sleep-ms", type=int, default=50, help="Run time of each script call")
+	parser.add_argument("--max-concurrency", type=int, default=8, help="MCP_MULTISKILL_MAX_CONCURRENCY of the server")
+	parser.add_argument("--stdio-clients", type=int, default=2, help="Clients that start their own stdio server")
+	parser.add_argument("--drain-calls", type=int, default=4)
+	parser.add_argument("--drain-ms", type=int, default=1500, help="Run time of the calls in flight at SIGTERM")
+	parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+	parser.add_argument("--verbose", action="store_true", help="Show the server log")
+	args = parser.parse_args()
+
+	report = asyncio.run(run(args))
+	text = json.dumps(report, indent=2)
+	print(text)
+	if args.output:
+		args.output.write_text(text + "\n", encoding="utf-8")
+	drain = report["drain"]
+	return 0 if not report["failures"] and drain["completed"] == drain["in_flight"] else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
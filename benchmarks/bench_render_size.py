@@ -0,0 +1,64 @@
+"""Size of get_skill responses: full JSON schemas vs compact signatures.
+
+    uv run python benchmarks/bench_render_size.py --scripts 50
+
+Measures every skill under skills/ plus a synthetic skill with ``--scripts``
+argparse scripts. Tokens are counted with tiktoken when installed, otherwise
+estimated as bytes / 4.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill.load_skill import list_skills_summary, render_skill_for_client
+from skill_tree import make_skill
+
+
+def token_counter():
+	try:
+		import tiktoken
+	except ImportError:
+		return "bytes/4", lambda text: len(text.encode("utf-8")) // 4
+	encoding = tiktoken.get_encoding("cl100k_base")
+	return "cl100k_base", lambda text: len(encoding.encode(text))
+
+
+async def measure(name: str, root: Path | None, count) -> dict[str, object]:
+	full = await render_skill_for_client(name, root)
+	compact = await render_skill_for_client(name, root, compact=True)
+	full_bytes, compact_bytes = len(full.encode("utf-8")), len(compact.encode("utf-8"))
+	return {
+		"skill": name,
+		"full_bytes": full_bytes,
+		"compact_bytes": compact_bytes,
+		"full_tokens": count(full),
+		"compact_tokens": count(compact),
+		"ratio": round(full_bytes / compact_bytes, 2),
+	}
+
+
+async def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--scripts", type=int, default=50, help="Scripts in the synthetic skill")
+	args = parser.parse_args()
+
+	tokenizer, count = token_counter()
+	results = [await measure(item["name"], None, count) for item in list_skills_summary()]
+	with tempfile.TemporaryDirectory() as tmp:
+		root = Path(tmp)
+		make_skill(root, "synthetic", args.scripts, markdown_bytes=0)
+		results.append(await measure("synthetic", root, count))
+	print(json.dumps({"tokenizer": tokenizer, "results": results}, indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(asyncio.run(main()))
@@ -0,0 +1,111 @@
+"""Latency of search_skills and of incremental index updates on a large synthetic catalog.
+
+    python benchmarks/bench_search.py --skills 5000
+
+Each skill gets a SKILL.md drawn from a Zipf-distributed vocabulary (so
+common words appear in most skills and rare ones in few, like real docs)
+and a couple of argparse scripts with help strings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.registry import POLL_INTERVAL_ENV
+
+VOCABULARY = [f"w{index:04d}" for index in range(4000)]
+QUERIES = {
+	"name": "skill_00042",
+	"rare_words": "w3100 w2750",
+	"common_words": "w0001 w0002 w0003",
+	"mixed": "convert w0004 w1500 report",
+	"cjk": "保存记忆",
+}
+SCRIPT = """import argparse
+from mcp_multiskill.parser_to_schema import get_parser_json
+
+parser = argparse.ArgumentParser(description="{description}")
+parser.add_argument("--input", help="{help}")
+if get_parser_json(parser):
+	exit(0)
+args = parser.parse_args()
+"""
+
+
+def make_catalog(root: Path, skills: int, words: int, seed: int = 0) -> None:
+	rng = random.Random(seed)
+	weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+	for index in range(skills):
+		skill_dir = root / f"skill_{index:05d}"
+		skill_dir.mkdir(parents=True)
+		body = " ".join(rng.choices(VOCABULARY, weights, k=words))
+		extra = " 保存一条记忆" if index % 100 == 0 else ""
+		(skill_dir / "SKILL.md").write_text(f"Skill {index} convert report{extra}\n\n{body}\n", encoding="utf-8")
+		for script in range(2):
+			help_text = " ".join(rng.choices(VOCABULARY, weights, k=8))
+			(skill_dir / f"run_{script}.py").write_text(
+				SCRIPT.format(description=f"Script {script} of skill {index}", help=help_text),
+				encoding="utf-8",
+			)
+
+
+def median_ms(samples: list[float]) -> float:
+	return round(statistics.median(samples) * 1000, 3)
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--skills", type=int, default=5000)
+	parser.add_argument("--words", type=int, default=300, help="Words per SKILL.md body")
+	parser.add_argument("--repeat", type=int, default=200)
+	args = parser.parse_args()
+
+	# 轮询间隔拉长，避免计时中混入注册表的 mtime 检查；增量更新时显式 invalidate
+	os.environ[POLL_INTERVAL_ENV] = "3600"
+	with tempfile.TemporaryDirectory() as tmp:
+		root = Path(tmp)
+		make_catalog(root, args.skills, args.words)
+		started = time.perf_counter()
+		load_skill.list_skills_summary(root)
+		registry_ms = (time.perf_counter() - started) * 1000
+		started = time.perf_counter()
+		load_skill.search_skills("warmup", 10, root)
+		build_ms = (time.perf_counter() - started) * 1000
+
+		results: dict[str, float] = {"registry_scan_ms": round(registry_ms, 3), "index_build_ms": round(build_ms, 3)}
+		for name, query in QUERIES.items():
+			samples = []
+			for _ in range(args.repeat):
+				started = time.perf_counter()
+				load_skill.search_skills(query, 10, root)
+				samples.append(time.perf_counter() - started)
+			results[f"search_{name}_ms"] = median_ms(samples)
+
+		samples = []
+		registry = load_skill.get_skill_registry(root)
+		for index in range(20):
+			markdown = root / "skill_00007" / "SKILL.md"
+			markdown.write_text(f"Skill 7 revision {index}\n\nw0001 w0002\n", encoding="utf-8")
+			registry.invalidate("skill_00007")
+			started = time.perf_counter()
+			load_skill.search_skills("revision", 10, root)
+			samples.append(time.perf_counter() - started)
+		results["update_one_skill_ms"] = median_ms(samples)
+
+	print(json.dumps({"skills": args.skills, "results": results}, indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
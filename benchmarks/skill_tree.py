@@ -0,0 +1,128 @@
+"""Synthetic skill trees and an offline ``uv`` stand-in for the benchmarks."""
+
+from __future__ import annotations
+
+import os
+import stat
+import sys
+import textwrap
+from pathlib import Path
+
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# 全部参数为字面量，可被静态解析
+STATIC_SCRIPT = """
+import argparse
+import sys
+from mcp_multiskill.parser_to_schema import get_parser_json
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Synthetic script {index}.")
+	parser.add_argument("--input", required=True, help="Path of the input file to process")
+	parser.add_argument("--limit", type=int, default=10, help="Maximum number of rows to return")
+	parser.add_argument("--mode", choices=["fast", "safe", "debug"], help="Processing mode")
+	parser.add_argument("--tag", action="append", help="Tag attached to each output row")
+	parser.add_argument("--verbose", action="store_true", help="Print progress information")
+	parser.add_argument("--output", help="Where to write the result; stdout when omitted")
+	if get_parser_json(parser):
+		exit(0)
+	args = parser.parse_args()
+	data = sys.stdin.read() if not sys.stdin.isatty() else ""
+	print(f"{{args.input}}:{{args.limit}}:{{len(data)}}")
+"""
+
+# 循环添加参数，只能通过子进程执行钩子提取
+DYNAMIC_SCRIPT = """
+import argparse
+from mcp_multiskill.parser_to_schema import get_parser_json
+
+FIELDS = ["alpha", "beta", "gamma", "delta"]
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Dynamic script {index}.")
+	for name in FIELDS:
+		parser.add_argument(f"--{{name}}", help=f"Value for {{name}}")
+	if get_parser_json(parser):
+		exit(0)
+	args = parser.parse_args()
+	print(vars(args))
+"""
+
+FAKE_UV = """#!{python}
+# uv 的离线替身：run 直接用当前解释器执行脚本，sync 创建指向当前解释器的 .venv
+import os
+import sys
+from pathlib import Path
+
+args = sys.argv[1:]
+command = args.pop(0)
+project = Path(args[args.index("--project") + 1])
+env = dict(os.environ)
+env["PYTHONPATH"] = os.pathsep.join(filter(None, [{src!r}, env.get("PYTHONPATH")]))
+if command == "run":
+	rest = args[args.index("--project") + 2:]
+	if rest and rest[0] == "python":
+		rest = rest[1:]
+	os.execve(sys.executable, [sys.executable, *rest], env)
+if command == "sync":
+	bin_dir = project / ".venv" / "bin"
+	bin_dir.mkdir(parents=True, exist_ok=True)
+	python = bin_dir / "python"
+	if not python.exists():
+		python.write_text("#!/bin/sh\\nexport PYTHONPATH={src}\\nexec {python} \\"$@\\"\\n")
+		python.chmod(0o755)
+	sys.exit(0)
+sys.exit(f"fake uv: unsupported command {{command}}")
+"""
+
+
+def skill_markdown(name: str, scripts: int, markdown_bytes: int) -> str:
+	lines = [f"Synthetic skill {name} with {scripts} scripts.", "", "## Usage", ""]
+	paragraph = (
+		"This paragraph pads the skill description to a realistic size so that reading and "
+		"rendering SKILL.md costs roughly what it would for a real, well documented skill. "
+	)
+	while sum(len(line) + 1 for line in lines) < markdown_bytes:
+		lines.append(paragraph)
+	return "\n".join(lines) + "\n"
+
+
+def make_skill(
+	root: Path,
+	name: str,
+	scripts: int,
+	markdown_bytes: int = 2048,
+	dynamic_every: int = 0,
+) -> Path:
+	"""Create ``root/name`` with ``scripts`` argparse scripts; every ``dynamic_every``-th one needs a subprocess."""
+	skill_dir = root / name
+	skill_dir.mkdir(parents=True)
+	(skill_dir / "SKILL.md").write_text(skill_markdown(name, scripts, markdown_bytes), encoding="utf-8")
+	(skill_dir / "pyproject.toml").write_text(
+		f'[project]\nname = "{name}"\nversion = "0.1.0"\nrequires-python = ">=3.10"\n',
+		encoding="utf-8",
+	)
+	for index in range(scripts):
+		dynamic = dynamic_every and index % dynamic_every == dynamic_every - 1
+		template = DYNAMIC_SCRIPT if dynamic else STATIC_SCRIPT
+		# 注释中带上 skill 名，避免不同 skill 的脚本命中同一条 schema 缓存
+		source = f"# {name}/{index}\n" + textwrap.dedent(template).format(index=index)
+		(skill_dir / f"script_{index:02d}.py").write_text(source, encoding="utf-8")
+	return skill_dir
+
+
+def make_skill_tree(root: Path, skills: int, scripts: int, markdown_bytes: int = 2048, dynamic_every: int = 4) -> Path:
+	for index in range(skills):
+		make_skill(root, f"skill_{index:03d}", scripts, markdown_bytes, dynamic_every)
+	return root
+
+
+def install_fake_uv(bin_dir: Path) -> Path:
+	"""Write a fake ``uv`` into ``bin_dir`` and put it first on ``PATH`` for this process and its children."""
+	bin_dir.mkdir(parents=True, exist_ok=True)
+	uv = bin_dir / "uv"
+	uv.write_text(FAKE_UV.format(python=sys.executable, src=str(SRC_DIR)), encoding="utf-8")
+	uv.chmod(uv.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+	os.environ["PATH"] = os.pathsep.join([str(bin_dir), os.environ.get("PATH", "")])
+	return uv
@@ -1,5 +1,5 @@
 import argparse
-from mcp_multiskill.parser_to_schema import get_parser_json
+from mcp_multiskill.parser_to_schema import emit_result, get_parser_json
 def cal(a, b, operation):
     if operation == "+":
         result = a + b
@@ -8,6 +8,7 @@ def cal(a, b, operation):
     else:
         result = 0
     print(f"Result of {a} {operation} {b}: {result}")
+    emit_result({"a": a, "b": b, "operation": operation, "result": result})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+"""记忆存储：单个 SQLite 文件，名称唯一索引 + FTS5 全文索引。
+
+旧版 `memorys/*.md` 会在首次打开时自动导入（原文件保留不动）。
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "memorys.sqlite3"
+LEGACY_DIR = BASE_DIR / "memorys"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+	id INTEGER PRIMARY KEY,
+	name TEXT NOT NULL UNIQUE,
+	content TEXT NOT NULL,
+	updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# trigram 分词按三字符切分，中英文都能做子串匹配；需要 SQLite 3.34+ 且编译了 FTS5
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+	name, content, content='memories', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+	INSERT INTO memories_fts(rowid, name, content) VALUES (new.id, new.name, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+	INSERT INTO memories_fts(memories_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+	INSERT INTO memories_fts(memories_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+	INSERT INTO memories_fts(rowid, name, content) VALUES (new.id, new.name, new.content);
+END;
+"""
+
+
+class MemoryStore:
+	def __init__(self, path: Path = DB_PATH, legacy_dir: Path | None = LEGACY_DIR) -> None:
+		self.path = path
+		self.conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+		self.conn.execute("PRAGMA journal_mode=WAL")
+		self.conn.execute("PRAGMA synchronous=NORMAL")
+		self.conn.executescript(SCHEMA)
+		self.fts = self._init_fts()
+		if legacy_dir is not None:
+			self.migrate(legacy_dir)
+
+	def _init_fts(self) -> bool:
+		try:
+			self.conn.executescript(FTS_SCHEMA)
+		except sqlite3.OperationalError:
+			return False
+		return True
+
+	def close(self) -> None:
+		self.conn.close()
+
+	def _count(self) -> int:
+		return self.conn.execute("SELECT count(*) FROM memories").fetchone()[0]
+
+	def save(self, name: str, content: str) -> None:
+		# 单条语句在自己的事务中执行，写入要么完整生效要么不生效
+		self.conn.execute(
+			"INSERT INTO memories(name, content, updated_at) VALUES (?, ?, ?) "
+			"ON CONFLICT(name) DO UPDATE SET content = excluded.content, updated_at = excluded.updated_at",
+			(name, content, time.time()),
+		)
+
+	def load(self, names: list[str]) -> dict[str, str]:
+		found: dict[str, str] = {}
+		# SQLite 默认最多 999 个绑定参数，分批查询
+		for start in range(0, len(names), 500):
+			chunk = names[start:start + 500]
+			placeholders = ",".join("?" * len(chunk))
+			for name, content in self.conn.execute(f"SELECT name, content FROM memories WHERE name IN ({placeholders})", chunk):
+				found[name] = content
+		return found
+
+	def list_names(self, prefix: str = "", offset: int = 0, limit: int | None = None) -> tuple[list[str], int]:
+		where, params = _prefix_clause(prefix)
+		total = self.conn.execute(f"SELECT count(*) FROM memories {where}", params).fetchone()[0]
+		rows = self.conn.execute(
+			f"SELECT name FROM memories {where} ORDER BY name LIMIT ? OFFSET ?",
+			(*params, -1 if limit is None else limit, max(0, offset)),
+		)
+		return [row[0] for row in rows], total
+
+	def search(self, query: str, limit: int = 10) -> list[tuple[str, str]]:
+		"""Memories whose name or content contains ``query``, best matches first, with a snippet."""
+		if self.fts and len(query) >= 3:
+			phrase = '"' + query.replace('"', '""') + '"'
+			rows = self.conn.execute(
+				"SELECT name, snippet(memories_fts, 1, '[', ']', '…', 12) FROM memories_fts "
+				"WHERE memories_fts MATCH ? ORDER BY bm25(memories_fts, 2.0, 1.0) LIMIT ?",
+				(phrase, limit),
+			)
+			return [(name, snippet.replace("\n", " ")) for name, snippet in rows]
+		# 少于三个字符时 trigram 无法命中，退回到逐行子串扫描
+		rows = self.conn.execute(
+			"SELECT name, content FROM memories WHERE instr(lower(name), lower(?)) OR instr(lower(content), lower(?)) "
+			"ORDER BY instr(lower(name), lower(?)) = 0, updated_at DESC LIMIT ?",
+			(query, query, query, limit),
+		)
+		return [(name, _snippet(content, query)) for name, content in rows]
+
+	def migrate(self, legacy_dir: Path) -> int:
+		"""Import ``legacy_dir/*.md`` once; names already in the store are kept as they are."""
+		if self.conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_migrated'").fetchone():
+			return 0
+		files = sorted(legacy_dir.glob("*.md")) if legacy_dir.is_dir() else []
+		with self.conn:
+			self.conn.execute("BEGIN IMMEDIATE")
+			before = self._count()
+			self.conn.executemany(
+				"INSERT OR IGNORE INTO memories(name, content, updated_at) VALUES (?, ?, ?)",
+				((path.stem, path.read_text(encoding="utf-8"), path.stat().st_mtime) for path in files),
+			)
+			imported = self._count() - before
+			self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('legacy_migrated', ?)", (str(time.time()),))
+		return imported
+
+
+def _prefix_clause(prefix: str) -> tuple[str, tuple]:
+	if not prefix:
+		return "", ()
+	# 用范围查询代替 LIKE，能走 name 上的唯一索引
+	return "WHERE name >= ? AND name < ?", (prefix, prefix + "\U0010ffff")
+
+
+def _snippet(content: str, query: str, width: int = 40) -> str:
+	index = content.lower().find(query.lower())
+	if index < 0:
+		return content[:width * 2].replace("\n", " ")
+	start = max(0, index - width)
+	end = index + len(query) + width
+	text = content[start:index] + "[" + content[index:index + len(query)] + "]" + content[index + len(query):end]
+	return ("…" if start else "") + text.replace("\n", " ") + ("…" if end < len(content) else "")
@@ -3,20 +3,25 @@
 from __future__ import annotations
 
 import argparse
-from pathlib import Path
+import json
 import sys
 
 from mcp_multiskill.parser_to_schema import get_parser_json
 
+from _store import MemoryStore
+
 
 def parse_args() -> argparse.Namespace:
-	parser = argparse.ArgumentParser(description="读取 memorys/*.md 记忆或输出记忆列表")
-	parser.add_argument("--memory_name", default="", type=str, help="记忆名（不含 .md 后缀）")
+	parser = argparse.ArgumentParser(description="读取记忆（可一次读取多条），或分页输出记忆列表")
+	parser.add_argument("--memory_name", action="append", help="记忆名；重复该参数可一次读取多条")
 	parser.add_argument(
 		"--list_memories",
 		action="store_true",
 		help="是否获取记忆列表（带上该参数时忽略记忆名）",
 	)
+	parser.add_argument("--prefix", default="", type=str, help="列表只包含以此开头的记忆名")
+	parser.add_argument("--offset", default=0, type=int, help="列表从第几条开始（从 0 计）")
+	parser.add_argument("--limit", default=0, type=int, help="列表最多输出多少条，0 表示全部")
 	if get_parser_json(parser):
 		exit(0)
 	return parser.parse_args()
@@ -24,27 +29,35 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
 	args = parse_args()
+	store = MemoryStore()
+	try:
+		if args.list_memories:
+			names, total = store.list_names(args.prefix, args.offset, args.limit or None)
+			print("\n".join(names))
+			end = args.offset + len(names)
+			if end < total:
+				print(f"已输出 {end}/{total} 条，使用 --offset {end} 继续", file=sys.stderr)
+			return 0
 
-	base_dir = Path(__file__).resolve().parent
-	memory_dir = base_dir / "memorys"
-	memory_dir.mkdir(parents=True, exist_ok=True)
-
-	if args.list_memories:
-		names = sorted(path.stem for path in memory_dir.glob("*.md") if path.is_file())
-		print("\n".join(names))
-		return 0
+		if not args.memory_name:
+			print("未提供记忆名", file=sys.stderr)
+			return 2
 
-	if not args.memory_name:
-		print("未提供记忆名", file=sys.stderr)
-		return 2
+		found = store.load(args.memory_name)
+	finally:
+		store.close()
 
-	memory_path = memory_dir / f"{args.memory_name}.md"
-	if not memory_path.exists():
-		print(f"记忆不存在: {args.memory_name}", file=sys.stderr)
-		return 1
-
-	print(memory_path.read_text(encoding="utf-8"), end="")
-	return 0
+	missing = [name for name in args.memory_name if name not in found]
+	if missing:
+		print(f"记忆不存在: {', '.join(missing)}", file=sys.stderr)
+	if len(args.memory_name) == 1:
+		if missing:
+			return 1
+		print(found[args.memory_name[0]], end="")
+		return 0
+	# 多条时输出 {记忆名: 内容} 的 JSON，缺失的记忆不出现在结果中
+	print(json.dumps({name: found[name] for name in args.memory_name if name in found}, ensure_ascii=False, indent=2))
+	return 1 if missing else 0
 
 
 if __name__ == "__main__":
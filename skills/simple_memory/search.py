@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from mcp_multiskill.parser_to_schema import get_parser_json
+
+from _store import MemoryStore
+
+
+def parse_args() -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="按内容全文检索记忆，或按记忆名前缀查找")
+	parser.add_argument("--query", default="", type=str, help="在记忆名与内容中查找的文本")
+	parser.add_argument("--prefix", default="", type=str, help="记忆名前缀（不提供 --query 时使用）")
+	parser.add_argument("--limit", default=10, type=int, help="最多返回多少条")
+	if get_parser_json(parser):
+		exit(0)
+	return parser.parse_args()
+
+
+def main() -> int:
+	args = parse_args()
+	if not args.query and not args.prefix:
+		print("需要提供 --query 或 --prefix", file=sys.stderr)
+		return 2
+
+	store = MemoryStore()
+	try:
+		if args.query:
+			# 每行：记忆名<TAB>命中片段（命中处用 [] 标出）
+			for name, snippet in store.search(args.query, args.limit):
+				print(f"{name}\t{snippet}")
+		else:
+			names, _total = store.list_names(args.prefix, 0, args.limit)
+			print("\n".join(names))
+	finally:
+		store.close()
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
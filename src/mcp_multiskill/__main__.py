@@ -0,0 +1,109 @@
+"""Command line entry point.
+
+    python -m mcp_multiskill              # run the MCP server (stdio)
+    python -m mcp_multiskill serve --transport streamable-http --port 8000
+    python -m mcp_multiskill sync         # uv sync every skill environment
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from .environments import DEFAULT_SYNC_WORKERS, SyncResult, sync_environments
+from .http_server import (
+	DEFAULT_DRAIN_SECONDS,
+	DEFAULT_HOST,
+	DEFAULT_PORT,
+	TRANSPORTS,
+	default_host,
+	default_port,
+	default_transport,
+	serve_http,
+)
+
+
+def skill_projects(skills_root: Path | None = None, names: list[str] | None = None) -> list[Path]:
+	from .load_skill import get_skill_registry
+
+	entries = get_skill_registry(skills_root).entries()
+	dirs = [entry.path for entry in entries if (entry.path / "pyproject.toml").is_file()]
+	if names:
+		wanted = set(names)
+		missing = wanted - {path.name for path in dirs}
+		if missing:
+			raise SystemExit(f"unknown skills: {', '.join(sorted(missing))}")
+		dirs = [path for path in dirs if path.name in wanted]
+	return dirs
+
+
+def print_result(result: SyncResult) -> None:
+	status = "ok" if result.ok else "FAILED"
+	print(f"{status:<7}{result.skill:<32}{result.seconds:8.2f}s", flush=True)
+	if result.error:
+		print(f"       {result.error}", flush=True)
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+	skill_dirs = skill_projects(args.skills_root, args.skills)
+	started = time.perf_counter()
+	results = sync_environments(skill_dirs, workers=args.workers, on_result=None if args.json else print_result)
+	elapsed = time.perf_counter() - started
+	failed = [result for result in results if not result.ok]
+	groups = {result.group or result.skill for result in results}
+	if args.json:
+		print(json.dumps({
+			"skills": [result.as_dict() for result in results],
+			"groups": len(groups),
+			"failed": len(failed),
+			"elapsed_seconds": round(elapsed, 3),
+		}, ensure_ascii=False, indent=2))
+	else:
+		print(f"synced {len(results) - len(failed)}/{len(results)} skills ({len(groups)} distinct lockfiles) in {elapsed:.2f}s")
+	return 1 if failed else 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+	transport = getattr(args, "transport", None) or default_transport()
+	if transport == "stdio":
+		from .server import mcp
+
+		mcp.run()
+		return 0
+	host = getattr(args, "host", None) or default_host()
+	port = getattr(args, "port", None) or default_port()
+	serve_http(transport, host, port, getattr(args, "drain_seconds", None))
+	return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(prog="mcp_multiskill", description="Multi-skill MCP server.")
+	commands = parser.add_subparsers(dest="command")
+
+	serve = commands.add_parser("serve", help="Run the MCP server (default).")
+	serve.add_argument("--transport", choices=TRANSPORTS, default=None, help="stdio (one client, default) or a shared HTTP server.")
+	serve.add_argument("--host", default=None, help=f"HTTP bind address (default: {DEFAULT_HOST}).")
+	serve.add_argument("--port", type=int, default=None, help=f"HTTP port (default: {DEFAULT_PORT}).")
+	serve.add_argument("--drain-seconds", type=float, default=None, help=f"On SIGTERM/SIGINT wait this long for running calls (default: {DEFAULT_DRAIN_SECONDS:g}).")
+	serve.set_defaults(handler=cmd_serve)
+
+	sync = commands.add_parser("sync", help="Create or update every skill's uv environment in parallel.")
+	sync.add_argument("skills", nargs="*", help="Only these skills (default: all).")
+	sync.add_argument("--skills-root", type=Path, default=None, help="Skills directory (default: the configured skill roots).")
+	sync.add_argument("--workers", type=int, default=None, help=f"Parallel uv sync processes (default: {DEFAULT_SYNC_WORKERS}).")
+	sync.add_argument("--json", action="store_true", help="Print a JSON report instead of one line per skill.")
+	sync.set_defaults(handler=cmd_sync)
+	return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+	args = build_parser().parse_args(argv)
+	handler = getattr(args, "handler", cmd_serve)
+	return handler(args)
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,135 @@
+"""Warm worker process started inside a skill environment by ``worker_pool``.
+
+Executed by file path (``python _skill_worker.py``) so that it does not depend
+on ``mcp_multiskill`` being importable in the skill venv. Each request is one
+JSON line on stdin. While the script runs its output is sent as
+``{"stream", "data"}`` lines, then one ``{"returncode"}`` line ends the
+response.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import runpy
+import sys
+import threading
+import traceback
+
+
+CHUNK_BYTES = 64 * 1024
+
+
+class _Protocol:
+	def __init__(self, out) -> None:
+		self.out = out
+		self.lock = threading.Lock()
+
+	def send(self, message: dict) -> None:
+		# 脚本自己的线程也可能在写输出
+		with self.lock:
+			self.out.write(json.dumps(message) + "\n")
+			self.out.flush()
+
+
+class _Forward(io.RawIOBase):
+	"""Sends what the script writes to the server as it is written, so neither side buffers it all."""
+
+	def __init__(self, name: str, protocol: _Protocol) -> None:
+		super().__init__()
+		self.stream = name
+		self.protocol = protocol
+		self.active = True
+
+	def writable(self) -> bool:
+		return True
+
+	def write(self, data) -> int:
+		data = bytes(data)
+		# 脚本返回后残留线程的输出不能混进下一次请求
+		if self.active:
+			for start in range(0, len(data), CHUNK_BYTES):
+				chunk = data[start:start + CHUNK_BYTES].decode("utf-8", errors="surrogateescape")
+				self.protocol.send({"stream": self.stream, "data": chunk})
+		return len(data)
+
+
+def _exit_code(code: object) -> int:
+	if code is None:
+		return 0
+	if isinstance(code, int):
+		return code
+	print(code, file=sys.stderr)
+	return 1
+
+
+def _stream(name: str, protocol: _Protocol) -> tuple[_Forward, io.TextIOWrapper]:
+	forward = _Forward(name, protocol)
+	buffered = io.BufferedWriter(forward, CHUNK_BYTES)
+	return forward, io.TextIOWrapper(buffered, encoding="utf-8", errors="replace", write_through=True)
+
+
+def _execute(request: dict, protocol: _Protocol) -> dict:
+	script = request["script"]
+	argv = request.get("argv") or []
+	stdin_text = request.get("stdin")
+	env = request.get("env") or {}
+
+	stdout_forward, stdout = _stream("stdout", protocol)
+	stderr_forward, stderr = _stream("stderr", protocol)
+	stdin = io.TextIOWrapper(io.BytesIO((stdin_text or "").encode("utf-8")), encoding="utf-8")
+
+	saved = (sys.argv, sys.stdin, sys.stdout, sys.stderr, list(sys.path), os.getcwd())
+	saved_env = {name: os.environ.get(name) for name in env}
+	os.environ.update(env)
+	sys.argv = [script, *argv]
+	sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+	sys.path[0] = os.path.dirname(os.path.abspath(script))
+	returncode = 0
+	try:
+		runpy.run_path(script, run_name="__main__")
+	except SystemExit as exc:
+		returncode = _exit_code(exc.code)
+	except BaseException:
+		traceback.print_exc()
+		returncode = 1
+	finally:
+		for stream in (stdout, stderr):
+			try:
+				stream.flush()
+			except ValueError:
+				pass
+		stdout_forward.active = stderr_forward.active = False
+		sys.argv, sys.stdin, sys.stdout, sys.stderr = saved[:4]
+		sys.path[:] = saved[4]
+		os.chdir(saved[5])
+		# 按次设置的变量（如结果文件路径）不能留给下一个脚本
+		for name, value in saved_env.items():
+			if value is None:
+				os.environ.pop(name, None)
+			else:
+				os.environ[name] = value
+
+	return {"returncode": returncode}
+
+
+def main() -> int:
+	# 协议走私有 fd，fd 0/1 让给脚本，避免脚本或其子进程的直接 fd 读写破坏协议
+	protocol_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+	protocol_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+	devnull = os.open(os.devnull, os.O_RDONLY)
+	os.dup2(devnull, 0)
+	os.close(devnull)
+	os.dup2(2, 1)
+
+	protocol = _Protocol(protocol_out)
+	for line in protocol_in:
+		if not line.strip():
+			continue
+		protocol.send(_execute(json.loads(line), protocol))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
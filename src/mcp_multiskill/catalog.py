@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from .registry import SkillEntry, SkillRegistry
+from .schema_cache import get_default_cache_dir
+
+
+SKILL_ROOTS_ENV = "MCP_MULTISKILL_SKILL_ROOTS"
+CATALOG_SNAPSHOT_ENV = "MCP_MULTISKILL_CATALOG_SNAPSHOT"
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class RootConfig:
+	"""One skill root and its refresh policy; ``None`` falls back to the registry defaults."""
+
+	path: Path
+	poll_seconds: float | None = None
+	watch: bool | None = None
+	snapshot: bool = False
+
+	@classmethod
+	def parse(cls, item: Any) -> RootConfig:
+		if isinstance(item, str):
+			return cls(Path(item).expanduser())
+		if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+			raise ValueError(f"Invalid skill root: {item!r}")
+		poll = item.get("poll_seconds")
+		watch = item.get("watch")
+		return cls(
+			path=Path(item["path"]).expanduser(),
+			poll_seconds=float(poll) if isinstance(poll, (int, float)) and not isinstance(poll, bool) else None,
+			watch=watch if isinstance(watch, bool) else None,
+			snapshot=item.get("snapshot") is True,
+		)
+
+
+def parse_roots(value: str) -> list[RootConfig]:
+	"""Roots from ``MCP_MULTISKILL_SKILL_ROOTS``: a JSON list, or paths separated by ``os.pathsep``."""
+	value = value.strip()
+	if value.startswith("["):
+		items = json.loads(value)
+	else:
+		items = [part for part in value.split(os.pathsep) if part.strip()]
+	return [RootConfig.parse(item) for item in items]
+
+
+def configured_roots(default_root: Path) -> list[RootConfig]:
+	value = os.environ.get(SKILL_ROOTS_ENV)
+	if value and value.strip():
+		return parse_roots(value)
+	return [RootConfig(default_root)]
+
+
+def snapshot_path() -> Path:
+	configured = os.environ.get(CATALOG_SNAPSHOT_ENV)
+	return Path(configured) if configured else get_default_cache_dir() / "catalog.json"
+
+
+def _tuples(value: Any) -> Any:
+	# JSON 没有元组，读回后转换，才能与 skill_fingerprint 的结果比较
+	return tuple(_tuples(item) for item in value) if isinstance(value, list) else value
+
+
+def entry_to_dict(entry: SkillEntry) -> dict[str, Any]:
+	return {
+		"name": entry.name,
+		"path": str(entry.path),
+		"markdown": entry.markdown,
+		"description": entry.description,
+		"scripts": [str(script) for script in entry.scripts],
+		"markdown_hash": entry.markdown_hash,
+		"fingerprint": entry.fingerprint,
+		"loaded_at": entry.loaded_at,
+	}
+
+
+def entry_from_dict(data: dict[str, Any]) -> SkillEntry:
+	return SkillEntry(
+		name=data["name"],
+		path=Path(data["path"]),
+		markdown=data["markdown"],
+		description=data["description"],
+		scripts=[Path(script) for script in data["scripts"]],
+		markdown_hash=data["markdown_hash"],
+		fingerprint=_tuples(data["fingerprint"]),
+		loaded_at=data["loaded_at"],
+	)
+
+
+class SkillCatalog:
+	"""Skills of several roots merged into one catalog.
+
+	Roots are listed in precedence order: when two roots contain a skill
+	of the same name, the earlier root's skill shadows the later one as a
+	whole. Each root keeps its own :class:`SkillRegistry` with its own poll
+	interval and watch setting. Roots marked ``snapshot`` are seeded from
+	the snapshot file at startup instead of being scanned, and the file is
+	rewritten whenever their entries change.
+	"""
+
+	def __init__(
+		self,
+		roots: list[RootConfig],
+		loader: Callable[[Path], SkillEntry],
+		snapshot_file: Path | None = None,
+	) -> None:
+		if not roots:
+			raise ValueError("At least one skill root is required")
+		self.roots = roots
+		self.registries = [SkillRegistry(root.path, loader, root.poll_seconds, root.watch) for root in roots]
+		self.root = roots[0].path
+		self._snapshot_file = snapshot_file or snapshot_path()
+		self._lock = threading.Lock()
+		self._merged: tuple[int, dict[str, SkillEntry], list[SkillEntry], dict[str, list[str]]] | None = None
+		self._saved_generation: int | None = None
+		self.snapshot_loads = 0
+		self.snapshot_saves = 0
+		self._load_snapshot()
+
+	def _snapshot_registries(self) -> list[tuple[RootConfig, SkillRegistry]]:
+		return [(root, registry) for root, registry in zip(self.roots, self.registries) if root.snapshot]
+
+	def _load_snapshot(self) -> None:
+		pending = self._snapshot_registries()
+		if not pending:
+			return
+		try:
+			data = json.loads(self._snapshot_file.read_text(encoding="utf-8"))
+			if data.get("version") != SNAPSHOT_VERSION:
+				return
+			saved = data["roots"]
+		except (OSError, ValueError, KeyError, TypeError, AttributeError):
+			return
+		for root, registry in pending:
+			item = saved.get(str(root.path))
+			if item is None:
+				continue
+			try:
+				entries = [entry_from_dict(entry) for entry in item["entries"]]
+				registry.seed(entries, _tuples(item["root_mtime"]))
+			except (KeyError, TypeError, ValueError):
+				continue
+			self.snapshot_loads += 1
+		self._saved_generation = self._snapshot_generation()
+
+	def _snapshot_generation(self) -> int:
+		return sum(registry.generation() for _root, registry in self._snapshot_registries())
+
+	def save_snapshot(self) -> bool:
+		snapshots = self._snapshot_registries()
+		if not snapshots:
+			return False
+		roots = {}
+		for root, registry in snapshots:
+			entries, root_mtime = registry.snapshot()
+			roots[str(root.path)] = {"root_mtime": root_mtime, "entries": [entry_to_dict(entry) for entry in entries]}
+		payload = json.dumps({"version": SNAPSHOT_VERSION, "roots": roots}, ensure_ascii=False)
+		target = self._snapshot_file
+		try:
+			target.parent.mkdir(parents=True, exist_ok=True)
+			fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp-", suffix=".json")
+			try:
+				with os.fdopen(fd, "w", encoding="utf-8") as handle:
+					handle.write(payload)
+				os.replace(tmp_name, target)
+			except BaseException:
+				Path(tmp_name).unlink(missing_ok=True)
+				raise
+		except OSError:
+			return False
+		self.snapshot_saves += 1
+		return True
+
+	def _maybe_save(self) -> None:
+		if not any(root.snapshot for root in self.roots):
+			return
+		generation = self._snapshot_generation()
+		if generation != self._saved_generation:
+			self._saved_generation = generation
+			self.save_snapshot()
+
+	def generation(self) -> int:
+		# 各 registry 的计数只增不减，求和后任何一处变化都会改变结果
+		return sum(registry.generation() for registry in self.registries)
+
+	def _merge(self) -> tuple[dict[str, SkillEntry], list[SkillEntry], dict[str, list[str]]]:
+		generation = self.generation()
+		merged = self._merged
+		if merged is not None and merged[0] == generation:
+			return merged[1:]
+		with self._lock:
+			chosen: dict[str, SkillEntry] = {}
+			shadowed: dict[str, list[str]] = {}
+			for registry in self.registries:
+				for entry in registry.entries():
+					if entry.name in chosen:
+						shadowed.setdefault(entry.name, []).append(str(entry.path))
+					else:
+						chosen[entry.name] = entry
+			entries = [chosen[name] for name in sorted(chosen)]
+			self._merged = (generation, chosen, entries, shadowed)
+			self._maybe_save()
+		return chosen, entries, shadowed
+
+	def entries(self) -> list[SkillEntry]:
+		return self._merge()[1]
+
+	def get(self, name: str) -> SkillEntry | None:
+		entry = self._merge()[0].get(name)
+		if entry is not None:
+			return entry
+		# 目录里还没有的名字可能刚创建，按优先级逐个根目录探测
+		for registry in self.registries:
+			entry = registry.get(name)
+			if entry is not None:
+				return entry
+		return None
+
+	def invalidate(self, name: str | None = None) -> None:
+		for registry in self.registries:
+			registry.invalidate(name)
+
+	def close(self) -> None:
+		for registry in self.registries:
+			registry.close()
+
+	def stats(self) -> dict[str, Any]:
+		_chosen, entries, shadowed = self._merge()
+		roots = []
+		for root, registry in zip(self.roots, self.registries):
+			stats = registry.stats()
+			stats["poll_seconds"] = registry.poll_interval
+			stats["snapshot"] = root.snapshot
+			roots.append(stats)
+		return {
+			"root": str(self.root),
+			"skills": len(entries),
+			"roots": roots,
+			"shadowed": shadowed,
+			"snapshot_file": str(self._snapshot_file) if any(root.snapshot for root in self.roots) else None,
+			"snapshot_loads": self.snapshot_loads,
+			"snapshot_saves": self.snapshot_saves,
+		}
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from typing import Any, AsyncIterator, Hashable
+
+from .config import env_int
+from .executor import limiter
+
+
+CLIENT_CONCURRENCY_ENV = "MCP_MULTISKILL_CLIENT_CONCURRENCY"
+LOCAL_CLIENT = "local"
+
+
+class ShuttingDown(RuntimeError):
+	pass
+
+
+class FairScheduler:
+	"""Run slots shared fairly between clients.
+
+	Callers wait in one queue per client; whenever a slot frees up it goes
+	to the next waiting client in round-robin order, so a client with a
+	hundred queued calls does not starve one with a single call. Each client
+	also holds at most ``client_limit`` slots at once. ``begin_drain`` stops
+	new calls for a graceful shutdown and ``wait_idle`` waits for the ones
+	already admitted.
+	"""
+
+	def __init__(self, capacity: int | None = None, client_limit: int | None = None) -> None:
+		self._capacity = capacity
+		self._client_limit = client_limit
+		self._loop: asyncio.AbstractEventLoop | None = None
+		self._reset()
+		self.draining = False
+		self.granted = 0
+		self.rejected = 0
+		self.max_wait_seconds = 0.0
+
+	def _reset(self) -> None:
+		self._running: dict[Hashable, int] = {}
+		self._waiting: OrderedDict[Hashable, deque[asyncio.Future]] = OrderedDict()
+		self._active = 0
+		self._idle: asyncio.Event | None = None
+
+	@property
+	def capacity(self) -> int:
+		return max(1, self._capacity if self._capacity is not None else limiter.global_limit)
+
+	@property
+	def client_limit(self) -> int:
+		if self._client_limit is not None:
+			return max(1, self._client_limit)
+		return max(1, env_int(CLIENT_CONCURRENCY_ENV, self.capacity))
+
+	def _bind(self) -> None:
+		loop = asyncio.get_running_loop()
+		# 与 ConcurrencyLimiter 相同：Future 绑定事件循环，换循环时清空
+		if loop is not self._loop:
+			self._loop = loop
+			self._reset()
+
+	def _dispatch(self) -> None:
+		capacity, client_limit = self.capacity, self.client_limit
+		progress = True
+		while self._active < capacity and self._waiting and progress:
+			progress = False
+			for client in list(self._waiting):
+				if self._active >= capacity:
+					break
+				if self._running.get(client, 0) >= client_limit:
+					continue
+				queue = self._waiting[client]
+				future = queue.popleft()
+				if not queue:
+					del self._waiting[client]
+				else:
+					# 轮转：刚获得名额的客户端排到队尾
+					self._waiting.move_to_end(client)
+				future.set_result(None)
+				self._running[client] = self._running.get(client, 0) + 1
+				self._active += 1
+				progress = True
+
+	def _release(self, client: Hashable) -> None:
+		self._active -= 1
+		remaining = self._running[client] - 1
+		if remaining:
+			self._running[client] = remaining
+		else:
+			del self._running[client]
+		if client in self._waiting:
+			# 在它运行期间才排队的客户端优先于它的下一个调用
+			self._waiting.move_to_end(client)
+		self._dispatch()
+		self._check_idle()
+
+	def _forget(self, client: Hashable, future: asyncio.Future) -> None:
+		queue = self._waiting.get(client)
+		if queue is not None and future in queue:
+			queue.remove(future)
+			if not queue:
+				del self._waiting[client]
+
+	def _check_idle(self) -> None:
+		if self._idle is not None and not self._active and not self._waiting:
+			self._idle.set()
+
+	@contextlib.asynccontextmanager
+	async def slot(self, client: Hashable = LOCAL_CLIENT) -> AsyncIterator[None]:
+		self._bind()
+		if self.draining:
+			self.rejected += 1
+			raise ShuttingDown("Server is shutting down; retry the call after it restarts")
+		future = self._loop.create_future()
+		self._waiting.setdefault(client, deque()).append(future)
+		queued = time.perf_counter()
+		self._dispatch()
+		try:
+			await future
+		except asyncio.CancelledError:
+			if future.done() and not future.cancelled():
+				# 名额已分配但调用方同时被取消，归还名额
+				self._release(client)
+			else:
+				self._forget(client, future)
+				self._check_idle()
+			raise
+		waited = time.perf_counter() - queued
+		self.granted += 1
+		self.max_wait_seconds = max(self.max_wait_seconds, waited)
+		try:
+			yield
+		finally:
+			self._release(client)
+
+	def begin_drain(self) -> None:
+		self.draining = True
+
+	async def wait_idle(self, timeout: float | None = None) -> bool:
+		"""Wait until no call holds or waits for a slot; ``False`` on timeout."""
+		self._bind()
+		if not self._active and not self._waiting:
+			return True
+		self._idle = asyncio.Event()
+		try:
+			await asyncio.wait_for(self._idle.wait(), timeout)
+		except asyncio.TimeoutError:
+			return False
+		finally:
+			self._idle = None
+		return True
+
+	def stats(self) -> dict[str, Any]:
+		return {
+			"capacity": self.capacity,
+			"client_limit": self.client_limit,
+			"running": self._active,
+			"waiting": sum(len(queue) for queue in self._waiting.values()),
+			"clients": len(set(self._running) | set(self._waiting)),
+			"granted": self.granted,
+			"rejected": self.rejected,
+			"max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+			"draining": self.draining,
+		}
+
+
+scheduler = FairScheduler()
+
+
+def client_key(ctx: Any) -> Hashable:
+	"""Identify the client behind a tool call.
+
+	Streamable HTTP sessions carry an ``mcp-session-id`` header; SSE and stdio
+	calls fall back to the server session object, which lives as long as the
+	client connection.
+	"""
+	if ctx is None:
+		return LOCAL_CLIENT
+	try:
+		request_context = ctx.request_context
+	except (AttributeError, ValueError):
+		return LOCAL_CLIENT
+	request = getattr(request_context, "request", None)
+	headers = getattr(request, "headers", None)
+	if isinstance(headers, Mapping):
+		session_id = headers.get("mcp-session-id")
+		if session_id:
+			return session_id
+	session = getattr(request_context, "session", None)
+	return LOCAL_CLIENT if session is None else f"session-{id(session):x}"
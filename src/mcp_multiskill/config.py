@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+
+
+_FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def env_flag(name: str, default: bool) -> bool:
+	value = os.environ.get(name)
+	if value is None or not value.strip():
+		return default
+	return value.strip().lower() not in _FALSE_VALUES
+
+
+def env_float(name: str, default: float | None) -> float | None:
+	value = os.environ.get(name)
+	if value is None or not value.strip():
+		return default
+	try:
+		return float(value)
+	except ValueError:
+		return default
+
+
+def env_int(name: str, default: int | None) -> int | None:
+	value = env_float(name, None)
+	return default if value is None else int(value)
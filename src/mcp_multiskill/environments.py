@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from .config import env_float, env_int
+
+try:
+	import tomllib
+except ImportError:  # Python < 3.11
+	try:
+		import tomli as tomllib
+	except ImportError:
+		tomllib = None
+
+
+ENV_MODE_ENV = "MCP_MULTISKILL_ENV_MODE"
+SYNC_TIMEOUT_ENV = "MCP_MULTISKILL_SYNC_TIMEOUT"
+SYNC_WORKERS_ENV = "MCP_MULTISKILL_SYNC_WORKERS"
+ENV_MODE_UV = "uv"
+ENV_MODE_DIRECT = "direct"
+FINGERPRINT_FILES = ("pyproject.toml", "uv.lock")
+
+DEFAULT_SYNC_TIMEOUT = 600.0
+DEFAULT_SYNC_WORKERS = 4
+
+
+class EnvironmentSyncError(RuntimeError):
+	pass
+
+
+@dataclass
+class ResolvedEnvironment:
+	skill_dir: Path
+	python: Path
+	env: dict[str, str]
+	fingerprint: tuple
+	sync_seconds: float
+
+
+def get_env_mode() -> str:
+	mode = os.environ.get(ENV_MODE_ENV, ENV_MODE_UV).strip().lower()
+	return ENV_MODE_DIRECT if mode == ENV_MODE_DIRECT else ENV_MODE_UV
+
+
+def base_env() -> dict[str, str]:
+	# 复制当前环境，移除 VIRTUAL_ENV，避免 uv 误用 server 自身的虚拟环境
+	env = os.environ.copy()
+	env.pop("VIRTUAL_ENV", None)
+	return env
+
+
+def uv_run_command(skill_dir: Path, script_path: Path, argv: list[str] | None = None) -> list[str]:
+	return ["uv", "run", "--project", str(skill_dir), "python", str(script_path), *(argv or [])]
+
+
+def project_fingerprint(skill_dir: Path) -> tuple:
+	parts = []
+	for name in FINGERPRINT_FILES:
+		try:
+			stat = (skill_dir / name).stat()
+		except OSError:
+			parts.append((name, None))
+		else:
+			parts.append((name, stat.st_mtime_ns, stat.st_size))
+	return tuple(parts)
+
+
+def venv_dir(skill_dir: Path) -> Path:
+	configured = os.environ.get("UV_PROJECT_ENVIRONMENT")
+	if configured:
+		path = Path(configured)
+		return path if path.is_absolute() else skill_dir / path
+	return skill_dir / ".venv"
+
+
+def venv_python(venv: Path) -> Path:
+	if sys.platform == "win32":
+		return venv / "Scripts" / "python.exe"
+	return venv / "bin" / "python"
+
+
+class EnvironmentRegistry:
+	"""Runs ``uv sync`` once per skill and remembers the venv interpreter.
+
+	An entry stays valid until ``pyproject.toml`` or ``uv.lock`` change (by
+	mtime/size) or its interpreter disappears; then the next resolve re-syncs.
+	"""
+
+	def __init__(self, sync_timeout: float | None = None) -> None:
+		self._sync_timeout = sync_timeout
+		self._entries: dict[Path, ResolvedEnvironment] = {}
+		self._locks: dict[Path, threading.Lock] = {}
+		self._lock = threading.Lock()
+		self.syncs = 0
+		self.sync_failures = 0
+
+	def _skill_lock(self, skill_dir: Path) -> threading.Lock:
+		with self._lock:
+			lock = self._locks.get(skill_dir)
+			if lock is None:
+				lock = self._locks[skill_dir] = threading.Lock()
+			return lock
+
+	def cached(self, skill_dir: Path) -> ResolvedEnvironment | None:
+		entry = self._entries.get(skill_dir)
+		if entry is None:
+			return None
+		if entry.fingerprint != project_fingerprint(skill_dir) or not entry.python.exists():
+			return None
+		return entry
+
+	def resolve(self, skill_dir: Path) -> ResolvedEnvironment:
+		entry = self.cached(skill_dir)
+		if entry is not None:
+			return entry
+		with self._skill_lock(skill_dir):
+			entry = self.cached(skill_dir)
+			if entry is None:
+				entry = self._sync(skill_dir)
+				self._entries[skill_dir] = entry
+			return entry
+
+	def invalidate(self, skill_dir: Path | None = None) -> None:
+		with self._lock:
+			if skill_dir is None:
+				self._entries.clear()
+			else:
+				self._entries.pop(skill_dir, None)
+
+	def _sync(self, skill_dir: Path) -> ResolvedEnvironment:
+		timeout = self._sync_timeout or env_float(SYNC_TIMEOUT_ENV, DEFAULT_SYNC_TIMEOUT)
+		env = base_env()
+		started = time.perf_counter()
+		try:
+			result = subprocess.run(
+				["uv", "sync", "--project", str(skill_dir)],
+				capture_output=True,
+				text=True,
+				env=env,
+				stdin=subprocess.DEVNULL,
+				timeout=timeout,
+			)
+		except (OSError, subprocess.TimeoutExpired) as exc:
+			self.sync_failures += 1
+			raise EnvironmentSyncError(f"uv sync failed for {skill_dir.name}: {exc}") from exc
+		elapsed = time.perf_counter() - started
+		if result.returncode != 0:
+			self.sync_failures += 1
+			raise EnvironmentSyncError(f"uv sync failed for {skill_dir.name}: {result.stderr.strip()}")
+
+		venv = venv_dir(skill_dir)
+		python = venv_python(venv)
+		if not python.exists():
+			self.sync_failures += 1
+			raise EnvironmentSyncError(f"uv sync did not create {python}")
+
+		env = base_env()
+		env.pop("PYTHONHOME", None)
+		env["VIRTUAL_ENV"] = str(venv)
+		env["PATH"] = os.pathsep.join(filter(None, [str(python.parent), env.get("PATH")]))
+		self.syncs += 1
+		return ResolvedEnvironment(
+			skill_dir=skill_dir,
+			python=python,
+			env=env,
+			fingerprint=project_fingerprint(skill_dir),
+			sync_seconds=elapsed,
+		)
+
+	def stats(self) -> dict[str, Any]:
+		return {
+			"mode": get_env_mode(),
+			"resolved": sorted(path.name for path in self._entries),
+			"syncs": self.syncs,
+			"sync_failures": self.sync_failures,
+		}
+
+
+environment_registry = EnvironmentRegistry()
+
+
+@dataclass
+class SyncResult:
+	skill: str
+	ok: bool
+	seconds: float
+	group: str | None = None
+	error: str | None = None
+
+	def as_dict(self) -> dict[str, Any]:
+		return {
+			"skill": self.skill,
+			"ok": self.ok,
+			"seconds": round(self.seconds, 3),
+			"group": self.group,
+			"error": self.error,
+		}
+
+
+def lock_signature(skill_dir: Path) -> str | None:
+	"""Hash of the third-party packages pinned in ``uv.lock``, ``None`` if it cannot be read.
+
+	The skill's own (virtual) project entry is left out, so skills that lock
+	the same dependency set share a signature.
+	"""
+	if tomllib is None:
+		return None
+	try:
+		with (skill_dir / "uv.lock").open("rb") as handle:
+			lock = tomllib.load(handle)
+	except (OSError, tomllib.TOMLDecodeError):
+		return None
+	pinned = sorted(
+		(package.get("name", ""), package.get("version", ""), repr(sorted(package.get("source", {}).items())))
+		for package in lock.get("package", [])
+		if "virtual" not in package.get("source", {})
+	)
+	return hashlib.sha256(repr(pinned).encode("utf-8")).hexdigest()[:12]
+
+
+def sync_environments(
+	skill_dirs: list[Path],
+	workers: int | None = None,
+	registry: EnvironmentRegistry | None = None,
+	on_result: Callable[[SyncResult], None] | None = None,
+) -> list[SyncResult]:
+	"""Run ``uv sync`` for every skill with at most ``workers`` in parallel.
+
+	Skills are grouped by :func:`lock_signature`. One skill per group syncs
+	first and fills the uv cache; the rest of each group follows and only
+	links the cached packages, instead of N skills downloading and
+	unpacking the same wheels at once. Results come back in input order,
+	with any error recorded in the skill's own result.
+	"""
+	registry = registry or environment_registry
+	workers = max(1, workers or env_int(SYNC_WORKERS_ENV, DEFAULT_SYNC_WORKERS))
+	groups: dict[str, list[Path]] = {}
+	signatures: dict[Path, str | None] = {}
+	for skill_dir in skill_dirs:
+		signature = signatures[skill_dir] = lock_signature(skill_dir)
+		groups.setdefault(signature or f"unlocked:{skill_dir}", []).append(skill_dir)
+	leaders = [members[0] for members in groups.values()]
+	followers = [skill_dir for members in groups.values() for skill_dir in members[1:]]
+
+	def sync_one(skill_dir: Path) -> SyncResult:
+		registry.invalidate(skill_dir)
+		started = time.perf_counter()
+		try:
+			registry.resolve(skill_dir)
+		except Exception as exc:
+			# 单个 skill 的意外错误只记在它自己的结果里，不中断整批同步
+			result = SyncResult(skill_dir.name, False, time.perf_counter() - started, signatures[skill_dir], str(exc) or type(exc).__name__)
+		else:
+			result = SyncResult(skill_dir.name, True, time.perf_counter() - started, signatures[skill_dir])
+		if on_result is not None:
+			on_result(result)
+		return result
+
+	results: dict[Path, SyncResult] = {}
+	with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="uv-sync") as pool:
+		for wave in (leaders, followers):
+			results.update(zip(wave, pool.map(sync_one, wave)))
+	return [results[skill_dir] for skill_dir in skill_dirs]
+
+
+def build_command(
+	resolved: ResolvedEnvironment | None,
+	skill_dir: Path,
+	script_path: Path,
+	argv: list[str] | None = None,
+) -> tuple[list[str], dict[str, str]]:
+	if resolved is None:
+		return uv_run_command(skill_dir, script_path, argv), base_env()
+	return [str(resolved.python), str(script_path), *(argv or [])], dict(resolved.env)
+
+
+def resolve_for_launch(skill_dir: Path, direct: bool = False) -> ResolvedEnvironment | None:
+	"""Resolved env in ``direct`` mode (or with ``direct``), ``None`` when ``uv run`` should be used.
+
+	A failed sync also yields ``None`` so the ``uv run`` child reports the real error.
+	"""
+	if not direct and get_env_mode() != ENV_MODE_DIRECT:
+		return None
+	try:
+		return environment_registry.resolve(skill_dir)
+	except EnvironmentSyncError:
+		return None
+
+
+async def script_command(
+	skill_dir: Path,
+	script_path: Path,
+	argv: list[str] | None = None,
+	direct: bool = False,
+) -> tuple[list[str], dict[str, str]]:
+	"""Command and env for a script; ``direct`` starts the venv interpreter even in ``uv`` mode."""
+	resolved = None
+	if direct or get_env_mode() == ENV_MODE_DIRECT:
+		resolved = environment_registry.cached(skill_dir)
+		if resolved is None:
+			resolved = await asyncio.to_thread(resolve_for_launch, skill_dir, direct)
+	return build_command(resolved, skill_dir, script_path, argv)
@@ -0,0 +1,446 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Iterable
+
+from .config import env_float, env_int
+from .output import OutputCapture
+
+if TYPE_CHECKING:
+	from .limits import ResourceLimits
+
+
+MAX_CONCURRENCY_ENV = "MCP_MULTISKILL_MAX_CONCURRENCY"
+SKILL_CONCURRENCY_ENV = "MCP_MULTISKILL_SKILL_CONCURRENCY"
+TIMEOUT_ENV = "MCP_MULTISKILL_TIMEOUT"
+SCHEMA_TIMEOUT_ENV = "MCP_MULTISKILL_SCHEMA_TIMEOUT"
+
+DEFAULT_SCHEMA_TIMEOUT = 60.0
+READ_CHUNK_BYTES = 64 * 1024
+
+OutputCallback = Callable[[str, bytes], Awaitable[None]]
+
+
+@dataclass
+class ProcessResult:
+	returncode: int | None
+	stdout: str
+	stderr: str
+	timed_out: bool = False
+	truncated: dict[str, Any] = field(default_factory=dict)
+	wall_seconds: float | None = None
+	spawn_seconds: float | None = None
+	cpu_seconds: float | None = None
+	max_rss_bytes: int | None = None
+	output_bytes: int = 0
+
+
+class ConcurrencyLimiter:
+	"""Global plus per-key (skill) limits on concurrently running processes."""
+
+	def __init__(self, global_limit: int | None = None, skill_limit: int | None = None) -> None:
+		self._global_limit = global_limit
+		self._skill_limit = skill_limit
+		self._loop: asyncio.AbstractEventLoop | None = None
+		self._global: asyncio.Semaphore | None = None
+		self._per_skill: dict[str, asyncio.Semaphore] = {}
+
+	@property
+	def global_limit(self) -> int:
+		if self._global_limit is not None:
+			return max(1, self._global_limit)
+		return max(1, env_int(MAX_CONCURRENCY_ENV, os.cpu_count() or 4))
+
+	@property
+	def skill_limit(self) -> int:
+		if self._skill_limit is not None:
+			return max(1, self._skill_limit)
+		return max(1, env_int(SKILL_CONCURRENCY_ENV, self.global_limit))
+
+	def _semaphores(self, key: str) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+		loop = asyncio.get_running_loop()
+		# asyncio 原语绑定事件循环，换循环（如多次 asyncio.run）时重建
+		if loop is not self._loop or self._global is None:
+			self._loop = loop
+			self._global = asyncio.Semaphore(self.global_limit)
+			self._per_skill = {}
+		skill = self._per_skill.get(key)
+		if skill is None:
+			skill = self._per_skill[key] = asyncio.Semaphore(self.skill_limit)
+		return self._global, skill
+
+	@contextlib.asynccontextmanager
+	async def slot(self, key: str) -> AsyncIterator[None]:
+		global_semaphore, skill_semaphore = self._semaphores(key)
+		# 先占 skill 配额再占全局配额，单个 skill 排队时不占用全局名额
+		async with skill_semaphore:
+			async with global_semaphore:
+				yield
+
+	@contextlib.asynccontextmanager
+	async def slots(self, keys: Iterable[str]) -> AsyncIterator[None]:
+		"""A slot of every distinct key plus one global slot, e.g. for the skills of one pipeline."""
+		async with contextlib.AsyncExitStack() as stack:
+			# 按固定顺序占各 skill 配额，两条管道交叉使用同样的 skill 时不会互相等待而死锁
+			for key in sorted(set(keys)):
+				global_semaphore, skill_semaphore = self._semaphores(key)
+				await stack.enter_async_context(skill_semaphore)
+			await stack.enter_async_context(global_semaphore)
+			yield
+
+
+limiter = ConcurrencyLimiter()
+
+
+def default_timeout() -> float | None:
+	timeout = env_float(TIMEOUT_ENV, None)
+	return timeout if timeout and timeout > 0 else None
+
+
+def schema_timeout() -> float | None:
+	timeout = env_float(SCHEMA_TIMEOUT_ENV, DEFAULT_SCHEMA_TIMEOUT)
+	return timeout if timeout and timeout > 0 else None
+
+
+def kill_process_tree(process: subprocess.Popen) -> None:
+	if process.returncode is not None:
+		return
+	try:
+		os.killpg(process.pid, signal.SIGKILL)
+	except (ProcessLookupError, PermissionError, AttributeError):
+		try:
+			process.kill()
+		except ProcessLookupError:
+			pass
+
+
+def kill_process_group(pid: int) -> None:
+	try:
+		os.killpg(pid, signal.SIGKILL)
+	except (ProcessLookupError, PermissionError, AttributeError):
+		pass
+
+
+def _feed_stdin(pipe, data: bytes) -> None:
+	try:
+		pipe.write(data)
+	except (BrokenPipeError, ConnectionResetError, ValueError):
+		pass
+	finally:
+		try:
+			pipe.close()
+		except OSError:
+			pass
+
+
+async def _read_pipe(pipe) -> asyncio.StreamReader:
+	loop = asyncio.get_running_loop()
+	reader = asyncio.StreamReader(limit=READ_CHUNK_BYTES, loop=loop)
+	await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe)
+	return reader
+
+
+async def _pump(
+	stream: asyncio.StreamReader,
+	capture: OutputCapture,
+	on_output: OutputCallback | None,
+) -> None:
+	while True:
+		chunk = await stream.read(READ_CHUNK_BYTES)
+		if not chunk:
+			return
+		capture.feed(chunk)
+		if on_output is not None:
+			try:
+				await on_output(capture.name, chunk)
+			except Exception:
+				# 客户端断开等转发失败不影响脚本执行，后续不再转发
+				on_output = None
+
+
+def _wait4(pid: int) -> tuple[int, Any]:
+	while True:
+		try:
+			_pid, status, usage = os.wait4(pid, 0)
+		except InterruptedError:
+			continue
+		return os.waitstatus_to_exitcode(status), usage
+
+
+async def _wait_child(pid: int) -> tuple[int, Any]:
+	"""Reap ``pid`` with ``wait4`` to get its rusage; pidfd makes the wait loop-native on Linux."""
+	pidfd_open = getattr(os, "pidfd_open", None)
+	try:
+		fd = pidfd_open(pid) if pidfd_open else None
+	except OSError:
+		fd = None
+	if fd is None:
+		return await asyncio.to_thread(_wait4, pid)
+
+	loop = asyncio.get_running_loop()
+	exited = loop.create_future()
+
+	def on_exit() -> None:
+		if not exited.done():
+			exited.set_result(None)
+
+	loop.add_reader(fd, on_exit)
+	try:
+		await exited
+	finally:
+		loop.remove_reader(fd)
+		os.close(fd)
+	return _wait4(pid)
+
+
+def _reap_in_background(pid: int) -> None:
+	# 取消后不能再 await，由后台线程回收僵尸进程
+	def reap() -> None:
+		try:
+			os.waitpid(pid, 0)
+		except ChildProcessError:
+			pass
+
+	threading.Thread(target=reap, name=f"reap-{pid}", daemon=True).start()
+
+
+def _max_rss_bytes(usage: Any) -> int | None:
+	if usage is None:
+		return None
+	# Linux 以 KiB 为单位，macOS 以字节为单位
+	return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+async def run_process(
+	command: list[str],
+	*,
+	env: dict[str, str] | None = None,
+	stdin: str | bytes | None = None,
+	timeout: float | None = None,
+	max_output_bytes: int | None = None,
+	on_output: OutputCallback | None = None,
+	limits: ResourceLimits | None = None,
+	stdin_path: Path | None = None,
+	stdout_path: Path | None = None,
+) -> ProcessResult:
+	"""Run ``command`` without blocking the loop; kill its process group on timeout or cancellation.
+
+	stdout/stderr are read incrementally into bounded captures and, if given,
+	forwarded chunk by chunk to ``on_output``. The child is reaped with
+	``wait4`` so its CPU time and peak RSS end up in the result.
+
+	With ``limits`` the child gets their rlimits before exec, and whatever
+	is left of its process group is killed once it exits.
+
+	``stdin_path`` / ``stdout_path`` connect the child directly to files, so
+	payloads of any size pass through without being held in memory; the
+	result's ``stdout`` is then empty and ``output_bytes`` counts the file.
+	"""
+	started = time.perf_counter()
+	preexec_fn = await _rlimit_setter(limits)
+	with contextlib.ExitStack() as files:
+		if stdin_path is not None:
+			stdin_target = files.enter_context(open(stdin_path, "rb"))
+		else:
+			stdin_target = subprocess.DEVNULL if stdin is None else subprocess.PIPE
+		stdout_target = files.enter_context(open(stdout_path, "wb")) if stdout_path is not None else subprocess.PIPE
+		# 子进程继承文件描述符后父进程立即关闭自己的副本
+		process = _spawn(command, env, stdin_target, stdout_target, preexec_fn)
+	return await _collect(
+		process,
+		started,
+		time.perf_counter() - started,
+		stdin=stdin if stdin_path is None else None,
+		timeout=timeout,
+		max_output_bytes=max_output_bytes,
+		on_output=on_output,
+		limits=limits,
+		stdout_path=stdout_path,
+	)
+
+
+async def _rlimit_setter(limits: ResourceLimits | None) -> Callable[[], None] | None:
+	# max_processes 需要扫描 /proc 统计现有进程数，不在事件循环上做
+	if limits is None:
+		return None
+	return await asyncio.to_thread(limits.preexec_fn)
+
+
+def _spawn(
+	command: list[str],
+	env: dict[str, str] | None,
+	stdin: Any,
+	stdout: Any,
+	preexec_fn: Callable[[], None] | None,
+) -> subprocess.Popen:
+	return subprocess.Popen(
+		command,
+		stdin=stdin,
+		stdout=stdout,
+		stderr=subprocess.PIPE,
+		env=env,
+		start_new_session=True,
+		preexec_fn=preexec_fn,
+	)
+
+
+async def _collect(
+	process: subprocess.Popen,
+	started: float,
+	spawn_seconds: float,
+	*,
+	stdin: str | bytes | None = None,
+	timeout: float | None = None,
+	max_output_bytes: int | None = None,
+	on_output: OutputCallback | None = None,
+	limits: ResourceLimits | None = None,
+	stdout_path: Path | None = None,
+) -> ProcessResult:
+	captures = [
+		OutputCapture("stdout", limit=max_output_bytes),
+		OutputCapture("stderr", limit=max_output_bytes),
+	]
+	readers: list[asyncio.Future] = []
+	waiter: asyncio.Future | None = None
+	timed_out = False
+	try:
+		pipes = [(process.stdout, captures[0]), (process.stderr, captures[1])]
+		for pipe, capture in pipes:
+			if pipe is not None:
+				stream = await _read_pipe(pipe)
+				readers.append(asyncio.ensure_future(_pump(stream, capture, on_output)))
+		if stdin is not None and process.stdin is not None:
+			data = stdin if isinstance(stdin, bytes) else stdin.encode("utf-8")
+			readers.append(asyncio.ensure_future(asyncio.to_thread(_feed_stdin, process.stdin, data)))
+		waiter = asyncio.ensure_future(_wait_child(process.pid))
+		try:
+			await asyncio.wait_for(asyncio.shield(waiter), timeout)
+		except asyncio.TimeoutError:
+			timed_out = True
+			kill_process_tree(process)
+		returncode, usage = await waiter
+		process.returncode = returncode
+		if limits is not None:
+			# 受限 skill 留下的后台子进程不允许活过本次调用，也不再占着输出管道
+			kill_process_group(process.pid)
+		await asyncio.gather(*readers)
+	except BaseException:
+		# 取消时不再 await：直接杀掉进程组，由后台线程回收
+		kill_process_tree(process)
+		for reader in readers:
+			reader.cancel()
+		if waiter is None or not waiter.done():
+			if waiter is not None:
+				waiter.cancel()
+			_reap_in_background(process.pid)
+		if process.returncode is None:
+			process.returncode = -signal.SIGKILL
+		for capture in captures:
+			capture.close()
+		raise
+
+	return ProcessResult(
+		returncode=returncode,
+		stdout=captures[0].text(),
+		stderr=captures[1].text(),
+		timed_out=timed_out,
+		truncated={capture.name: capture.info() for capture in captures if capture.truncated},
+		wall_seconds=time.perf_counter() - started,
+		spawn_seconds=spawn_seconds,
+		cpu_seconds=usage.ru_utime + usage.ru_stime,
+		max_rss_bytes=_max_rss_bytes(usage),
+		output_bytes=sum(capture.total for capture in captures) + (_file_size(stdout_path) if stdout_path is not None else 0),
+	)
+
+
+@dataclass
+class PipelineStep:
+	command: list[str]
+	env: dict[str, str] | None = None
+	limits: ResourceLimits | None = None
+	timeout: float | None = None
+	max_output_bytes: int | None = None
+
+
+async def run_pipeline(
+	steps: list[PipelineStep],
+	*,
+	stdin: str | bytes | None = None,
+	stdin_path: Path | None = None,
+	on_output: OutputCallback | None = None,
+) -> list[ProcessResult]:
+	"""Run ``steps`` like a shell pipeline: all at once, each stdout piped into the next stdin.
+
+	Intermediate output flows through OS pipes between the children and never
+	passes through this process; only the last step's stdout and every
+	step's stderr are captured. Results come back in step order.
+	"""
+	started = time.perf_counter()
+	setters = [await _rlimit_setter(step.limits) for step in steps]
+	processes: list[tuple[subprocess.Popen, float]] = []
+	pending_fds: list[int] = []
+	try:
+		with contextlib.ExitStack() as files:
+			if stdin_path is not None:
+				upstream: Any = files.enter_context(open(stdin_path, "rb"))
+			else:
+				upstream = subprocess.DEVNULL if stdin is None else subprocess.PIPE
+			for index, step in enumerate(steps):
+				last = index == len(steps) - 1
+				if last:
+					read_fd, downstream = None, subprocess.PIPE
+				else:
+					read_fd, downstream = os.pipe()
+					pending_fds += [read_fd, downstream]
+				spawned = time.perf_counter()
+				process = _spawn(step.command, step.env, upstream, downstream, setters[index])
+				processes.append((process, time.perf_counter() - spawned))
+				# 父进程不保留管道两端，前一步退出时下一步才能读到 EOF
+				for fd in (upstream, downstream):
+					if isinstance(fd, int) and fd in pending_fds:
+						os.close(fd)
+						pending_fds.remove(fd)
+				upstream = read_fd
+	except BaseException:
+		for fd in pending_fds:
+			os.close(fd)
+		for process, _spawn_seconds in processes:
+			kill_process_tree(process)
+			_reap_in_background(process.pid)
+		raise
+
+	collectors = [
+		asyncio.ensure_future(_collect(
+			process,
+			started,
+			spawn_seconds,
+			stdin=stdin if index == 0 and stdin_path is None else None,
+			timeout=step.timeout,
+			max_output_bytes=step.max_output_bytes,
+			on_output=on_output if index == len(steps) - 1 else None,
+			limits=step.limits,
+		))
+		for index, (step, (process, spawn_seconds)) in enumerate(zip(steps, processes))
+	]
+	try:
+		return list(await asyncio.gather(*collectors))
+	except BaseException:
+		for collector in collectors:
+			collector.cancel()
+		raise
+
+
+def _file_size(path: Path) -> int:
+	try:
+		return path.stat().st_size
+	except OSError:
+		return 0
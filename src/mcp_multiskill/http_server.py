@@ -0,0 +1,106 @@
+"""Long-running HTTP mode: one warm server process shared by many clients.
+
+Every client connected over streamable HTTP or SSE talks to the same
+process, so the skill registry, schema and render caches, memo cache,
+resolved environments and worker pool are shared instead of rebuilt per
+client. ``run_skill`` calls are scheduled fairly between clients (see
+``clients.py``), and SIGTERM/SIGINT drains in-flight calls before exiting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any
+
+from .clients import scheduler
+from .config import env_float, env_int
+
+
+TRANSPORT_ENV = "MCP_MULTISKILL_TRANSPORT"
+HOST_ENV = "MCP_MULTISKILL_HOST"
+PORT_ENV = "MCP_MULTISKILL_PORT"
+DRAIN_SECONDS_ENV = "MCP_MULTISKILL_DRAIN_SECONDS"
+
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_DRAIN_SECONDS = 30.0
+# 排空后仍打开的只是空闲的 SSE 流，给响应写出留一点时间即可
+CLOSE_GRACE_SECONDS = 2.0
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+logger = logging.getLogger("mcp_multiskill")
+
+
+def default_transport() -> str:
+	value = os.environ.get(TRANSPORT_ENV, "").strip()
+	return value if value in TRANSPORTS else "stdio"
+
+
+def default_host() -> str:
+	return os.environ.get(HOST_ENV, "").strip() or DEFAULT_HOST
+
+
+def default_port() -> int:
+	return env_int(PORT_ENV, DEFAULT_PORT)
+
+
+def drain_seconds() -> float:
+	return max(0.0, env_float(DRAIN_SECONDS_ENV, DEFAULT_DRAIN_SECONDS))
+
+
+def build_app(transport: str, host: str) -> Any:
+	from .server import mcp
+
+	mcp.settings.host = host
+	if host not in LOOPBACK_HOSTS:
+		# FastMCP 只在回环地址上启用 Host 头校验，对外监听时由反向代理负责
+		mcp.settings.transport_security = None
+	if transport == "streamable-http":
+		return mcp.streamable_http_app()
+	if transport == "sse":
+		return mcp.sse_app()
+	raise ValueError(f"Unsupported HTTP transport: {transport}")
+
+
+def serve_http(transport: str, host: str, port: int, drain: float | None = None) -> None:
+	import uvicorn
+
+	drain = drain_seconds() if drain is None else drain
+
+	class DrainingServer(uvicorn.Server):
+		"""First signal: refuse new ``run_skill`` calls and wait for running ones,
+		then shut down; a second signal exits without waiting."""
+
+		draining = False
+
+		def handle_exit(self, sig, frame) -> None:
+			if self.draining or self.should_exit:
+				super().handle_exit(sig, frame)
+				return
+			self.draining = True
+			self._captured_signals.append(sig)
+			# 信号处理函数里只能安排任务，排空在事件循环中进行
+			asyncio.get_running_loop().call_soon_threadsafe(self._start_drain)
+
+		def _start_drain(self) -> None:
+			self._drain_task = asyncio.get_running_loop().create_task(self.drain())
+
+		async def drain(self) -> None:
+			scheduler.begin_drain()
+			stats = scheduler.stats()
+			logger.info("mcp-multiskill draining %d running, %d queued run_skill calls", stats["running"], stats["waiting"])
+			if not await scheduler.wait_idle(drain):
+				logger.warning("mcp-multiskill drain timed out after %.0fs", drain)
+			self.should_exit = True
+
+	config = uvicorn.Config(
+		build_app(transport, host),
+		host=host,
+		port=port,
+		log_level="info",
+		timeout_graceful_shutdown=CLOSE_GRACE_SECONDS,
+	)
+	asyncio.run(DrainingServer(config).serve())
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import signal
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+try:
+	import resource
+except ImportError:  # Windows
+	resource = None
+
+
+LIMITS_TABLE = "limits"
+LIMIT_KEYS = ("timeout", "cpu_seconds", "memory_mb", "max_output_bytes", "max_processes")
+
+# 超出 RLIMIT_AS / RLIMIT_NPROC 时进程不会被信号杀死，只能从报错判断
+_MEMORY_ERRORS = re.compile(r"MemoryError|Cannot allocate memory|std::bad_alloc|out of memory", re.IGNORECASE)
+_FORK_ERRORS = re.compile(r"Resource temporarily unavailable|BlockingIOError|fork: retry")
+
+_USER_PROCESSES_TTL = 1.0
+_user_processes: tuple[float, int] | None = None
+
+
+def _positive(value: Any) -> float | None:
+	if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+		return None
+	return value
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+	"""Per-skill caps from ``[tool.mcp-multiskill.limits]``.
+
+	``cpu_seconds``, ``memory_mb`` (address space) and ``max_processes`` become
+	rlimits set in the child before exec and are inherited by everything it
+	starts; ``timeout`` and ``max_output_bytes`` cap the per-call values.
+	"""
+
+	timeout: float | None = None
+	cpu_seconds: float | None = None
+	memory_mb: float | None = None
+	max_output_bytes: int | None = None
+	max_processes: int | None = None
+
+	@classmethod
+	def from_table(cls, table: Any) -> ResourceLimits | None:
+		if not isinstance(table, dict):
+			return None
+		values = {key: _positive(table.get(key)) for key in LIMIT_KEYS}
+		for key in ("max_output_bytes", "max_processes"):
+			if values[key] is not None:
+				values[key] = int(values[key])
+		limits = cls(**values)
+		return limits if limits.as_dict() else None
+
+	def as_dict(self) -> dict[str, Any]:
+		return {key: getattr(self, key) for key in LIMIT_KEYS if getattr(self, key) is not None}
+
+	def cap_timeout(self, timeout: float | None) -> float | None:
+		if self.timeout is None:
+			return timeout
+		return self.timeout if timeout is None else min(timeout, self.timeout)
+
+	def cap_output(self, max_output_bytes: int | None) -> int | None:
+		if self.max_output_bytes is None:
+			return max_output_bytes
+		return self.max_output_bytes if max_output_bytes is None else min(max_output_bytes, self.max_output_bytes)
+
+	def rlimits(self) -> list[tuple[int, int, int]]:
+		if resource is None:
+			return []
+		limits = []
+		if self.cpu_seconds is not None:
+			# 软限制触发 SIGXCPU，1 秒后硬限制发 SIGKILL
+			soft = math.ceil(self.cpu_seconds)
+			limits.append((resource.RLIMIT_CPU, soft, soft + 1))
+		if self.memory_mb is not None:
+			size = int(self.memory_mb * 1024 * 1024)
+			limits.append((resource.RLIMIT_AS, size, size))
+		running = count_user_processes() if self.max_processes is not None else None
+		if running is not None and hasattr(resource, "RLIMIT_NPROC"):
+			# RLIMIT_NPROC 按用户计数，在该用户现有进程数之上再放行 max_processes 个
+			count = running + self.max_processes
+			limits.append((resource.RLIMIT_NPROC, count, count))
+		return limits
+
+	def preexec_fn(self) -> Callable[[], None] | None:
+		"""Function for ``Popen(preexec_fn=...)``; computed in the parent so the child only calls setrlimit."""
+		limits = self.rlimits()
+		if not limits:
+			return None
+
+		def apply() -> None:
+			for kind, soft, hard in limits:
+				resource.setrlimit(kind, (soft, hard))
+
+		return apply
+
+	def exceeded(self, result: Any, policy_timeout: bool) -> list[str]:
+		"""Names of the limits ``result`` (a ``ProcessResult``) ran into.
+
+		``policy_timeout`` tells whether ``timeout`` was the effective wall limit
+		for the call rather than a shorter one passed by the caller.
+		"""
+		hit = []
+		if result.timed_out and policy_timeout:
+			hit.append("timeout")
+		failed = result.returncode not in (0, None) and not result.timed_out
+		if failed and self.cpu_seconds is not None and _cpu_killed(result, self.cpu_seconds):
+			hit.append("cpu_seconds")
+		if failed and self.memory_mb is not None and _MEMORY_ERRORS.search(result.stderr):
+			hit.append("memory_mb")
+		if failed and self.max_processes is not None and _FORK_ERRORS.search(result.stderr):
+			hit.append("max_processes")
+		if self.max_output_bytes is not None and result.truncated:
+			hit.append("max_output_bytes")
+		return hit
+
+
+def _cpu_killed(result: Any, cpu_seconds: float) -> bool:
+	signals = {signal.SIGKILL, getattr(signal, "SIGXCPU", signal.SIGKILL)}
+	# 直接杀死为负的信号号；经 uv run 等包装进程转发时为 128 + 信号号
+	killed_by = -result.returncode if result.returncode < 0 else result.returncode - 128
+	used = result.cpu_seconds or 0.0
+	return killed_by in signals and used >= math.ceil(cpu_seconds) - 0.5
+
+
+def count_user_processes() -> int | None:
+	"""Processes owned by this uid, from ``/proc`` (``None`` without it); cached for a second."""
+	global _user_processes
+	now = time.monotonic()
+	if _user_processes is not None and now - _user_processes[0] < _USER_PROCESSES_TTL:
+		return _user_processes[1]
+	uid = os.getuid()
+	count = 0
+	try:
+		entries = os.scandir("/proc")
+	except OSError:
+		return None
+	with entries:
+		for entry in entries:
+			if not entry.name.isdigit():
+				continue
+			try:
+				if entry.stat().st_uid == uid:
+					count += 1
+			except OSError:
+				continue
+	_user_processes = (now, count)
+	return count
+
+
+def usage_dict(result: Any) -> dict[str, Any]:
+	return {
+		"wall_seconds": None if result.wall_seconds is None else round(result.wall_seconds, 3),
+		"cpu_seconds": None if result.cpu_seconds is None else round(result.cpu_seconds, 3),
+		"max_rss_bytes": result.max_rss_bytes,
+		"output_bytes": result.output_bytes,
+	}
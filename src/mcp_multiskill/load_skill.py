@@ -1,17 +1,60 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
-import os
-import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, AsyncContextManager, Callable
 
+from .catalog import SkillCatalog, configured_roots
+from .environments import project_fingerprint, script_command
+from .executor import (
+	OutputCallback,
+	PipelineStep,
+	ProcessResult,
+	default_timeout,
+	limiter,
+	run_pipeline,
+	run_process,
+	schema_timeout,
+)
+from .limits import usage_dict
+from .memo import compute_result_key, memo_cache, memo_enabled
+from .metrics import metrics
+from .output import OutputCapture, max_output_bytes as default_output_bytes
+from .payloads import decode_base64, payload_path, resolve_argv, stdout_payload
+from .registry import SKILL_MARKDOWN, SkillEntry, SkillRegistry, file_stamp, markdown_hash, skill_fingerprint
+from .render import schema_signature, script_section
+from .render_cache import render_cache
+from .results import RECORDS_KIND, ResultChannel, read_records_page
+from .scratch import DEFAULT_PAGE_BYTES, scratch_area
+from .skill_config import load_skill_config
+from .schema_cache import compute_schema_key, schema_cache, schema_cache_enabled
+from .tasks import TaskCache
 
-SKILL_MARKDOWN = "SKILL.md"
+# 搜索、静态解析、参数校验与常驻进程池只在首次用到时导入，缩短 server 启动时间
+if TYPE_CHECKING:
+	from .limits import ResourceLimits
+	from .search import SkillSearchIndex
+	from .static_schema import ParserSpec
+	from .worker_pool import WorkerPool
+
+
+_registries: dict[Path, SkillRegistry] = {}
+_catalog: SkillCatalog | None = None
+_search_indexes: dict[Path | None, SkillSearchIndex] = {}
+_schema_tasks = TaskCache()
+_render_tasks = TaskCache()
+
+
+_DEFAULT_SKILLS_ROOT = Path(__file__).resolve().parents[2] / "skills"
 
 
 def get_default_skills_root() -> Path:
-	return Path(__file__).resolve().parents[2] / "skills"
+	# 模块加载时解析一次，run_skill 命中缓存时不再每次 resolve()
+	return _DEFAULT_SKILLS_ROOT
 
 
 def list_skill_dirs(skills_root: Path | None = None) -> list[Path]:
@@ -64,18 +107,107 @@ def list_skill_scripts(skill_name: str, skills_root: Path | None = None) -> list
 	return scripts
 
 
-def _get_script_schema(script_path: Path, skill_dir: Path) -> Any:
-	env = os.environ.copy()
+def load_skill_entry(skill_dir: Path) -> SkillEntry:
+	markdown = read_skill_markdown(skill_dir.name, skill_dir.parent)
+	scripts = list_skill_scripts(skill_dir.name, skill_dir.parent)
+	return SkillEntry(
+		name=skill_dir.name,
+		path=skill_dir,
+		markdown=markdown,
+		description=markdown.splitlines()[0].strip(),
+		scripts=scripts,
+		markdown_hash=markdown_hash(markdown),
+		fingerprint=skill_fingerprint(skill_dir, scripts),
+	)
+
+
+def get_skill_catalog() -> SkillCatalog:
+	"""Merged catalog of the configured roots (``MCP_MULTISKILL_SKILL_ROOTS``, default ``skills/``)."""
+	global _catalog
+	if _catalog is None:
+		_catalog = SkillCatalog(configured_roots(get_default_skills_root()), load_skill_entry)
+	return _catalog
+
+
+def get_skill_registry(skills_root: Path | None = None) -> SkillRegistry | SkillCatalog:
+	if skills_root is None:
+		return get_skill_catalog()
+	registry = _registries.get(skills_root)
+	if registry is None:
+		registry = _registries.setdefault(skills_root, SkillRegistry(skills_root, load_skill_entry))
+	return registry
+
+
+def lookup_skill(skill_name: str, skills_root: Path | None = None) -> SkillEntry:
+	entry = get_skill_registry(skills_root).get(skill_name)
+	if entry is None:
+		# 复用 get_skill_dir 的错误信息
+		get_skill_dir(skill_name, skills_root)
+		raise ValueError(f"Skill not found: {skill_name}")
+	return entry
+
+
+async def get_script_schema(
+	script_path: Path,
+	skill_dir: Path,
+	gate: Callable[[], AsyncContextManager[Any]] | None = None,
+) -> Any:
+	"""Parser schema of ``script_path``.
+
+	An extraction subprocess runs under ``gate`` (e.g. prewarm's own bound)
+	instead of the shared process limiter when one is given.
+	"""
+	# 同一脚本的并发请求（如预热与 get_skill）共享一次提取
+	version = (file_stamp(script_path), project_fingerprint(skill_dir))
+	return await _schema_tasks.get(script_path, version, lambda: _get_script_schema(script_path, skill_dir, gate))
+
+
+def _parser_spec(script_path: Path) -> ParserSpec | None:
+	"""Statically read parser, used to render the script's real option names."""
+	from .static_schema import extract_parser_spec
+
+	return extract_parser_spec(script_path)
+
+
+async def _get_script_schema(
+	script_path: Path,
+	skill_dir: Path,
+	gate: Callable[[], AsyncContextManager[Any]] | None = None,
+) -> Any:
+	from .static_schema import extract_static_schema, static_schema_enabled
+
+	started = time.perf_counter()
+	if static_schema_enabled():
+		schema = extract_static_schema(script_path)
+		if schema is not None:
+			metrics.record_timing("schema_ms", time.perf_counter() - started, source="static")
+			return schema
+
+	key = compute_schema_key(script_path, skill_dir) if schema_cache_enabled() else None
+	if key is not None:
+		hit, schema = schema_cache.lookup(key)
+		if hit:
+			metrics.record_timing("schema_ms", time.perf_counter() - started, source="cache")
+			return schema
+
+	schema = await _extract_script_schema(script_path, skill_dir, gate)
+	if key is not None:
+		schema_cache.store(key, schema)
+	metrics.record_timing("schema_ms", time.perf_counter() - started, source="subprocess")
+	return schema
+
+
+async def _extract_script_schema(
+	script_path: Path,
+	skill_dir: Path,
+	gate: Callable[[], AsyncContextManager[Any]] | None = None,
+) -> Any:
+	command, env = await script_command(skill_dir, script_path)
 	env["PRINT_MCP_SCHEMA"] = "1"
-	command = [
-		"uv",
-		"run",
-		"--project",
-		str(skill_dir),
-		"python",
-		str(script_path),
-	]
-	result = subprocess.run(command, capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+	async with gate() if gate is not None else limiter.slot(skill_dir.name):
+		result = await run_process(command, env=env, timeout=schema_timeout())
+	if result.timed_out:
+		raise RuntimeError(f"Timed out extracting parser schema from {script_path.name}")
 	if result.returncode != 0:
 		raise RuntimeError(
 			f"Failed to extract parser schema from {script_path.name}: {result.stderr.strip()}"
@@ -90,10 +222,29 @@ def _get_script_schema(script_path: Path, skill_dir: Path) -> Any:
 		return output
 
 
-def render_skill_for_client(skill_name: str, skills_root: Path | None = None) -> str:
-	skill_dir = get_skill_dir(skill_name, skills_root)
-	base_markdown = read_skill_markdown(skill_name, skills_root)
-	scripts = list_skill_scripts(skill_name, skills_root)
+async def render_skill_for_client(skill_name: str, skills_root: Path | None = None, compact: bool = False) -> str:
+	started = time.perf_counter()
+	entry = lookup_skill(skill_name, skills_root)
+	# 未变化的 skill 只需一轮 stat 即可命中；内容相同（如仅 touch）时沿用已渲染结果
+	document, sections = render_cache.skill_keys(entry)
+	key = _render_key(document, compact)
+	text = render_cache.get(key)
+	if text is None:
+		text = await _render_tasks.get((entry.path, compact), key, lambda: _render_skill(entry, sections, compact))
+		render_cache.store(key, text)
+	metrics.record_timing("render_ms", time.perf_counter() - started, format="compact" if compact else "full")
+	return text
+
+
+def _render_key(key: str, compact: bool) -> str:
+	return f"{key}:{'compact' if compact else 'full'}"
+
+
+async def _render_skill(entry: SkillEntry, sections: dict[str, str], compact: bool = False) -> str:
+	skill_name = entry.name
+	skill_dir = entry.path
+	base_markdown = entry.markdown
+	scripts = entry.scripts
 
 	lines: list[str] = [base_markdown, "", "## Tool Invocation", ""]
 	if not scripts:
@@ -106,70 +257,556 @@ def render_skill_for_client(skill_name: str, skills_root: Path | None = None) ->
 	# lines.append("- stdin: optional text passed to process stdin")
 	lines.append("")
 
-	for script in scripts:
-		schema = _get_script_schema(script, skill_dir)
-		lines.append(f"### {script.name}")
-		lines.append(f"- script_name: `{script.stem}`")
-		if schema is not None:
-			lines.append("Argument schema:")
-			lines.append("```json")
-			lines.append(json.dumps(schema, ensure_ascii=False, indent=2))
-			lines.append("```")
-			lines.append("")
-
+	# 只有内容变化的脚本需要重新取 schema，其余段落直接复用
+	texts = await asyncio.gather(*(
+		_script_text(script, skill_dir, sections[script.name], compact) for script in scripts
+	))
+	if compact:
+		lines.append("Scripts (`script_name` then argv options; `[...]` is optional). Call `get_skill_script` for a script's full argument schema.")
+		lines.append("")
+	lines.extend(texts)
 	return "\n".join(lines).strip()
 
 
+async def _script_text(script: Path, skill_dir: Path, section_key: str, compact: bool) -> str:
+	key = _render_key(section_key, compact)
+	text = render_cache.get(key)
+	if text is None:
+		schema = await get_script_schema(script, skill_dir)
+		result = load_skill_config(skill_dir).result_spec(script.stem)
+		spec = _parser_spec(script)
+		if compact:
+			text = f"- `{schema_signature(script.stem, schema, result, spec)}`"
+		else:
+			text = "\n".join(script_section(script, schema, result, spec))
+		render_cache.store(key, text)
+	return text
+
+
+async def render_script_for_client(skill_name: str, script_name: str, skills_root: Path | None = None) -> str:
+	entry = lookup_skill(skill_name, skills_root)
+	script_path = resolve_script(entry.path, skill_name, script_name)
+	section_key = render_cache.skill_keys(entry)[1].get(script_path.name)
+	if section_key is None:
+		# 不在 entry 的脚本列表里（如以下划线开头），不缓存
+		schema = await get_script_schema(script_path, entry.path)
+		result = load_skill_config(entry.path).result_spec(script_path.stem)
+		spec = _parser_spec(script_path)
+		return "\n".join(script_section(script_path, schema, result, spec)).strip()
+	return (await _script_text(script_path, entry.path, section_key, compact=False)).strip()
+
+
+def resolve_script(skill_dir: Path, skill_name: str, script_name: str) -> Path:
+	script_file = script_name if script_name.endswith(".py") else f"{script_name}.py"
+	script_path = skill_dir / script_file
+	if not script_path.exists():
+		raise ValueError(f"Script not found in skill {skill_name}: {script_file}")
+	return script_path
+
+
 def list_skills_summary(skills_root: Path | None = None) -> list[dict[str, str]]:
-	summaries: list[dict[str, str]] = []
-	for skill_dir in list_skill_dirs(skills_root):
-		skill_name = skill_dir.name
-		summaries.append(
-			{
-				"name": skill_name,
-				"description": get_skill_description(skill_name, skills_root),
-			}
-		)
+	started = time.perf_counter()
+	summaries = [entry.summary() for entry in get_skill_registry(skills_root).entries()]
+	metrics.record_timing("index_ms", time.perf_counter() - started)
 	return summaries
 
 
-def run_skill_script(
+def get_search_index(skills_root: Path | None = None) -> SkillSearchIndex:
+	from .search import SkillSearchIndex
+
+	registry = get_skill_registry(skills_root)
+	index = _search_indexes.get(skills_root)
+	if index is None or index.registry is not registry:
+		index = _search_indexes[skills_root] = SkillSearchIndex(registry)
+	return index
+
+
+def search_skills(query: str, limit: int = 10, skills_root: Path | None = None) -> list[dict[str, Any]]:
+	started = time.perf_counter()
+	results = get_search_index(skills_root).search(query, limit)
+	metrics.record_timing("search_ms", time.perf_counter() - started)
+	return results
+
+
+async def run_skill_script(
 	skill_name: str,
 	script_name: str,
 	argv: list[str] | None = None,
 	skills_root: Path | None = None,
 	stdin: str | None = None,
+	timeout: float | None = None,
+	max_output_bytes: int | None = None,
+	on_output: OutputCallback | None = None,
+	stdin_handle: str | None = None,
+	stdin_base64: str | None = None,
+	binary_stdout: bool = False,
 ) -> dict[str, Any]:
-	skill_dir = get_skill_dir(skill_name, skills_root)
-	script_file = script_name if script_name.endswith(".py") else f"{script_name}.py"
-	script_path = skill_dir / script_file
-	if not script_path.exists():
-		raise ValueError(f"Script not found in skill {skill_name}: {script_file}")
+	"""Run one script and return its result payload.
 
-	command = [
-		"uv",
-		"run",
-		"--project",
-		str(skill_dir),
-		"python",
-		str(script_path),
-		*(argv or []),
-	]
+	Besides text ``stdin``, input can come from an uploaded payload file
+	(``stdin_handle``) or small inline bytes (``stdin_base64``), and
+	``payload://<handle>`` arguments are replaced by the payload's path.
+	``binary_stdout`` sends stdout straight to a scratch file, returned
+	inline as base64 when small and as ``stdout_handle`` otherwise. A
+	structured value or records the script emits (see ``results.py``) come
+	back as ``result`` / ``records``, checked against the declared schema.
+	"""
+	started = time.perf_counter()
+	skill_dir = lookup_skill(skill_name, skills_root).path
+	script_path = resolve_script(skill_dir, skill_name, script_name)
+
+	if sum(value is not None for value in (stdin, stdin_handle, stdin_base64)) > 1:
+		raise ValueError("Pass only one of stdin, stdin_handle and stdin_base64")
+	stdin_path = payload_path(stdin_handle) if stdin_handle is not None else None
+	if stdin_base64 is not None:
+		stdin = decode_base64(stdin_base64)
+	argv, argv_payload = resolve_argv(argv)
+	uses_payload = argv_payload or stdin_handle is not None or stdin_base64 is not None or binary_stdout
 
-	# 复制当前环境，移除 VIRTUAL_ENV
-	env = os.environ.copy()
-	env.pop("VIRTUAL_ENV", None)
-	result = subprocess.run(
-		command,
-		capture_output=True,
-		text=True,
-		input=stdin,
-		stdin=subprocess.DEVNULL if stdin is None else None,
-		env=env,
+	config = load_skill_config(skill_dir)
+	memo_key = None
+	# 载荷文件可追加改写，内容不在 key 里，不参与结果缓存
+	if memo_enabled() and config.is_cacheable(script_path.stem) and not uses_payload:
+		memo_key = compute_result_key(script_path, skill_dir, argv, stdin)
+		cached = memo_cache.lookup(memo_key)
+		if cached is not None:
+			metrics.increment("run_memo_hits", skill=skill_name, script=script_path.stem)
+			if on_output is not None:
+				for name in ("stdout", "stderr"):
+					if cached[name]:
+						await on_output(name, cached[name].encode("utf-8"))
+			cached["cached"] = True
+			return cached
+
+	if config.validate_argv:
+		rejected = _validate_argv(skill_name, script_path, argv)
+		if rejected is not None:
+			return rejected
+
+	from .worker_pool import get_worker_pool
+
+	limits = config.limits
+	# rlimit 要落在解释器上而不是 uv run 上（uv 自身的解析与线程也会被计入），受限 skill 总是直接启动 venv 解释器
+	command, env = await script_command(skill_dir, script_path, argv, direct=limits is not None)
+	channel = ResultChannel(scratch_area)
+	env = {**env, **channel.env()}
+	if timeout is None:
+		timeout = default_timeout()
+	policy_timeout = False
+	if limits is not None:
+		policy_timeout = limits.timeout is not None and (timeout is None or limits.timeout <= timeout)
+		timeout = limits.cap_timeout(timeout)
+		max_output_bytes = limits.cap_output(max_output_bytes)
+	resolved = time.perf_counter()
+
+	result = None
+	warm_run = False
+	async with limiter.slot(skill_name):
+		acquired = time.perf_counter()
+		# 常驻进程在同一解释器里跑多个脚本，无法按次设置 rlimit，受限 skill 总是冷启动；
+		# 其 JSON 行协议也只能传文本，载荷调用同样走子进程
+		pool = get_worker_pool() if limits is None and not uses_payload else None
+		if pool is not None:
+			result = await _run_in_worker(
+				pool,
+				skill_dir,
+				script_path,
+				list(argv or []),
+				stdin,
+				timeout,
+				channel.env(),
+				max_output_bytes=max_output_bytes,
+				on_output=on_output,
+			)
+			if result is not None:
+				result.wall_seconds = time.perf_counter() - acquired
+				warm_run = True
+
+		if result is None:
+			stdout_handle, stdout_path = scratch_area.new_file("stdout") if binary_stdout else (None, None)
+			try:
+				result = await run_process(
+					command,
+					env=env,
+					stdin=stdin,
+					timeout=timeout,
+					max_output_bytes=max_output_bytes,
+					on_output=on_output,
+					limits=limits,
+					stdin_path=stdin_path,
+					stdout_path=stdout_path,
+				)
+			except BaseException:
+				if stdout_handle is not None:
+					scratch_area.delete(stdout_handle)
+				channel.discard()
+				raise
+	metrics.record_run(
+		skill_name,
+		script_path.stem,
+		queue_seconds=acquired - resolved,
+		env_seconds=resolved - started,
+		wall_seconds=time.perf_counter() - started,
+		result=result,
+		warm=warm_run,
 	)
+	payload = _script_result(command, result, timeout)
+	if binary_stdout:
+		payload.update(stdout_payload(stdout_handle, stdout_path))
+	if limits is not None:
+		_report_limits(payload, limits, result, policy_timeout, skill_name, script_path.stem)
+	spec = config.result_spec(script_path.stem)
+	if spec is not None or channel.emitted:
+		# 大结果集逐行解析校验，放到线程里避免阻塞事件循环
+		succeeded = result.returncode == 0 and not result.timed_out
+		limit = max_output_bytes if max_output_bytes is not None else default_output_bytes()
+		payload.update(await asyncio.to_thread(channel.collect, spec, limit, succeeded))
+		if "result_errors" in payload:
+			metrics.increment("run_result_errors", skill=skill_name, script=script_path.stem)
+	# 只缓存完整且成功的结果；截断输出与大结果依赖会过期的 scratch 文件
+	spilled = result.truncated or "result_handle" in payload or "records_handle" in payload
+	if memo_key is not None and result.returncode == 0 and not result.timed_out and not spilled:
+		memo_cache.store(memo_key, payload, ttl=config.cache_ttl)
+	return payload
+
+
+def _report_limits(
+	payload: dict[str, Any],
+	limits: ResourceLimits,
+	result: ProcessResult,
+	policy_timeout: bool,
+	skill_name: str,
+	script_name: str,
+) -> None:
+	hit = limits.exceeded(result, policy_timeout)
+	if not hit:
+		return
+	configured = limits.as_dict()
+	payload["limit_exceeded"] = {
+		"limits": hit,
+		"configured": {name: configured[name] for name in hit},
+		"usage": usage_dict(result),
+	}
+	notes = [f"[mcp-multiskill] {name} limit ({configured[name]}) exceeded" for name in hit if name != "timeout"]
+	if notes:
+		payload["stderr"] = "\n".join([payload["stderr"], *notes]).lstrip("\n")
+	for name in hit:
+		metrics.increment("run_limit_exceeded", skill=skill_name, script=script_name, limit=name)
+
+
+def _validate_argv(skill_name: str, script_path: Path, argv: list[str] | None) -> dict[str, Any] | None:
+	# 与 argparse 相同的报错在进程内给出，省去一次 uv run 冷启动
+	from .validation import get_argv_validator, validation_enabled
+
+	if not validation_enabled():
+		return None
+	validator = get_argv_validator(script_path)
+	if validator is None:
+		return None
+	errors = validator.validate(list(argv or []))
+	if not errors:
+		return None
+	metrics.increment("run_argv_rejected", skill=skill_name, script=script_path.stem)
 	return {
+		"returncode": 2,
+		"stdout": "",
+		"stderr": f"usage: {validator.usage}\n{validator.prog}: error: {errors[0]}\n",
+		"argv_errors": errors,
+		"usage": validator.usage,
+	}
+
+
+async def run_skill_batch(
+	items: list[dict[str, Any]],
+	skills_root: Path | None = None,
+	max_parallel: int | None = None,
+	fail_fast: bool = False,
+	timeout: float | None = None,
+	max_output_bytes: int | None = None,
+	gate: Callable[[], AsyncContextManager[Any]] | None = None,
+) -> dict[str, Any]:
+	"""Run many script invocations concurrently; results keep the order of ``items``.
+
+	Each item is ``{skill_name, script_name, argv?, stdin?, timeout?}``. Item
+	status is ``ok`` (exit 0), ``failed`` (non-zero exit or timeout), ``error``
+	(invalid item, unknown skill/script), or with ``fail_fast`` ``cancelled``
+	/ ``skipped`` for items stopped or never started after the first problem.
+	``gate`` is entered around each item, e.g. the caller's fair-share slot.
+	"""
+	parallel = max(1, max_parallel or limiter.global_limit)
+	semaphore = asyncio.Semaphore(parallel)
+	results: list[dict[str, Any] | None] = [None] * len(items)
+	stop = asyncio.Event()
+
+	async def run_item(index: int, item: Any) -> None:
+		async with semaphore:
+			if stop.is_set():
+				results[index] = {"index": index, "status": "skipped"}
+				return
+			try:
+				skill_name, script_name, argv, stdin, item_timeout = _batch_item(item, timeout)
+				async with gate() if gate is not None else contextlib.nullcontext():
+					result = await run_skill_script(
+						skill_name,
+						script_name,
+						argv,
+						skills_root=skills_root,
+						stdin=stdin,
+						timeout=item_timeout,
+						max_output_bytes=max_output_bytes,
+					)
+			except asyncio.CancelledError:
+				results[index] = {"index": index, "status": "cancelled"}
+				raise
+			except Exception as exc:
+				# 任何异常都记在该条目上，不能让它变成 skipped
+				results[index] = {"index": index, "status": "error", "error": str(exc) or type(exc).__name__}
+			else:
+				ok = result["returncode"] == 0 and not result.get("timed_out")
+				results[index] = {"index": index, "status": "ok" if ok else "failed", **result}
+			if fail_fast and results[index]["status"] != "ok":
+				stop.set()
+
+	tasks = [asyncio.ensure_future(run_item(index, item)) for index, item in enumerate(items)]
+	try:
+		if fail_fast:
+			stopper = asyncio.ensure_future(stop.wait())
+			pending = set(tasks)
+			while pending and not stop.is_set():
+				_done, pending = await asyncio.wait(pending | {stopper}, return_when=asyncio.FIRST_COMPLETED)
+				pending.discard(stopper)
+			stopper.cancel()
+			# 第一个失败后取消仍在运行的调用（子进程随之被杀掉），排队中的记为 skipped
+			for task in pending:
+				task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
+	except BaseException:
+		for task in tasks:
+			task.cancel()
+		raise
+
+	summary: dict[str, int] = {"total": len(items)}
+	final = []
+	for index, result in enumerate(results):
+		result = result or {"index": index, "status": "skipped"}
+		summary[result["status"]] = summary.get(result["status"], 0) + 1
+		final.append(result)
+	return {"results": final, "summary": summary}
+
+
+async def run_skill_pipeline(
+	steps: list[dict[str, Any]],
+	skills_root: Path | None = None,
+	stdin: str | None = None,
+	stdin_handle: str | None = None,
+	timeout: float | None = None,
+	max_output_bytes: int | None = None,
+	on_output: OutputCallback | None = None,
+) -> dict[str, Any]:
+	"""Run ``steps`` as one pipeline, each script's stdout feeding the next one's stdin.
+
+	Steps are ``{skill_name, script_name, argv?}`` and run concurrently, joined
+	by OS pipes, so intermediate output never reaches the client. The result
+	holds the last step's ``stdout`` and, per step, ``returncode``, ``stderr``
+	and resource usage. As with ``set -o pipefail`` the pipeline's
+	``returncode`` is that of the last step that failed (``failed_step``).
+	"""
+	started = time.perf_counter()
+	if not isinstance(steps, list) or not steps:
+		raise ValueError("Pipeline requires a non-empty list of steps")
+	if stdin is not None and stdin_handle is not None:
+		raise ValueError("Pass only one of stdin and stdin_handle")
+	stdin_path = payload_path(stdin_handle) if stdin_handle is not None else None
+	if timeout is None:
+		timeout = default_timeout()
+
+	parsed = [_pipeline_step(index, item) for index, item in enumerate(steps)]
+	prepared = []
+	for index, (skill_name, script_name, argv) in enumerate(parsed):
+		skill_dir = lookup_skill(skill_name, skills_root).path
+		script_path = resolve_script(skill_dir, skill_name, script_name)
+		argv, _argv_payload = resolve_argv(argv)
+		config = load_skill_config(skill_dir)
+		if config.validate_argv:
+			rejected = _validate_argv(skill_name, script_path, argv)
+			if rejected is not None:
+				return _rejected_pipeline(parsed, index, rejected)
+		limits = config.limits
+		command, env = await script_command(skill_dir, script_path, argv, direct=limits is not None)
+		step_timeout, step_output, policy_timeout = timeout, max_output_bytes, False
+		if limits is not None:
+			policy_timeout = limits.timeout is not None and (timeout is None or limits.timeout <= timeout)
+			step_timeout = limits.cap_timeout(timeout)
+			step_output = limits.cap_output(max_output_bytes)
+		prepared.append((skill_name, script_path, PipelineStep(command, env, limits, step_timeout, step_output), policy_timeout))
+	resolved = time.perf_counter()
+
+	# 整条管道占一个全局并发名额：各步骤同时运行，但大多在等待上下游的管道；
+	# 每个涉及的 skill 各占一个 skill 配额
+	async with limiter.slots(skill for skill, _script, _step, _policy in prepared):
+		acquired = time.perf_counter()
+		results = await run_pipeline(
+			[step for _skill, _script, step, _policy in prepared],
+			stdin=stdin,
+			stdin_path=stdin_path,
+			on_output=on_output,
+		)
+
+	step_payloads = []
+	for index, ((skill_name, script_path, step, policy_timeout), result) in enumerate(zip(prepared, results)):
+		metrics.record_run(
+			skill_name,
+			script_path.stem,
+			queue_seconds=acquired - resolved,
+			env_seconds=resolved - started,
+			wall_seconds=result.wall_seconds if result.wall_seconds is not None else time.perf_counter() - acquired,
+			result=result,
+			warm=False,
+		)
+		payload = _script_result(step.command, result, step.timeout)
+		del payload["command"]
+		if index < len(prepared) - 1:
+			del payload["stdout"]
+		if step.limits is not None:
+			_report_limits(payload, step.limits, result, policy_timeout, skill_name, script_path.stem)
+		payload.update({"index": index, "skill_name": skill_name, "script_name": script_path.stem, "usage": usage_dict(result)})
+		step_payloads.append(payload)
+
+	last = step_payloads[-1]
+	failed = [payload["index"] for payload in step_payloads if payload["returncode"] != 0]
+	pipeline: dict[str, Any] = {
+		"returncode": step_payloads[failed[-1]]["returncode"] if failed else 0,
+		"stdout": last.pop("stdout"),
+	}
+	if failed:
+		pipeline["failed_step"] = failed[-1]
+	if "stdout" in last.get("truncated", {}):
+		pipeline["truncated"] = {"stdout": last["truncated"].pop("stdout")}
+		if not last["truncated"]:
+			del last["truncated"]
+	pipeline["steps"] = step_payloads
+	pipeline["wall_seconds"] = round(time.perf_counter() - started, 3)
+	return pipeline
+
+
+def _pipeline_step(index: int, item: Any) -> tuple[str, str, list[str]]:
+	if not isinstance(item, dict):
+		raise ValueError(f"Pipeline step {index} must be an object")
+	skill_name = item.get("skill_name")
+	script_name = item.get("script_name")
+	if not isinstance(skill_name, str) or not isinstance(script_name, str):
+		raise ValueError(f"Pipeline step {index} requires string skill_name and script_name")
+	argv = item.get("argv") or []
+	if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+		raise ValueError(f"Pipeline step {index} argv must be a list of strings")
+	return skill_name, script_name, argv
+
+
+def _rejected_pipeline(steps: list[tuple[str, str, list[str]]], failed_step: int, rejected: dict[str, Any]) -> dict[str, Any]:
+	# 参数校验失败时一个步骤都不启动
+	payloads = []
+	for index, (skill_name, script_name, _argv) in enumerate(steps):
+		payload = {"index": index, "skill_name": skill_name, "script_name": script_name}
+		if index == failed_step:
+			payload.update(rejected)
+			del payload["stdout"]
+		else:
+			payload["status"] = "not_started"
+		payloads.append(payload)
+	return {"returncode": rejected["returncode"], "stdout": "", "failed_step": failed_step, "steps": payloads}
+
+
+def _batch_item(item: Any, default_timeout: float | None) -> tuple[str, str, list[str], str | None, float | None]:
+	if not isinstance(item, dict):
+		raise ValueError("Batch item must be an object")
+	skill_name = item.get("skill_name")
+	script_name = item.get("script_name")
+	if not isinstance(skill_name, str) or not isinstance(script_name, str):
+		raise ValueError("Batch item requires string skill_name and script_name")
+	argv = item.get("argv") or []
+	if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+		raise ValueError("Batch item argv must be a list of strings")
+	stdin = item.get("stdin")
+	if stdin is not None and not isinstance(stdin, str):
+		raise ValueError("Batch item stdin must be a string")
+	item_timeout = item.get("timeout", default_timeout)
+	if item_timeout is not None and (not isinstance(item_timeout, (int, float)) or isinstance(item_timeout, bool)):
+		raise ValueError("Batch item timeout must be a number")
+	return skill_name, script_name, argv, stdin, item_timeout
+
+
+async def _run_in_worker(
+	pool: WorkerPool,
+	skill_dir: Path,
+	script_path: Path,
+	argv: list[str],
+	stdin: str | None,
+	timeout: float | None,
+	env: dict[str, str] | None = None,
+	max_output_bytes: int | None = None,
+	on_output: OutputCallback | None = None,
+) -> ProcessResult | None:
+	loop = asyncio.get_running_loop()
+	cancel = threading.Event()
+	captures = {name: OutputCapture(name, limit=max_output_bytes) for name in ("stdout", "stderr")}
+	forward = on_output
+
+	def feed(name: str, chunk: bytes) -> None:
+		nonlocal forward
+		# 与冷启动的 _pump 一样边收边截断，worker 的输出不会整份堆在内存里
+		captures[name].feed(chunk)
+		if forward is not None:
+			try:
+				asyncio.run_coroutine_threadsafe(forward(name, chunk), loop).result()
+			except Exception:
+				forward = None
+
+	try:
+		# 请求送达前 worker 已不可用（无法启动、已退出）时返回 None，回退到冷启动子进程
+		warm = await asyncio.to_thread(pool.execute, skill_dir, script_path, argv, stdin, timeout, cancel, env, feed)
+	except BaseException:
+		cancel.set()
+		for capture in captures.values():
+			capture.close()
+		raise
+	if warm is None:
+		for capture in captures.values():
+			capture.close()
+		return None
+	if "worker_error" in warm:
+		captures["stderr"].feed(f"\n[mcp-multiskill] {warm['worker_error']}\n".encode("utf-8"))
+	return ProcessResult(
+		returncode=warm["returncode"],
+		stdout=captures["stdout"].text(),
+		stderr=captures["stderr"].text(),
+		timed_out=warm.get("timed_out", False),
+		truncated={name: capture.info() for name, capture in captures.items() if capture.truncated},
+		output_bytes=sum(capture.total for capture in captures.values()),
+	)
+
+
+def _script_result(command: list[str], result: ProcessResult, timeout: float | None) -> dict[str, Any]:
+	payload: dict[str, Any] = {
 		"command": command,
 		"returncode": result.returncode,
 		"stdout": result.stdout,
 		"stderr": result.stderr,
 	}
+	if result.truncated:
+		payload["truncated"] = result.truncated
+	if result.timed_out:
+		payload["timed_out"] = True
+		payload["stderr"] = f"{result.stderr}\n[mcp-multiskill] killed after {timeout}s timeout".lstrip("\n")
+	return payload
+
+
+def read_skill_output_page(
+	handle: str,
+	offset: int = 0,
+	limit: int | None = None,
+	encoding: str = "utf-8",
+) -> dict[str, Any]:
+	if handle.startswith(f"{RECORDS_KIND}-") and encoding == "utf-8":
+		# NDJSON 结果按整条记录分页，直接返回解析后的记录
+		return read_records_page(handle, offset, limit or DEFAULT_PAGE_BYTES, scratch_area)
+	return scratch_area.read_page(handle, offset, limit or DEFAULT_PAGE_BYTES, encoding)
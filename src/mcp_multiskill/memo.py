@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .config import env_flag, env_float, env_int
+from .registry import file_digest
+from .schema_cache import KEY_FILES, get_default_cache_dir
+
+
+MEMO_ENV = "MCP_MULTISKILL_MEMO"
+MEMO_DISK_ENV = "MCP_MULTISKILL_MEMO_DISK"
+MEMO_TTL_ENV = "MCP_MULTISKILL_MEMO_TTL"
+MEMO_MAX_ENTRIES_ENV = "MCP_MULTISKILL_MEMO_MAX_ENTRIES"
+MEMO_MAX_BYTES_ENV = "MCP_MULTISKILL_MEMO_MAX_BYTES"
+
+DEFAULT_MEMO_TTL = 3600.0
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MEMO_VERSION = 1
+
+
+def memo_enabled() -> bool:
+	return env_flag(MEMO_ENV, True)
+
+
+def compute_result_key(script_path: Path, skill_dir: Path, argv: list[str] | None, stdin: str | None) -> str:
+	"""Hash of script, ``pyproject.toml``, ``uv.lock``, argv and stdin."""
+	digest = hashlib.sha256(f"result-v{MEMO_VERSION}\0".encode())
+	digest.update(file_digest(script_path))
+	for name in KEY_FILES:
+		digest.update(f"\0{name}\0".encode())
+		digest.update(file_digest(skill_dir / name))
+	digest.update(b"\0argv\0")
+	digest.update(json.dumps(list(argv or []), ensure_ascii=False).encode("utf-8"))
+	digest.update(b"\0stdin\0")
+	digest.update(b"<none>" if stdin is None else hashlib.sha256(stdin.encode("utf-8")).digest())
+	return digest.hexdigest()
+
+
+def _result_size(result: dict[str, Any]) -> int:
+	"""Bytes of the serialised entry, so nested ``result``/``records`` fields count too."""
+	return len(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class MemoCache:
+	"""LRU of successful script results, bounded by entry count, total size and TTL.
+
+	With ``MCP_MULTISKILL_MEMO_DISK=1`` entries are also written under
+	``<cache_dir>/results`` and survive restarts (still subject to TTL).
+	"""
+
+	def __init__(
+		self,
+		max_entries: int | None = None,
+		max_bytes: int | None = None,
+		cache_dir: Path | None = None,
+	) -> None:
+		self._max_entries = max_entries
+		self._max_bytes = max_bytes
+		self._cache_dir = cache_dir
+		self._entries: OrderedDict[str, tuple[float, int, dict[str, Any]]] = OrderedDict()
+		self._bytes = 0
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.expirations = 0
+
+	@property
+	def max_entries(self) -> int:
+		return self._max_entries or max(1, env_int(MEMO_MAX_ENTRIES_ENV, DEFAULT_MAX_ENTRIES))
+
+	@property
+	def max_bytes(self) -> int:
+		return self._max_bytes or max(1, env_int(MEMO_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+	@property
+	def disk_dir(self) -> Path | None:
+		if not env_flag(MEMO_DISK_ENV, False):
+			return None
+		return (self._cache_dir or get_default_cache_dir()) / "results"
+
+	def lookup(self, key: str, now: float | None = None) -> dict[str, Any] | None:
+		now = time.time() if now is None else now
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None:
+				if entry[0] > now:
+					self._entries.move_to_end(key)
+					self.hits += 1
+					return _copy_result(entry[2])
+				self._drop(key)
+				self.expirations += 1
+		result = self._disk_lookup(key, now)
+		with self._lock:
+			if result is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+			self._insert(key, result[0], result[1])
+		return _copy_result(result[1])
+
+	def store(self, key: str, result: dict[str, Any], ttl: float | None = None, now: float | None = None) -> None:
+		ttl = ttl if ttl is not None else env_float(MEMO_TTL_ENV, DEFAULT_MEMO_TTL)
+		if not ttl or ttl <= 0:
+			return
+		expires = (time.time() if now is None else now) + ttl
+		value = _copy_result(result)
+		with self._lock:
+			self._insert(key, expires, value)
+		self._disk_store(key, expires, value)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+			self._bytes = 0
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			return {
+				"entries": len(self._entries),
+				"bytes": self._bytes,
+				"hits": self.hits,
+				"misses": self.misses,
+				"evictions": self.evictions,
+				"expirations": self.expirations,
+				"disk": str(self.disk_dir) if self.disk_dir else None,
+			}
+
+	def _insert(self, key: str, expires: float, value: dict[str, Any]) -> None:
+		size = _result_size(value)
+		if size > self.max_bytes:
+			return
+		if key in self._entries:
+			self._drop(key)
+		self._entries[key] = (expires, size, value)
+		self._bytes += size
+		while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+			oldest = next(iter(self._entries))
+			self._drop(oldest)
+			self.evictions += 1
+
+	def _drop(self, key: str) -> None:
+		_expires, size, _value = self._entries.pop(key)
+		self._bytes -= size
+
+	def _disk_lookup(self, key: str, now: float) -> tuple[float, dict[str, Any]] | None:
+		directory = self.disk_dir
+		if directory is None:
+			return None
+		path = directory / f"{key}.json"
+		try:
+			payload = json.loads(path.read_text(encoding="utf-8"))
+			expires, value = float(payload["expires"]), payload["result"]
+		except FileNotFoundError:
+			return None
+		except (OSError, ValueError, KeyError, TypeError):
+			_unlink(path)
+			return None
+		if payload.get("version") != MEMO_VERSION or expires <= now or not isinstance(value, dict):
+			_unlink(path)
+			return None
+		return expires, value
+
+	def _disk_store(self, key: str, expires: float, value: dict[str, Any]) -> None:
+		directory = self.disk_dir
+		if directory is None:
+			return
+		payload = json.dumps({"version": MEMO_VERSION, "expires": expires, "result": value}, ensure_ascii=False)
+		try:
+			directory.mkdir(parents=True, exist_ok=True)
+			fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+			with os.fdopen(fd, "w", encoding="utf-8") as handle:
+				handle.write(payload)
+			os.replace(tmp_name, directory / f"{key}.json")
+		except OSError:
+			pass
+
+
+def _copy_result(result: dict[str, Any]) -> dict[str, Any]:
+	# 结果可能嵌套 result/records/truncated 等结构，深拷贝才能隔离缓存与调用方的修改
+	return copy.deepcopy(result)
+
+
+def _unlink(path: Path) -> None:
+	try:
+		path.unlink()
+	except OSError:
+		pass
+
+
+memo_cache = MemoCache()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .config import env_flag
+
+
+METRICS_ENV = "MCP_MULTISKILL_METRICS"
+METRICS_JSONL_ENV = "MCP_MULTISKILL_METRICS_JSONL"
+METRICS_PROM_ENV = "MCP_MULTISKILL_METRICS_PROM"
+PROM_WRITE_INTERVAL = 1.0
+
+# 毫秒与字节两类桶，按 1-2-5 递增
+MS_BUCKETS = tuple(base * scale for scale in (1, 10, 100, 1000, 10000) for base in (1, 2, 5)) + (100000,)
+BYTES_BUCKETS = tuple(1024 * 4**power for power in range(11))
+
+
+class Histogram:
+	def __init__(self, bounds: tuple[float, ...]) -> None:
+		self.bounds = bounds
+		self.counts = [0] * (len(bounds) + 1)
+		self.count = 0
+		self.total = 0.0
+		self.min: float | None = None
+		self.max: float | None = None
+
+	def observe(self, value: float) -> None:
+		self.counts[bisect.bisect_left(self.bounds, value)] += 1
+		self.count += 1
+		self.total += value
+		self.min = value if self.min is None else min(self.min, value)
+		self.max = value if self.max is None else max(self.max, value)
+
+	def quantile(self, q: float) -> float | None:
+		"""Upper bound of the bucket holding the ``q`` quantile (``max`` for the overflow bucket)."""
+		if not self.count:
+			return None
+		rank = q * self.count
+		seen = 0
+		for index, count in enumerate(self.counts):
+			seen += count
+			if seen >= rank and count:
+				return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+		return self.max
+
+	def as_dict(self) -> dict[str, Any]:
+		return {
+			"count": self.count,
+			"sum": round(self.total, 3),
+			"min": _round(self.min),
+			"max": _round(self.max),
+			"p50": _round(self.quantile(0.5)),
+			"p95": _round(self.quantile(0.95)),
+		}
+
+
+class Metrics:
+	"""Histograms and counters keyed by metric name and label set.
+
+	Recording is in-process and cheap; optional exports append one JSON line
+	per event (``MCP_MULTISKILL_METRICS_JSONL``) and/or rewrite a Prometheus
+	text file (``MCP_MULTISKILL_METRICS_PROM``) at most once per second.
+	"""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._histograms: dict[tuple[str, tuple], Histogram] = {}
+		self._counters: dict[tuple[str, tuple], int] = {}
+		self._prom_written = 0.0
+
+	@property
+	def enabled(self) -> bool:
+		return env_flag(METRICS_ENV, True)
+
+	def observe(self, name: str, value: float | None, bounds: tuple[float, ...] = MS_BUCKETS, **labels: str) -> None:
+		if value is None:
+			return
+		key = (name, tuple(sorted(labels.items())))
+		with self._lock:
+			histogram = self._histograms.get(key)
+			if histogram is None:
+				histogram = self._histograms[key] = Histogram(bounds)
+			histogram.observe(value)
+
+	def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+		key = (name, tuple(sorted(labels.items())))
+		with self._lock:
+			self._counters[key] = self._counters.get(key, 0) + amount
+
+	def event(self, kind: str, record: dict[str, Any]) -> None:
+		path = os.environ.get(METRICS_JSONL_ENV)
+		if path:
+			line = json.dumps({"ts": time.time(), "event": kind, **record}, ensure_ascii=False)
+			try:
+				with open(path, "a", encoding="utf-8") as handle:
+					handle.write(line + "\n")
+			except OSError:
+				pass
+		self._maybe_write_prometheus()
+
+	def record_run(
+		self,
+		skill: str,
+		script: str,
+		*,
+		queue_seconds: float,
+		env_seconds: float,
+		wall_seconds: float,
+		result: Any,
+		warm: bool,
+	) -> None:
+		if not self.enabled:
+			return
+		for labels in ({"skill": skill}, {"skill": skill, "script": script}):
+			self.increment("run_calls", **labels)
+			if result.returncode != 0:
+				self.increment("run_errors", **labels)
+			if result.timed_out:
+				self.increment("run_timeouts", **labels)
+			self.observe("run_wall_ms", wall_seconds * 1000, **labels)
+			self.observe("run_queue_ms", queue_seconds * 1000, **labels)
+			self.observe("run_env_ms", env_seconds * 1000, **labels)
+			self.observe("run_process_ms", _ms(result.wall_seconds), **labels)
+			self.observe("run_spawn_ms", _ms(result.spawn_seconds), **labels)
+			self.observe("run_cpu_ms", _ms(result.cpu_seconds), **labels)
+			self.observe("run_max_rss_bytes", result.max_rss_bytes, bounds=BYTES_BUCKETS, **labels)
+			self.observe("run_output_bytes", result.output_bytes, bounds=BYTES_BUCKETS, **labels)
+		self.increment("run_warm_worker" if warm else "run_cold_process", skill=skill)
+		self.event(
+			"run",
+			{
+				"skill": skill,
+				"script": script,
+				"returncode": result.returncode,
+				"timed_out": result.timed_out,
+				"warm": warm,
+				"wall_ms": round(wall_seconds * 1000, 3),
+				"queue_ms": round(queue_seconds * 1000, 3),
+				"env_ms": round(env_seconds * 1000, 3),
+				"process_ms": _ms(result.wall_seconds),
+				"spawn_ms": _ms(result.spawn_seconds),
+				"cpu_ms": _ms(result.cpu_seconds),
+				"max_rss_bytes": result.max_rss_bytes,
+				"output_bytes": result.output_bytes,
+			},
+		)
+
+	def record_timing(self, name: str, seconds: float, **labels: str) -> None:
+		if not self.enabled:
+			return
+		self.observe(name, seconds * 1000, **labels)
+		self.event(name, {"ms": round(seconds * 1000, 3), **labels})
+
+	def snapshot(self) -> dict[str, Any]:
+		with self._lock:
+			histograms = {key: histogram.as_dict() for key, histogram in self._histograms.items()}
+			counters = dict(self._counters)
+		result: dict[str, Any] = {"counters": {}, "histograms": {}}
+		for (name, labels), value in sorted(counters.items()):
+			result["counters"].setdefault(name, []).append({**dict(labels), "value": value})
+		for (name, labels), data in sorted(histograms.items()):
+			result["histograms"].setdefault(name, []).append({**dict(labels), **data})
+		return result
+
+	def prometheus_text(self) -> str:
+		lines: list[str] = []
+		with self._lock:
+			counters = sorted(self._counters.items())
+			histograms = sorted(self._histograms.items())
+		for name in sorted({name for (name, _labels), _value in counters}):
+			lines.append(f"# TYPE mcp_multiskill_{name} counter")
+			for (metric, labels), value in counters:
+				if metric == name:
+					lines.append(f"mcp_multiskill_{name}{_prom_labels(labels)} {value}")
+		for name in sorted({name for (name, _labels), _histogram in histograms}):
+			lines.append(f"# TYPE mcp_multiskill_{name} histogram")
+			for (metric, labels), histogram in histograms:
+				if metric != name:
+					continue
+				cumulative = 0
+				for bound, count in zip((*histogram.bounds, "+Inf"), histogram.counts):
+					cumulative += count
+					lines.append(f"mcp_multiskill_{name}_bucket{_prom_labels(labels, le=bound)} {cumulative}")
+				lines.append(f"mcp_multiskill_{name}_sum{_prom_labels(labels)} {histogram.total}")
+				lines.append(f"mcp_multiskill_{name}_count{_prom_labels(labels)} {histogram.count}")
+		return "\n".join(lines) + "\n"
+
+	def _maybe_write_prometheus(self) -> None:
+		path = os.environ.get(METRICS_PROM_ENV)
+		if not path:
+			return
+		now = time.monotonic()
+		if now - self._prom_written < PROM_WRITE_INTERVAL:
+			return
+		self._prom_written = now
+		target = Path(path)
+		try:
+			target.parent.mkdir(parents=True, exist_ok=True)
+			fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+			with os.fdopen(fd, "w", encoding="utf-8") as handle:
+				handle.write(self.prometheus_text())
+			os.replace(tmp, target)
+		except OSError:
+			pass
+
+	def reset(self) -> None:
+		with self._lock:
+			self._histograms.clear()
+			self._counters.clear()
+
+
+def _round(value: float | None) -> float | None:
+	return None if value is None else round(value, 3)
+
+
+def _ms(seconds: float | None) -> float | None:
+	return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _prom_labels(labels: tuple, **extra: Any) -> str:
+	pairs = [*labels, *extra.items()]
+	if not pairs:
+		return ""
+	return "{" + ",".join(f'{key}="{_prom_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _prom_escape(value: Any) -> str:
+	return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
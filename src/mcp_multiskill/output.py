@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import IO, Any
+
+from .config import env_flag, env_int
+from .scratch import ScratchArea, scratch_area
+
+
+MAX_OUTPUT_ENV = "MCP_MULTISKILL_MAX_OUTPUT_BYTES"
+SPILL_OUTPUT_ENV = "MCP_MULTISKILL_SPILL_OUTPUT"
+MAX_SPILL_ENV = "MCP_MULTISKILL_MAX_SPILL_BYTES"
+
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+DEFAULT_MAX_SPILL_BYTES = 1024 * 1024 * 1024
+
+
+def max_output_bytes() -> int:
+	return max(1024, env_int(MAX_OUTPUT_ENV, DEFAULT_MAX_OUTPUT_BYTES))
+
+
+class OutputCapture:
+	"""Bounded capture of one output stream.
+
+	Keeps at most ``limit`` bytes in memory: the first half verbatim and a
+	rolling tail for the rest. Once the limit is exceeded the complete stream
+	is spilled to a scratch file (if enabled) so it can be paged through later.
+	"""
+
+	def __init__(
+		self,
+		name: str,
+		limit: int | None = None,
+		spill: bool | None = None,
+		scratch: ScratchArea | None = None,
+	) -> None:
+		self.name = name
+		self.limit = limit if limit is not None else max_output_bytes()
+		self.head_limit = self.limit // 2
+		self.tail_limit = self.limit - self.head_limit
+		self.spill_enabled = env_flag(SPILL_OUTPUT_ENV, True) if spill is None else spill
+		self.spill_limit = env_int(MAX_SPILL_ENV, DEFAULT_MAX_SPILL_BYTES)
+		self.scratch = scratch or scratch_area
+		self.total = 0
+		self._head = bytearray()
+		self._tail = bytearray()
+		self._spill_file: IO[bytes] | None = None
+		self.spill_handle: str | None = None
+		self.spilled_bytes = 0
+
+	@property
+	def truncated(self) -> bool:
+		return self.total > self.limit
+
+	def feed(self, chunk: bytes) -> None:
+		if not chunk:
+			return
+		if not self.truncated and self.total + len(chunk) > self.limit:
+			self._start_spill()
+		self.total += len(chunk)
+		if self._spill_file is not None:
+			self._write_spill(chunk)
+
+		room = self.head_limit - len(self._head)
+		if room > 0:
+			self._head += chunk[:room]
+			chunk = chunk[room:]
+		if chunk:
+			self._tail += chunk
+			if len(self._tail) > self.tail_limit:
+				del self._tail[: len(self._tail) - self.tail_limit]
+
+	def _start_spill(self) -> None:
+		if not self.spill_enabled:
+			return
+		try:
+			self.spill_handle, path = self.scratch.new_file(self.name)
+			self._spill_file = path.open("wb")
+		except OSError:
+			self.spill_handle = None
+			self._spill_file = None
+			return
+		self._write_spill(bytes(self._head) + bytes(self._tail))
+
+	def _write_spill(self, data: bytes) -> None:
+		room = self.spill_limit - self.spilled_bytes
+		if room <= 0:
+			return
+		data = data[:room]
+		try:
+			self._spill_file.write(data)
+		except OSError:
+			self.close()
+			return
+		self.spilled_bytes += len(data)
+
+	def close(self) -> None:
+		if self._spill_file is not None:
+			try:
+				self._spill_file.close()
+			except OSError:
+				pass
+			self._spill_file = None
+
+	def text(self) -> str:
+		self.close()
+		if not self.truncated:
+			return (bytes(self._head) + bytes(self._tail)).decode("utf-8", errors="replace")
+		omitted = self.total - len(self._head) - len(self._tail)
+		marker = f"\n[... {omitted} bytes of {self.name} truncated"
+		if self.spill_handle:
+			marker += f"; full output via read_skill_output(handle=\"{self.spill_handle}\")"
+		marker += " ...]\n"
+		head = bytes(self._head).decode("utf-8", errors="replace")
+		tail = bytes(self._tail).decode("utf-8", errors="replace")
+		return head + marker + tail
+
+	def info(self) -> dict[str, Any] | None:
+		if not self.truncated:
+			return None
+		info: dict[str, Any] = {"total_bytes": self.total, "kept_bytes": len(self._head) + len(self._tail)}
+		if self.spill_handle:
+			info["handle"] = self.spill_handle
+			info["spilled_bytes"] = self.spilled_bytes
+		return info
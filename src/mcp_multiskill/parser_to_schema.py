@@ -1,3 +1,12 @@
+"""Hook imported by skill scripts; it runs in every ``run_skill`` child.
+
+Keep it free of module-level imports beyond the standard library that is
+already loaded at interpreter start: ``json`` and ``argparse_to_json`` are
+only imported when the server asks for the schema via ``PRINT_MCP_SCHEMA``
+or when a script emits a structured result.
+"""
+
+
 def get_parser_json(parser):
     import os
     if os.environ.get("PRINT_MCP_SCHEMA"):
@@ -6,4 +15,42 @@ def get_parser_json(parser):
         import json
         print(json.dumps(schema_json, indent=2, ensure_ascii=False))
         return True
-    return False
\ No newline at end of file
+    return False
+
+
+def emit_result(value):
+    """Return ``value`` to the client as the run's structured ``result``.
+
+    stdout stays free for logs. Outside the server (no ``MCP_RESULT_PATH``)
+    the value is printed as JSON instead.
+    """
+    import json
+    import os
+    path = os.environ.get("MCP_RESULT_PATH")
+    if not path:
+        print(json.dumps(value, ensure_ascii=False))
+        return
+    with open(path, "w", encoding="utf-8") as result_file:
+        json.dump(value, result_file, ensure_ascii=False)
+
+
+def emit_records(records):
+    """Append ``records`` (any iterable, e.g. a generator) to the run's NDJSON ``records``.
+
+    Records are written as they are produced, so large result sets never
+    need to be held in memory. Returns the number of records written.
+    """
+    import json
+    import os
+    import sys
+    path = os.environ.get("MCP_RECORDS_PATH")
+    records_file = open(path, "a", encoding="utf-8") if path else sys.stdout
+    count = 0
+    try:
+        for record in records:
+            records_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if path:
+            records_file.close()
+    return count
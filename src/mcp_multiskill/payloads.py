@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from pathlib import Path
+from typing import Any
+
+from .config import env_int
+from .scratch import ScratchArea, scratch_area
+
+
+INLINE_PAYLOAD_ENV = "MCP_MULTISKILL_INLINE_PAYLOAD_BYTES"
+DEFAULT_INLINE_PAYLOAD_BYTES = 64 * 1024
+PAYLOAD_KIND = "payload"
+ARGV_PREFIX = "payload://"
+
+
+def inline_payload_bytes() -> int:
+	return max(0, env_int(INLINE_PAYLOAD_ENV, DEFAULT_INLINE_PAYLOAD_BYTES))
+
+
+def decode_base64(data: str) -> bytes:
+	try:
+		return base64.b64decode(data, validate=True)
+	except (binascii.Error, ValueError) as exc:
+		raise ValueError(f"Invalid base64 payload: {exc}") from exc
+
+
+def write_payload(
+	data: str,
+	handle: str | None = None,
+	encoding: str = "base64",
+	scratch: ScratchArea | None = None,
+) -> dict[str, Any]:
+	"""Create a payload file (or append to ``handle``) from one chunk of client data.
+
+	Large inputs are uploaded as a series of chunks against the same handle,
+	so the server never holds more than one chunk in memory.
+	"""
+	if encoding == "base64":
+		chunk = decode_base64(data)
+	elif encoding == "utf-8":
+		chunk = data.encode("utf-8")
+	else:
+		raise ValueError(f"Unsupported encoding: {encoding}")
+	scratch = scratch or scratch_area
+	if handle is None:
+		handle, path = scratch.new_file(PAYLOAD_KIND)
+		with path.open("wb") as payload_file:
+			payload_file.write(chunk)
+		total = len(chunk)
+	else:
+		total = scratch.append(handle, chunk)
+	return {"handle": handle, "total_bytes": total}
+
+
+def payload_path(handle: str, scratch: ScratchArea | None = None) -> Path:
+	return (scratch or scratch_area).path_for(handle)
+
+
+def resolve_argv(argv: list[str] | None, scratch: ScratchArea | None = None) -> tuple[list[str] | None, bool]:
+	"""Replace ``payload://<handle>`` arguments by the payload's file path.
+
+	Returns the new argv and whether any payload was referenced.
+	"""
+	if not argv or not any(arg.startswith(ARGV_PREFIX) for arg in argv):
+		return argv, False
+	resolved = [str(payload_path(arg[len(ARGV_PREFIX):], scratch)) if arg.startswith(ARGV_PREFIX) else arg for arg in argv]
+	return resolved, True
+
+
+def stdout_payload(handle: str, path: Path, scratch: ScratchArea | None = None) -> dict[str, Any]:
+	"""Result fields for a binary stdout file: inline base64 when small, otherwise the handle."""
+	size = path.stat().st_size
+	if size <= inline_payload_bytes():
+		data = path.read_bytes()
+		(scratch or scratch_area).delete(handle)
+		return {"stdout_base64": base64.b64encode(data).decode("ascii"), "stdout_bytes": size}
+	return {"stdout_handle": handle, "stdout_bytes": size}
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from .config import env_flag, env_int
+from .environments import sync_environments
+from .load_skill import get_script_schema, get_search_index, get_skill_registry, render_skill_for_client
+
+
+PREWARM_ENV = "MCP_MULTISKILL_PREWARM"
+SYNC_ON_START_ENV = "MCP_MULTISKILL_SYNC_ON_START"
+PREWARM_CONCURRENCY_ENV = "MCP_MULTISKILL_PREWARM_CONCURRENCY"
+
+DEFAULT_PREWARM_CONCURRENCY = 2
+
+
+@dataclass
+class PrewarmStatus:
+	state: str = "idle"
+	skills: int = 0
+	scripts: int = 0
+	done: int = 0
+	failed: dict[str, str] = field(default_factory=dict)
+	environments: list[dict[str, Any]] | None = None
+	error: str | None = None
+	started_at: float | None = None
+	finished_at: float | None = None
+
+	@property
+	def ready(self) -> bool:
+		return self.state == "ready"
+
+	@property
+	def elapsed(self) -> float | None:
+		if self.started_at is None:
+			return None
+		return (self.finished_at or time.monotonic()) - self.started_at
+
+	def as_dict(self) -> dict[str, Any]:
+		return {
+			"state": self.state,
+			"skills": self.skills,
+			"scripts": self.scripts,
+			"done": self.done,
+			"failed": dict(self.failed),
+			"environments": self.environments,
+			"error": self.error,
+			"elapsed_seconds": None if self.elapsed is None else round(self.elapsed, 3),
+		}
+
+
+prewarm_status = PrewarmStatus()
+
+
+def prewarm_enabled() -> bool:
+	return env_flag(PREWARM_ENV, True)
+
+
+def sync_on_start_enabled() -> bool:
+	return env_flag(SYNC_ON_START_ENV, False)
+
+
+def prewarm_concurrency() -> int:
+	return max(1, env_int(PREWARM_CONCURRENCY_ENV, DEFAULT_PREWARM_CONCURRENCY))
+
+
+async def sync_skill_environments(entries, status: PrewarmStatus) -> None:
+	projects = [entry.path for entry in entries if (entry.path / "pyproject.toml").is_file()]
+	results = await asyncio.to_thread(sync_environments, projects)
+	status.environments = [result.as_dict() for result in results]
+	for result in results:
+		if not result.ok:
+			status.failed[f"{result.skill}/uv sync"] = result.error or ""
+
+
+async def prewarm_skills(
+	skills_root: Path | None = None,
+	on_progress: Callable[[PrewarmStatus], None] | None = None,
+	status: PrewarmStatus | None = None,
+) -> PrewarmStatus:
+	"""Extract every script schema, render every skill and build the search index ahead of first use.
+
+	With ``MCP_MULTISKILL_SYNC_ON_START=1`` every skill environment is
+	``uv sync``-ed first, so extraction and the first calls find them ready.
+	Extraction subprocesses are bounded by their own small limit
+	(``MCP_MULTISKILL_PREWARM_CONCURRENCY``) rather than the shared process
+	limiter, so tool calls never queue behind startup work. Results land in
+	the same in-memory caches tool calls read from, so a call for a skill
+	still being warmed simply awaits the in-flight work.
+	"""
+	status = status or prewarm_status
+	entries = get_skill_registry(skills_root).entries()
+	status.state = "running"
+	status.skills = len(entries)
+	status.scripts = sum(len(entry.scripts) for entry in entries)
+	status.done = 0
+	status.failed = {}
+	status.environments = None
+	status.error = None
+	status.started_at = time.monotonic()
+	status.finished_at = None
+	bound = asyncio.Semaphore(prewarm_concurrency())
+
+	async def warm_script(entry, script: Path) -> bool:
+		try:
+			await get_script_schema(script, entry.path, gate=lambda: bound)
+		except Exception as exc:
+			status.failed[f"{entry.name}/{script.name}"] = str(exc)
+			return False
+		finally:
+			status.done += 1
+			if on_progress is not None:
+				on_progress(status)
+		return True
+
+	async def warm_skill(entry) -> None:
+		results = await asyncio.gather(*(warm_script(entry, script) for script in entry.scripts))
+		if not all(results):
+			# 有脚本提取失败时渲染也会失败，留给 get_skill 调用时重试并报错
+			return
+		try:
+			await render_skill_for_client(entry.name, skills_root, compact=True)
+		except Exception as exc:
+			status.failed.setdefault(entry.name, str(exc))
+
+	try:
+		if sync_on_start_enabled():
+			await sync_skill_environments(entries, status)
+		# 搜索索引只读文件、不启动子进程，放到线程里与 schema 提取并行
+		await asyncio.gather(
+			asyncio.to_thread(get_search_index(skills_root).refresh),
+			*(warm_skill(entry) for entry in entries),
+		)
+	except asyncio.CancelledError:
+		status.state = "cancelled"
+		raise
+	except Exception as exc:
+		status.state = "failed"
+		status.error = str(exc) or type(exc).__name__
+		raise
+	finally:
+		status.finished_at = time.monotonic()
+	status.state = "ready"
+	return status
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from .config import env_flag, env_float
+
+
+WATCH_ENV = "MCP_MULTISKILL_WATCH"
+POLL_INTERVAL_ENV = "MCP_MULTISKILL_REGISTRY_POLL_SECONDS"
+DEFAULT_POLL_INTERVAL = 2.0
+SKILL_MARKDOWN = "SKILL.md"
+
+_digests: dict[Path, tuple[Any, bytes]] = {}
+
+
+@dataclass
+class SkillEntry:
+	name: str
+	path: Path
+	markdown: str
+	description: str
+	scripts: list[Path]
+	markdown_hash: str
+	fingerprint: tuple
+	loaded_at: float = field(default_factory=time.time)
+
+	def summary(self) -> dict[str, str]:
+		return {"name": self.name, "description": self.description}
+
+
+def file_stamp(path: Path) -> tuple | None:
+	try:
+		stat = path.stat()
+	except OSError:
+		return None
+	return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_digest(path: Path) -> bytes:
+	"""sha256 of the file's content, re-read only when its mtime/size changed."""
+	stamp = file_stamp(path)
+	cached = _digests.get(path)
+	if cached is not None and cached[0] == stamp:
+		return cached[1]
+	try:
+		digest = hashlib.sha256(path.read_bytes()).digest() if stamp is not None else b"<missing>"
+	except OSError:
+		digest = b"<missing>"
+	_digests[path] = (stamp, digest)
+	return digest
+
+
+def markdown_hash(content: str) -> str:
+	return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def skill_fingerprint(skill_dir: Path, scripts: list[Path]) -> tuple:
+	# 目录 mtime 反映增删文件，各文件 mtime/大小反映内容修改
+	return (
+		file_stamp(skill_dir),
+		file_stamp(skill_dir / SKILL_MARKDOWN),
+		tuple((script.name, file_stamp(script)) for script in scripts),
+	)
+
+
+class SkillRegistry:
+	"""In-memory index of the skills under one root.
+
+	The root is scanned once; afterwards lookups are dict hits. Changes are
+	picked up incrementally, either from ``watchdog`` events (if installed) or
+	by re-stat'ing skill files at most every ``poll_interval`` seconds. Only
+	skills whose files changed are re-read.
+	"""
+
+	def __init__(
+		self,
+		root: Path,
+		loader: Callable[[Path], SkillEntry],
+		poll_interval: float | None = None,
+		watch: bool | None = None,
+	) -> None:
+		self.root = root
+		self._loader = loader
+		self._poll_interval = poll_interval
+		self._watch = watch
+		self._entries: dict[str, SkillEntry] = {}
+		self._root_mtime: tuple | None = None
+		self._last_check = 0.0
+		self._scanned = False
+		self._lock = threading.RLock()
+		self._observer: Any = None
+		self._watch_root = root
+		self._dirty: set[str] = set()
+		self._root_dirty = False
+		self._generation = 0
+		self.scans = 0
+		self.reloads = 0
+
+	@property
+	def poll_interval(self) -> float:
+		if self._poll_interval is not None:
+			return self._poll_interval
+		return env_float(POLL_INTERVAL_ENV, DEFAULT_POLL_INTERVAL)
+
+	@property
+	def watching(self) -> bool:
+		return self._observer is not None
+
+	def get(self, name: str) -> SkillEntry | None:
+		self._maybe_refresh()
+		entry = self._entries.get(name)
+		if entry is None and self._valid_name(name):
+			# 未索引的 skill 可能刚创建，单独加载一次，不等下个轮询周期
+			with self._lock:
+				entry = self._load(name)
+		return entry
+
+	def entries(self) -> list[SkillEntry]:
+		self._maybe_refresh()
+		return [self._entries[name] for name in sorted(self._entries)]
+
+	def generation(self) -> int:
+		"""Counter bumped whenever an entry is added, reloaded or removed."""
+		self._maybe_refresh()
+		return self._generation
+
+	def seed(self, entries: list[SkillEntry], root_mtime: tuple | None) -> None:
+		"""Start from previously saved entries instead of scanning the root.
+
+		The next poll, ``poll_interval`` seconds later, brings them up to date.
+		"""
+		with self._lock:
+			self._entries = {entry.name: entry for entry in entries}
+			self._root_mtime = root_mtime
+			self._generation += 1
+			self._scanned = True
+			self._last_check = time.monotonic()
+			self._start_watch()
+
+	def snapshot(self) -> tuple[list[SkillEntry], tuple | None]:
+		"""Current entries and root mtime, as accepted by :meth:`seed`."""
+		entries = self.entries()
+		return entries, self._root_mtime
+
+	def invalidate(self, name: str | None = None) -> None:
+		with self._lock:
+			if name is None:
+				self._root_dirty = True
+				self._dirty.update(self._entries)
+			else:
+				self._dirty.add(name)
+			self._last_check = 0.0
+
+	def close(self) -> None:
+		observer, self._observer = self._observer, None
+		if observer is not None:
+			observer.stop()
+			observer.join(timeout=1)
+
+	def stats(self) -> dict[str, Any]:
+		return {
+			"root": str(self.root),
+			"skills": len(self._entries),
+			"mode": "watch" if self.watching else "poll",
+			"scans": self.scans,
+			"reloads": self.reloads,
+		}
+
+	@staticmethod
+	def _valid_name(name: str) -> bool:
+		return bool(name) and name not in (".", "..") and "/" not in name and os.sep not in name
+
+	def _maybe_refresh(self) -> None:
+		if not self._scanned:
+			with self._lock:
+				if not self._scanned:
+					self._full_scan()
+					self._start_watch()
+			return
+		if self._dirty or self._root_dirty:
+			# watchdog 事件或显式 invalidate() 标记的 skill 立即重新加载
+			with self._lock:
+				self._apply_dirty()
+		if self.watching:
+			return
+		now = time.monotonic()
+		if now - self._last_check < self.poll_interval:
+			return
+		with self._lock:
+			self._last_check = now
+			self._poll()
+
+	def _full_scan(self) -> None:
+		self.scans += 1
+		self._root_mtime = file_stamp(self.root)
+		entries: dict[str, SkillEntry] = {}
+		for name in self._skill_names():
+			entry = self._loader(self.root / name)
+			entries[name] = entry
+		self._entries = entries
+		self._generation += 1
+		self._scanned = True
+		self._last_check = time.monotonic()
+
+	def _skill_names(self) -> list[str]:
+		try:
+			children = sorted(self.root.iterdir())
+		except OSError:
+			return []
+		return [child.name for child in children if (child / SKILL_MARKDOWN).is_file()]
+
+	def _load(self, name: str) -> SkillEntry | None:
+		skill_dir = self.root / name
+		if not (skill_dir / SKILL_MARKDOWN).is_file():
+			# 查找不存在的名字不算变化，否则多根目录下每次未命中都会让下游缓存失效
+			if self._entries.pop(name, None) is not None:
+				self._generation += 1
+			return None
+		entry = self._loader(skill_dir)
+		self._entries[name] = entry
+		self._generation += 1
+		self.reloads += 1
+		return entry
+
+	def _poll(self) -> None:
+		root_mtime = file_stamp(self.root)
+		if root_mtime != self._root_mtime:
+			self._root_mtime = root_mtime
+			names = set(self._skill_names())
+		else:
+			names = set(self._entries)
+		for name in set(self._entries) - names:
+			del self._entries[name]
+			self._generation += 1
+		for name in sorted(names):
+			entry = self._entries.get(name)
+			if entry is None or entry.fingerprint != skill_fingerprint(entry.path, entry.scripts):
+				self._load(name)
+
+	def _apply_dirty(self) -> None:
+		with self._lock:
+			dirty, self._dirty = self._dirty, set()
+			root_dirty, self._root_dirty = self._root_dirty, False
+			if root_dirty:
+				dirty.update(set(self._skill_names()) ^ set(self._entries))
+			for name in sorted(dirty):
+				self._load(name)
+
+	def _start_watch(self) -> None:
+		enabled = env_flag(WATCH_ENV, True) if self._watch is None else self._watch
+		if not enabled or not self.root.is_dir():
+			return
+		try:
+			from watchdog.events import FileSystemEventHandler
+			from watchdog.observers import Observer
+		except ImportError:
+			return
+
+		registry = self
+
+		class _Handler(FileSystemEventHandler):
+			def on_any_event(self, event: Any) -> None:
+				for raw in (event.src_path, getattr(event, "dest_path", "")):
+					if raw:
+						registry._mark(Path(os.fsdecode(raw)))
+
+		self._watch_root = self.root.resolve()
+		observer = Observer()
+		try:
+			observer.schedule(_Handler(), str(self._watch_root), recursive=True)
+			observer.daemon = True
+			observer.start()
+		except OSError:
+			return
+		self._observer = observer
+
+	def _mark(self, path: Path) -> None:
+		try:
+			relative = path.relative_to(self._watch_root)
+		except ValueError:
+			return
+		# watchdog 线程与事件循环上的 _apply_dirty 共用同一把锁，标记不会在交换集合时丢失
+		with self._lock:
+			if len(relative.parts) <= 1:
+				# 根目录下的增删改名
+				self._root_dirty = True
+				self._dirty.update(relative.parts)
+			elif len(relative.parts) == 2:
+				# 只关心 skill 目录顶层的 SKILL.md 与脚本，忽略 .venv 等子目录
+				self._dirty.add(relative.parts[0])
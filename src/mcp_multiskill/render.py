@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from .results import ResultSpec
+	from .static_schema import ArgumentSpec, ParserSpec
+
+
+_TYPE_NAMES = {"string": "str", "integer": "int", "number": "float", "boolean": "bool"}
+
+
+def script_section(
+	script: Path,
+	schema: Any,
+	result: ResultSpec | None = None,
+	spec: ParserSpec | None = None,
+) -> list[str]:
+	lines = [f"### {script.name}", f"- script_name: `{script.stem}`"]
+	if spec is not None:
+		# schema 的键是 argparse dest，实际的选项名以这一行为准
+		lines.append(f"- argv: `{parser_signature(script.stem, spec)}`")
+	if result is not None:
+		shape = "NDJSON records in `records`" if result.format == "ndjson" else "a JSON value in `result`"
+		lines.append(f"- returns {shape}")
+	if schema is not None:
+		lines.append("Argument schema:")
+		lines.append("```json")
+		lines.append(json.dumps(schema, ensure_ascii=False, indent=2))
+		lines.append("```")
+		lines.append("")
+	if result is not None and result.schema is not None:
+		lines.append("Record schema:" if result.format == "ndjson" else "Result schema:")
+		lines.append("```json")
+		lines.append(json.dumps(result.schema, ensure_ascii=False, indent=2))
+		lines.append("```")
+		lines.append("")
+	return lines
+
+
+def _argument_signature(dest: str, data: Any) -> str:
+	if not isinstance(data, dict):
+		return f"[--{dest}]"
+	kind = data.get("type")
+	if kind == "boolean":
+		text = f"--{dest}"
+	elif kind == "array":
+		items = data.get("items") if isinstance(data.get("items"), dict) else {}
+		if items.get("type") == "boolean":
+			text = f"--{dest}..."
+		else:
+			text = f"--{dest}:{_TYPE_NAMES.get(items.get('type'), 'str')}..."
+	elif data.get("enum"):
+		text = f"--{dest}:{{{','.join(str(value) for value in data['enum'])}}}"
+	else:
+		text = f"--{dest}:{_TYPE_NAMES.get(kind, 'str')}"
+	return text if data.get("required") else f"[{text}]"
+
+
+def _parser_argument_signature(argument: ArgumentSpec) -> str:
+	if argument.choices and not isinstance(argument.choices, str):
+		value = f"{{{','.join(str(choice) for choice in argument.choices)}}}"
+	else:
+		value = argument.type or "str"
+	repeated = argument.action in ("append", "append_const") or argument.nargs in ("+", "*")
+	if argument.is_positional:
+		label = argument.metavar if isinstance(argument.metavar, str) else argument.dest
+		text = f"<{label}>" if value == "str" else f"<{label}:{value}>"
+		text += "..." if repeated else ""
+		return text if argument.nargs not in ("?", "*") else f"[{text}]"
+	# argparse 接受任一选项名，用最长的那个（通常是 --long-name）
+	option = max(argument.option_strings, key=len)
+	text = f"{option}:{value}" if argument.takes_value else option
+	text += "..." if repeated else ""
+	return text if argument.required else f"[{text}]"
+
+
+def parser_signature(name: str, spec: ParserSpec) -> str:
+	"""One-line usage from a statically extracted parser, with real option names and types.
+
+	e.g. ``main <path> [--dry-run] [--max-count:int]``; positionals are ``<dest>``.
+	"""
+	return " ".join([name, *(_parser_argument_signature(argument) for argument in spec.arguments)])
+
+
+def schema_signature(
+	name: str,
+	schema: Any,
+	result: ResultSpec | None = None,
+	spec: ParserSpec | None = None,
+) -> str:
+	"""One-line usage for a script, e.g. ``main [--a:float] [--o:{+,-}] --name:str -> result``.
+
+	Built from the parser ``spec`` when the script's parser can be read
+	statically; otherwise from the JSON schema, whose keys are argparse dests
+	(``--dest``). Optional arguments are bracketed; schemas the converter did
+	not produce (raw hook output) collapse to ``name ...``. A declared
+	structured result adds ``-> result`` or ``-> records``.
+	"""
+	returns = f" -> {result.field}" if result is not None else ""
+	if spec is not None:
+		return parser_signature(name, spec) + returns
+	if schema is None:
+		return name + returns
+	arguments = schema.get("schema") if isinstance(schema, dict) else None
+	if not isinstance(arguments, dict):
+		return f"{name} ...{returns}"
+	return " ".join([name, *(_argument_signature(dest, data) for dest, data in arguments.items())]) + returns
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .environments import FINGERPRINT_FILES, project_fingerprint
+from .registry import SkillEntry, file_digest
+
+
+RENDER_VERSION = 1
+DEFAULT_MAX_ENTRIES = 2048
+
+
+class RenderCache:
+	"""Rendered ``get_skill`` documents and script sections, keyed by content hashes.
+
+	``skill_keys`` first compares the skill's stat fingerprint (registry
+	fingerprint plus ``pyproject.toml``/``uv.lock`` stats) with the last one
+	seen; only when it differs are file contents hashed, and then only the
+	files whose mtime/size changed. A touched but unchanged skill therefore
+	keeps its key and its rendered output, and after an edit to one script
+	only that script's section is rendered again.
+	"""
+
+	def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+		self.max_entries = max_entries
+		self._lock = threading.Lock()
+		self._keys: dict[Path, tuple[tuple, tuple[str, dict[str, str]]]] = {}
+		self._texts: OrderedDict[str, str] = OrderedDict()
+		self.stat_hits = 0
+		self.rehashes = 0
+		self.hits = 0
+		self.misses = 0
+
+	def skill_keys(self, entry: SkillEntry) -> tuple[str, dict[str, str]]:
+		"""Document key of ``entry`` and the section key of each of its scripts (by file name)."""
+		stamps = (entry.name, entry.fingerprint, entry.markdown_hash, project_fingerprint(entry.path))
+		cached = self._keys.get(entry.path)
+		if cached is not None and cached[0] == stamps:
+			self.stat_hits += 1
+			return cached[1]
+		self.rehashes += 1
+		project = hashlib.sha256()
+		for name in FINGERPRINT_FILES:
+			project.update(f"\0{name}\0".encode())
+			project.update(file_digest(entry.path / name))
+		sections = {script.name: _section_key(script, project.digest()) for script in entry.scripts}
+		document = hashlib.sha256(f"render-v{RENDER_VERSION}\0{entry.name}\0{entry.markdown_hash}".encode())
+		for name, key in sections.items():
+			document.update(f"\0{name}\0{key}".encode())
+		keys = (document.hexdigest(), sections)
+		self._keys[entry.path] = (stamps, keys)
+		return keys
+
+	def get(self, key: str) -> str | None:
+		with self._lock:
+			text = self._texts.get(key)
+			if text is None:
+				self.misses += 1
+				return None
+			self._texts.move_to_end(key)
+			self.hits += 1
+			return text
+
+	def store(self, key: str, text: str) -> None:
+		with self._lock:
+			self._texts[key] = text
+			self._texts.move_to_end(key)
+			while len(self._texts) > self.max_entries:
+				self._texts.popitem(last=False)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._keys.clear()
+			self._texts.clear()
+
+	def stats(self) -> dict[str, Any]:
+		return {
+			"entries": len(self._texts),
+			"hits": self.hits,
+			"misses": self.misses,
+			"stat_hits": self.stat_hits,
+			"rehashes": self.rehashes,
+		}
+
+
+def _section_key(script: Path, project_digest: bytes) -> str:
+	digest = hashlib.sha256(f"section-v{RENDER_VERSION}\0{script.name}\0".encode())
+	digest.update(file_digest(script))
+	digest.update(project_digest)
+	return digest.hexdigest()
+
+
+render_cache = RenderCache()
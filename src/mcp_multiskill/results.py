@@ -0,0 +1,315 @@
+"""Structured run results: a typed value or NDJSON records next to stdout/stderr.
+
+Every run gets two reserved scratch paths in ``MCP_RESULT_PATH`` and
+``MCP_RECORDS_PATH``; ``emit_result``/``emit_records`` from
+``parser_to_schema`` write to them. Nothing is created unless the script
+emits, so runs that do not use the protocol only pay two ``stat`` calls.
+Scripts may declare the expected format and a JSON schema in
+``[tool.mcp-multiskill.results.<script>]``; results are validated against it.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .scratch import ScratchArea, scratch_area
+
+
+RESULT_PATH_ENV = "MCP_RESULT_PATH"
+RECORDS_PATH_ENV = "MCP_RECORDS_PATH"
+RESULTS_TABLE = "results"
+RESULT_FORMATS = ("json", "ndjson")
+RESULT_KIND = "result"
+RECORDS_KIND = "records"
+MAX_RESULT_ERRORS = 20
+
+
+@dataclass(frozen=True)
+class ResultSpec:
+	"""Declared result of one script from ``[tool.mcp-multiskill.results.<script>]``.
+
+	``format`` is ``json`` (one value, ``emit_result``) or ``ndjson``
+	(records, ``emit_records``); ``schema`` is an inline JSON schema for the
+	value or for each record.
+	"""
+
+	format: str = "json"
+	schema: dict[str, Any] | None = None
+
+	@classmethod
+	def from_table(cls, table: Any) -> dict[str, ResultSpec]:
+		if not isinstance(table, dict):
+			return {}
+		specs = {}
+		for name, entry in table.items():
+			if not isinstance(entry, dict):
+				continue
+			kind = entry.get("format", "json")
+			schema = entry.get("schema")
+			specs[str(name).removesuffix(".py")] = cls(
+				format=kind if kind in RESULT_FORMATS else "json",
+				schema=schema if isinstance(schema, dict) else None,
+			)
+		return specs
+
+	@property
+	def field(self) -> str:
+		return "records" if self.format == "ndjson" else "result"
+
+
+_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+	"object": lambda value: isinstance(value, dict),
+	"array": lambda value: isinstance(value, list),
+	"string": lambda value: isinstance(value, str),
+	"integer": lambda value: (isinstance(value, int) and not isinstance(value, bool)) or (isinstance(value, float) and value.is_integer()),
+	"number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+	"boolean": lambda value: isinstance(value, bool),
+	"null": lambda value: value is None,
+}
+
+
+def _is_type(value: Any, kind: str) -> bool:
+	check = _TYPE_CHECKS.get(kind)
+	return check(value) if check is not None else True
+
+
+def validate(value: Any, schema: Any, path: str = "$", errors: list[str] | None = None) -> list[str]:
+	"""Check ``value`` against the common JSON schema keywords; returns error messages.
+
+	Supports ``type``, ``enum``, ``const``, ``properties``, ``required``,
+	``additionalProperties``, ``items``, ``minItems``/``maxItems``,
+	``minLength``/``maxLength`` and ``minimum``/``maximum``; other keywords
+	are ignored.
+	"""
+	errors = [] if errors is None else errors
+	if not isinstance(schema, dict) or len(errors) >= MAX_RESULT_ERRORS:
+		return errors
+	kinds = schema.get("type")
+	if kinds is not None:
+		kinds = [kinds] if isinstance(kinds, str) else list(kinds)
+		if not any(_is_type(value, kind) for kind in kinds):
+			errors.append(f"{path}: expected {' or '.join(kinds)}, got {_type_name(value)}")
+			return errors
+	if "enum" in schema and value not in schema["enum"]:
+		errors.append(f"{path}: {value!r} is not one of {schema['enum']!r}")
+	if "const" in schema and value != schema["const"]:
+		errors.append(f"{path}: expected {schema['const']!r}")
+	if isinstance(value, dict):
+		properties = schema.get("properties") if isinstance(schema.get("properties"), dict) else {}
+		for name in schema.get("required", ()):
+			if name not in value:
+				errors.append(f"{path}: missing required property {name!r}")
+		extra = schema.get("additionalProperties", True)
+		for name, item in value.items():
+			if name in properties:
+				validate(item, properties[name], f"{path}.{name}", errors)
+			elif extra is False:
+				errors.append(f"{path}: unexpected property {name!r}")
+			elif isinstance(extra, dict):
+				validate(item, extra, f"{path}.{name}", errors)
+	elif isinstance(value, list):
+		if "minItems" in schema and len(value) < schema["minItems"]:
+			errors.append(f"{path}: expected at least {schema['minItems']} items")
+		if "maxItems" in schema and len(value) > schema["maxItems"]:
+			errors.append(f"{path}: expected at most {schema['maxItems']} items")
+		if isinstance(schema.get("items"), dict):
+			for index, item in enumerate(value):
+				validate(item, schema["items"], f"{path}[{index}]", errors)
+	elif isinstance(value, str):
+		if "minLength" in schema and len(value) < schema["minLength"]:
+			errors.append(f"{path}: shorter than {schema['minLength']} characters")
+		if "maxLength" in schema and len(value) > schema["maxLength"]:
+			errors.append(f"{path}: longer than {schema['maxLength']} characters")
+	elif isinstance(value, (int, float)) and not isinstance(value, bool):
+		if "minimum" in schema and value < schema["minimum"]:
+			errors.append(f"{path}: {value} is less than {schema['minimum']}")
+		if "maximum" in schema and value > schema["maximum"]:
+			errors.append(f"{path}: {value} is greater than {schema['maximum']}")
+	return errors[:MAX_RESULT_ERRORS]
+
+
+def compile_check(schema: Any) -> Callable[[Any], bool]:
+	"""Predicate equivalent to ``not validate(value, schema)``, built once per schema.
+
+	Checking a large record set calls it per record; only records that fail
+	go through ``validate`` to produce the messages.
+	"""
+	if not isinstance(schema, dict):
+		return lambda value: True
+	checks: list[Callable[[Any], bool]] = []
+	if schema.get("type") is not None:
+		kinds = [schema["type"]] if isinstance(schema["type"], str) else list(schema["type"])
+		if len(kinds) == 1:
+			checks.append(_TYPE_CHECKS.get(kinds[0], lambda value: True))
+		else:
+			checks.append(lambda value: any(_is_type(value, kind) for kind in kinds))
+	if "enum" in schema:
+		checks.append(lambda value, enum=schema["enum"]: value in enum)
+	if "const" in schema:
+		checks.append(lambda value, const=schema["const"]: value == const)
+	properties = schema.get("properties") if isinstance(schema.get("properties"), dict) else {}
+	nested = {name: compile_check(sub) for name, sub in properties.items()}
+	required = tuple(schema.get("required", ()))
+	extra = schema.get("additionalProperties", True)
+	extra_check = compile_check(extra) if isinstance(extra, dict) else None
+	if nested or required or extra is not True:
+		def check_object(value: Any) -> bool:
+			if not isinstance(value, dict):
+				return True
+			for name in required:
+				if name not in value:
+					return False
+			for name, item in value.items():
+				check = nested.get(name)
+				if check is not None:
+					if not check(item):
+						return False
+				elif extra is False or (extra_check is not None and not extra_check(item)):
+					return False
+			return True
+		checks.append(check_object)
+	items = compile_check(schema["items"]) if isinstance(schema.get("items"), dict) else None
+	low, high = schema.get("minItems"), schema.get("maxItems")
+	if items is not None or low is not None or high is not None:
+		def check_array(value: Any) -> bool:
+			if not isinstance(value, list):
+				return True
+			if (low is not None and len(value) < low) or (high is not None and len(value) > high):
+				return False
+			return items is None or all(items(item) for item in value)
+		checks.append(check_array)
+	bounds = {key: schema[key] for key in ("minLength", "maxLength", "minimum", "maximum") if key in schema}
+	if bounds:
+		# 长度与数值范围较少用到，直接交给 validate
+		checks.append(lambda value: not validate(value, bounds))
+	if not checks:
+		return lambda value: True
+	if len(checks) == 1:
+		return checks[0]
+
+	def check_all(value: Any) -> bool:
+		for check in checks:
+			if not check(value):
+				return False
+		return True
+	return check_all
+
+
+def _type_name(value: Any) -> str:
+	if value is None:
+		return "null"
+	if isinstance(value, bool):
+		return "boolean"
+	names = {dict: "object", list: "array", str: "string", int: "integer", float: "number"}
+	return names.get(type(value), type(value).__name__)
+
+
+class ResultChannel:
+	"""The two scratch files one run may write its structured result to."""
+
+	def __init__(self, scratch: ScratchArea | None = None) -> None:
+		self.scratch = scratch or scratch_area
+		self.result_handle, self.result_path = self.scratch.reserve(RESULT_KIND)
+		self.records_handle, self.records_path = self.scratch.reserve(RECORDS_KIND)
+
+	def env(self) -> dict[str, str]:
+		return {RESULT_PATH_ENV: str(self.result_path), RECORDS_PATH_ENV: str(self.records_path)}
+
+	@property
+	def emitted(self) -> bool:
+		return self.result_path.exists() or self.records_path.exists()
+
+	def discard(self) -> None:
+		for path in (self.result_path, self.records_path):
+			path.unlink(missing_ok=True)
+
+	def collect(self, spec: ResultSpec | None, limit: int, succeeded: bool) -> dict[str, Any]:
+		"""Result fields for the run payload; small results inline, large ones as handles.
+
+		Reads the files line by line, so a large NDJSON stream is validated
+		without holding it in memory. Call it off the event loop.
+		"""
+		payload: dict[str, Any] = {}
+		errors: list[str] = []
+		schema = spec.schema if spec is not None else None
+		emitted = {"json": self.result_path.exists(), "ndjson": self.records_path.exists()}
+		if emitted["json"]:
+			self._collect_result(payload, errors, schema if spec is None or spec.format == "json" else None, limit)
+		if emitted["ndjson"]:
+			self._collect_records(payload, errors, schema if spec is None or spec.format == "ndjson" else None, limit)
+		if spec is not None and succeeded and not emitted[spec.format]:
+			helper = "emit_records" if spec.format == "ndjson" else "emit_result"
+			errors.append(f"script declares a {spec.format} result but did not call {helper}")
+		if errors:
+			payload["result_errors"] = errors[:MAX_RESULT_ERRORS]
+		return payload
+
+	def _collect_result(self, payload: dict[str, Any], errors: list[str], schema: Any, limit: int) -> None:
+		size = self.result_path.stat().st_size
+		if size > limit:
+			# 过大的值不在服务端解析，客户端用 read_skill_output 分页取回
+			payload.update({"result_handle": self.result_handle, "result_bytes": size})
+			return
+		try:
+			value = json.loads(self.result_path.read_bytes())
+		except ValueError as exc:
+			errors.append(f"result: invalid JSON: {exc}")
+		else:
+			payload["result"] = value
+			if schema is not None:
+				validate(value, schema, "$", errors)
+		self.result_path.unlink(missing_ok=True)
+
+	def _collect_records(self, payload: dict[str, Any], errors: list[str], schema: Any, limit: int) -> None:
+		size = self.records_path.stat().st_size
+		inline = size <= limit
+		check = compile_check(schema) if schema is not None else None
+		decode = json.JSONDecoder().decode
+		records: list[Any] = []
+		count = 0
+		with self.records_path.open("r", encoding="utf-8", errors="replace") as records_file:
+			for number, line in enumerate(records_file, 1):
+				if not line.strip():
+					continue
+				try:
+					record = decode(line)
+				except ValueError as exc:
+					if len(errors) < MAX_RESULT_ERRORS:
+						errors.append(f"records line {number}: invalid JSON: {exc}")
+					continue
+				if check is not None and not check(record) and len(errors) < MAX_RESULT_ERRORS:
+					validate(record, schema, f"records[{count}]", errors)
+				count += 1
+				if inline:
+					records.append(record)
+		payload["record_count"] = count
+		if inline:
+			payload["records"] = records
+			self.records_path.unlink(missing_ok=True)
+		else:
+			payload.update({"records_handle": self.records_handle, "records_bytes": size})
+
+
+def read_records_page(handle: str, offset: int = 0, limit: int = 65536, scratch: ScratchArea | None = None) -> dict[str, Any]:
+	"""One page of an NDJSON records file as parsed records; pages always end on a record boundary."""
+	path = (scratch or scratch_area).path_for(handle)
+	offset = max(0, offset)
+	total = path.stat().st_size
+	with path.open("rb") as records_file:
+		records_file.seek(offset)
+		data = records_file.read(max(1, limit))
+		if data and not data.endswith(b"\n"):
+			# 单条记录超过 limit 时整条返回
+			data += records_file.readline()
+	next_offset = offset + len(data)
+	records = [json.loads(line) for line in data.splitlines() if line.strip()]
+	return {
+		"handle": handle,
+		"offset": offset,
+		"next_offset": next_offset,
+		"total_bytes": total,
+		"eof": next_offset >= total,
+		"records": records,
+	}
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from .config import env_flag
+
+
+CACHE_DIR_ENV = "MCP_MULTISKILL_CACHE_DIR"
+SCHEMA_CACHE_ENV = "MCP_MULTISKILL_SCHEMA_CACHE"
+SCHEMA_CACHE_VERSION = 1
+KEY_FILES = ("pyproject.toml", "uv.lock")
+
+
+def get_default_cache_dir() -> Path:
+	configured = os.environ.get(CACHE_DIR_ENV)
+	if configured:
+		return Path(configured)
+	xdg_cache = os.environ.get("XDG_CACHE_HOME")
+	base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+	return base / "mcp-multiskill"
+
+
+def schema_cache_enabled() -> bool:
+	return env_flag(SCHEMA_CACHE_ENV, True)
+
+
+def compute_schema_key(script_path: Path, skill_dir: Path) -> str | None:
+	"""Hash of the script, pyproject.toml and uv.lock; None if the script is unreadable."""
+	digest = hashlib.sha256(f"schema-v{SCHEMA_CACHE_VERSION}\0".encode())
+	try:
+		digest.update(script_path.read_bytes())
+	except OSError:
+		return None
+	for name in KEY_FILES:
+		digest.update(f"\0{name}\0".encode())
+		try:
+			digest.update((skill_dir / name).read_bytes())
+		except OSError:
+			digest.update(b"<missing>")
+	return digest.hexdigest()
+
+
+class SchemaCache:
+	"""Persistent schema store, one JSON file per key under ``<cache_dir>/schemas``.
+
+	Any read or write failure degrades to a cache miss; callers always fall back
+	to extracting the schema again.
+	"""
+
+	def __init__(self, cache_dir: Path | None = None) -> None:
+		self._cache_dir = cache_dir
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		self.corrupt = 0
+		self.write_errors = 0
+
+	@property
+	def cache_dir(self) -> Path:
+		return (self._cache_dir or get_default_cache_dir()) / "schemas"
+
+	def _entry_path(self, key: str) -> Path:
+		return self.cache_dir / f"{key}.json"
+
+	def _count(self, counter: str) -> None:
+		with self._lock:
+			setattr(self, counter, getattr(self, counter) + 1)
+
+	def lookup(self, key: str) -> tuple[bool, Any]:
+		path = self._entry_path(key)
+		try:
+			payload = json.loads(path.read_text(encoding="utf-8"))
+		except FileNotFoundError:
+			self._count("misses")
+			return False, None
+		except (OSError, ValueError):
+			self._count("corrupt")
+			self._count("misses")
+			self._discard(path)
+			return False, None
+
+		if not isinstance(payload, dict) or payload.get("version") != SCHEMA_CACHE_VERSION or "schema" not in payload:
+			self._count("corrupt")
+			self._count("misses")
+			self._discard(path)
+			return False, None
+
+		self._count("hits")
+		return True, payload["schema"]
+
+	def store(self, key: str, schema: Any) -> bool:
+		payload = json.dumps({"version": SCHEMA_CACHE_VERSION, "schema": schema}, ensure_ascii=False)
+		target = self._entry_path(key)
+		try:
+			target.parent.mkdir(parents=True, exist_ok=True)
+			fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp-", suffix=".json")
+			try:
+				with os.fdopen(fd, "w", encoding="utf-8") as handle:
+					handle.write(payload)
+				os.replace(tmp_name, target)
+			except BaseException:
+				self._discard(Path(tmp_name))
+				raise
+		except OSError:
+			self._count("write_errors")
+			return False
+		return True
+
+	def clear(self) -> None:
+		try:
+			entries = list(self.cache_dir.glob("*.json"))
+		except OSError:
+			return
+		for path in entries:
+			self._discard(path)
+
+	def reset_stats(self) -> None:
+		with self._lock:
+			self.hits = self.misses = self.corrupt = self.write_errors = 0
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			return {
+				"cache_dir": str(self.cache_dir),
+				"hits": self.hits,
+				"misses": self.misses,
+				"corrupt": self.corrupt,
+				"write_errors": self.write_errors,
+			}
+
+	@staticmethod
+	def _discard(path: Path) -> None:
+		try:
+			path.unlink()
+		except OSError:
+			pass
+
+
+schema_cache = SchemaCache()
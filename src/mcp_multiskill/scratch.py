@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import base64
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from .config import env_float
+
+
+SCRATCH_DIR_ENV = "MCP_MULTISKILL_SCRATCH_DIR"
+SCRATCH_TTL_ENV = "MCP_MULTISKILL_SCRATCH_TTL"
+DEFAULT_SCRATCH_TTL = 3600.0
+DEFAULT_PAGE_BYTES = 64 * 1024
+
+_HANDLE_PATTERN = re.compile(r"^[a-z]+-[0-9a-f]{32}$")
+
+
+def _default_scratch_dir() -> Path:
+	configured = os.environ.get(SCRATCH_DIR_ENV)
+	if configured:
+		return Path(configured)
+	user = getattr(os, "getuid", lambda: "user")()
+	return Path(tempfile.gettempdir()) / f"mcp-multiskill-{user}"
+
+
+def _utf8_boundary(data: bytes) -> int:
+	"""Length of the longest prefix of ``data`` that does not end inside a UTF-8 sequence."""
+	end = len(data)
+	back = 0
+	while back < min(3, end) and (data[end - 1 - back] & 0xC0) == 0x80:
+		back += 1
+	if back < end:
+		lead = data[end - 1 - back]
+		width = 2 if lead >> 5 == 0b110 else 3 if lead >> 4 == 0b1110 else 4 if lead >> 3 == 0b11110 else 1
+		if width > back + 1:
+			return end - 1 - back
+	return end
+
+
+class ScratchArea:
+	"""Server-managed directory of files addressed by opaque handles."""
+
+	def __init__(self, root: Path | None = None, ttl: float | None = None) -> None:
+		self._root = root
+		self._ttl = ttl
+		self._lock = threading.Lock()
+		self._last_sweep = 0.0
+
+	@property
+	def root(self) -> Path:
+		return self._root or _default_scratch_dir()
+
+	@property
+	def ttl(self) -> float:
+		return self._ttl if self._ttl is not None else env_float(SCRATCH_TTL_ENV, DEFAULT_SCRATCH_TTL)
+
+	def new_file(self, kind: str) -> tuple[str, Path]:
+		handle, path = self.reserve(kind)
+		path.touch(mode=0o600)
+		return handle, path
+
+	def reserve(self, kind: str) -> tuple[str, Path]:
+		"""A fresh handle and its path, without creating the file."""
+		self.sweep()
+		root = self.root
+		root.mkdir(parents=True, exist_ok=True, mode=0o700)
+		handle = f"{kind}-{uuid.uuid4().hex}"
+		return handle, root / handle
+
+	def path_for(self, handle: str) -> Path:
+		if not _HANDLE_PATTERN.match(handle or ""):
+			raise ValueError(f"Invalid handle: {handle}")
+		path = self.root / handle
+		if not path.exists():
+			raise ValueError(f"Unknown or expired handle: {handle}")
+		return path
+
+	def append(self, handle: str, data: bytes) -> int:
+		"""Append ``data`` to an existing file; returns its new size."""
+		path = self.path_for(handle)
+		with path.open("ab") as handle_file:
+			handle_file.write(data)
+			return handle_file.tell()
+
+	def read_page(
+		self,
+		handle: str,
+		offset: int = 0,
+		limit: int = DEFAULT_PAGE_BYTES,
+		encoding: str = "utf-8",
+	) -> dict[str, Any]:
+		if encoding not in ("utf-8", "base64"):
+			raise ValueError(f"Unsupported encoding: {encoding}")
+		path = self.path_for(handle)
+		offset = max(0, offset)
+		limit = max(1, limit)
+		total = path.stat().st_size
+		with path.open("rb") as handle_file:
+			handle_file.seek(offset)
+			data = handle_file.read(limit)
+		eof = offset + len(data) >= total
+		if not eof and encoding == "utf-8":
+			# 分页不切断多字节字符
+			data = data[: _utf8_boundary(data)] or data
+		next_offset = offset + len(data)
+		return {
+			"handle": handle,
+			"offset": offset,
+			"next_offset": next_offset,
+			"total_bytes": total,
+			"eof": next_offset >= total,
+			"encoding": encoding,
+			"data": data.decode("utf-8", errors="replace") if encoding == "utf-8" else base64.b64encode(data).decode("ascii"),
+		}
+
+	def delete(self, handle: str) -> bool:
+		try:
+			self.path_for(handle).unlink()
+		except (ValueError, OSError):
+			return False
+		return True
+
+	def sweep(self, now: float | None = None) -> int:
+		now = time.time() if now is None else now
+		ttl = self.ttl
+		with self._lock:
+			if ttl <= 0 or now - self._last_sweep < min(ttl, 60.0):
+				return 0
+			self._last_sweep = now
+		removed = 0
+		try:
+			entries = list(self.root.iterdir())
+		except OSError:
+			return 0
+		for path in entries:
+			if not _HANDLE_PATTERN.match(path.name):
+				continue
+			try:
+				if now - path.stat().st_mtime > ttl:
+					path.unlink()
+					removed += 1
+			except OSError:
+				pass
+		return removed
+
+
+scratch_area = ScratchArea()
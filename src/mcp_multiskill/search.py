@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from .registry import SkillEntry, SkillRegistry
+
+
+# BM25 参数与各字段权重（名称、描述、脚本名比正文更能说明 skill 的用途）
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {"name": 3, "description": 2, "scripts": 2, "help": 1, "body": 1}
+
+_WORD = re.compile(r"[0-9a-z]+")
+_COMPOUND = re.compile(r"[0-9a-z]+(?:[_-][0-9a-z]+)+")
+_CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+_HELP_TEXT = re.compile(r"""\b(?:help|description)\s*=\s*[rRuU]?(?:"((?:[^"\\\n]|\\.)*)"|'((?:[^'\\\n]|\\.)*)')""")
+# 出现在超过这一比例（且多于 CHAMPIONS 个）skill 中的词只给已命中的候选加分，不再遍历整条倒排表；
+# 查询全是这类词时只在各词分量最高的 CHAMPIONS 个 skill 中排序
+COMMON_TERM_FRACTION = 0.25
+CHAMPIONS = 256
+
+
+def tokenize(text: str) -> list[str]:
+	"""Lowercase latin words, ``snake_case``/``kebab-case`` compounds and their parts, and CJK character bigrams."""
+	text = text.lower()
+	tokens = _WORD.findall(text)
+	# 先按空白切分再找复合词，比在全文上跑复合词正则快得多
+	tokens.extend(match for chunk in text.split() if "_" in chunk or "-" in chunk for match in _COMPOUND.findall(chunk))
+	if text.isascii():
+		return tokens
+	for run in _CJK_RUN.findall(text):
+		if len(run) == 1:
+			tokens.append(run)
+		else:
+			tokens.extend(run[index:index + 2] for index in range(len(run) - 1))
+	return tokens
+
+
+def script_help_text(script: Path) -> str:
+	# 只取 help=/description= 字面量，不做 AST 解析，动态构建的 parser 也能覆盖
+	try:
+		source = script.read_text(encoding="utf-8")
+	except (OSError, UnicodeDecodeError):
+		return ""
+	return " ".join(double or single for double, single in _HELP_TEXT.findall(source))
+
+
+def skill_terms(entry: SkillEntry) -> Counter[str]:
+	fields = {
+		"name": entry.name,
+		"description": entry.description,
+		"scripts": " ".join(script.stem for script in entry.scripts),
+		"help": " ".join(script_help_text(script) for script in entry.scripts),
+		"body": entry.markdown,
+	}
+	terms: Counter[str] = Counter()
+	for field, text in fields.items():
+		weight = FIELD_WEIGHTS[field]
+		for token, count in Counter(tokenize(text)).items():
+			terms[token] += count * weight
+	return terms
+
+
+class SkillSearchIndex:
+	"""BM25 inverted index over the skills of one registry.
+
+	The index follows the registry: when its generation changes, only skills
+	whose fingerprint or ``SKILL.md`` hash changed are re-tokenized.
+	"""
+
+	def __init__(self, registry: SkillRegistry) -> None:
+		self.registry = registry
+		# 倒排表存每个词在各 skill 中的 BM25 词频分量 tf / (tf + k1 * 长度归一化)，查询时只需乘 idf
+		self._postings: dict[str, dict[str, float]] = {}
+		self._docs: dict[str, tuple[tuple, Counter[str], int]] = {}
+		self._descriptions: dict[str, str] = {}
+		self._total_length = 0
+		self._average = 0.0
+		self._champion_lists: dict[str, list[str]] = {}
+		self._generation: int | None = None
+		self._lock = threading.Lock()
+		self.updates = 0
+
+	def search(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
+		self.refresh()
+		tokens = set(tokenize(query))
+		# refresh() 可能在其他线程里改写倒排表，评分期间持有同一把锁
+		with self._lock:
+			return self._search(tokens, limit)
+
+	def _search(self, tokens: set[str], limit: int) -> list[dict[str, Any]]:
+		terms = [term for term in tokens if term in self._postings]
+		if not terms:
+			return []
+		count = len(self._docs)
+		weights = {
+			term: math.log(1 + (count - len(self._postings[term]) + 0.5) / (len(self._postings[term]) + 0.5)) * (K1 + 1)
+			for term in terms
+		}
+		common = {term for term in terms if len(self._postings[term]) > max(CHAMPIONS, count * COMMON_TERM_FRACTION)}
+		scores: dict[str, float] = {}
+		for term in terms:
+			if term not in common:
+				weight = weights[term]
+				for name, impact in self._postings[term].items():
+					scores[name] = scores.get(name, 0.0) + weight * impact
+		if common:
+			# 常见词：已有候选时只给候选加分；否则只在各词分量最高的一批 skill 中排序
+			if not scores:
+				scores = dict.fromkeys({name for term in common for name in self._champions(term)}, 0.0)
+			for term in common:
+				weight, postings = weights[term], self._postings[term]
+				for name in scores:
+					scores[name] += weight * postings.get(name, 0.0)
+		best = heapq.nlargest(max(0, limit), scores, key=scores.__getitem__)
+		return [{"name": name, "description": self._descriptions[name], "score": round(scores[name], 3)} for name in best]
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			return {"skills": len(self._docs), "terms": len(self._postings), "updates": self.updates}
+
+	def refresh(self) -> None:
+		"""Bring the index up to date with the registry (cheap when nothing changed)."""
+		generation = self.registry.generation()
+		if generation == self._generation:
+			return
+		with self._lock:
+			entries = {entry.name: entry for entry in self.registry.entries()}
+			for name in set(self._docs) - set(entries):
+				self._remove(name)
+			for name, entry in entries.items():
+				version = (entry.fingerprint, entry.markdown_hash)
+				indexed = self._docs.get(name)
+				if indexed is None or indexed[0] != version:
+					self._add(entry, version)
+			average = self._total_length / len(self._docs) if self._docs else 0.0
+			# 平均长度漂移超过 10% 才整体重算归一化项，单个 skill 变化只更新它自己的条目
+			if not self._average or abs(average - self._average) > 0.1 * self._average:
+				self._average = average
+				self._rebuild_postings()
+			self._generation = generation
+
+	def _add(self, entry: SkillEntry, version: tuple) -> None:
+		self._remove(entry.name)
+		terms = skill_terms(entry)
+		length = sum(terms.values())
+		self._docs[entry.name] = (version, terms, length)
+		self._descriptions[entry.name] = entry.description
+		self._total_length += length
+		if self._average:
+			self._post(entry.name, terms, length)
+		self.updates += 1
+
+	def _post(self, name: str, terms: Counter[str], length: int) -> None:
+		norm = K1 * (1 - B + B * length / self._average)
+		for term, frequency in terms.items():
+			self._postings.setdefault(term, {})[name] = frequency / (frequency + norm)
+			self._champion_lists.pop(term, None)
+
+	def _champions(self, term: str) -> list[str]:
+		champions = self._champion_lists.get(term)
+		if champions is None:
+			postings = self._postings[term]
+			champions = self._champion_lists[term] = heapq.nlargest(CHAMPIONS, postings, key=postings.__getitem__)
+		return champions
+
+	def _rebuild_postings(self) -> None:
+		self._postings = {}
+		self._champion_lists = {}
+		if self._average:
+			for name, (_version, terms, length) in self._docs.items():
+				self._post(name, terms, length)
+
+	def _remove(self, name: str) -> None:
+		indexed = self._docs.pop(name, None)
+		if indexed is None:
+			return
+		_version, terms, length = indexed
+		for term in terms:
+			postings = self._postings.get(term)
+			if postings is not None:
+				postings.pop(name, None)
+				self._champion_lists.pop(term, None)
+				if not postings:
+					del self._postings[term]
+		self._descriptions.pop(name, None)
+		self._total_length -= length
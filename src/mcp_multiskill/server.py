@@ -1,54 +1,251 @@
-from mcp.server.fastmcp import FastMCP
+import asyncio
+import contextlib
+import logging
 
+from mcp.server.fastmcp import Context, FastMCP
+
+from .clients import client_key, scheduler
+from .environments import environment_registry
+from .executor import limiter
 from .load_skill import (
+	get_search_index,
+	get_skill_registry,
 	list_skills_summary,
+	read_skill_output_page,
+	render_script_for_client,
 	render_skill_for_client,
+	run_skill_batch,
+	run_skill_pipeline,
 	run_skill_script,
+	search_skills,
 )
+from .memo import memo_cache
+from .payloads import write_payload as write_payload_chunk
+from .metrics import metrics
+from .prewarm import PrewarmStatus, prewarm_enabled, prewarm_skills, prewarm_status
+from .render_cache import render_cache
+from .schema_cache import schema_cache
+from .scratch import scratch_area
+
+
+logger = logging.getLogger("mcp_multiskill")
+_prewarm_task: asyncio.Task | None = None
+
+
+def log_prewarm_progress(status: PrewarmStatus) -> None:
+	logger.debug("prewarm: %d/%d schemas", status.done, status.scripts)
+
+
+async def run_prewarm() -> PrewarmStatus:
+	try:
+		status = await prewarm_skills(on_progress=log_prewarm_progress)
+	except Exception:
+		logger.exception("mcp-multiskill prewarm failed")
+		raise
+	logger.info(
+		"mcp-multiskill ready: %d skills, %d schemas (%d failed) in %.2fs",
+		status.skills,
+		status.scripts,
+		len(status.failed),
+		status.elapsed or 0.0,
+	)
+	return status
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_server):
+	global _prewarm_task
+	# 后台预热，不阻塞启动；未完成时工具调用按需等待对应条目。
+	# HTTP 传输下每个会话都会进入 lifespan，只在首次进入时启动
+	if prewarm_enabled() and (_prewarm_task is None or _prewarm_task.get_loop() is not asyncio.get_running_loop()):
+		_prewarm_task = asyncio.create_task(run_prewarm())
+	yield {"prewarm": prewarm_status}
 
 
 mcp = FastMCP(
 	"mcp-multiskill",
-	instructions="You are interacting with a multi-skill MCP server. Before executing any skills, you MUST first call the `get_skill_index` tool to retrieve the list of available skills and their descriptions."
+	instructions="You are interacting with a multi-skill MCP server. Before executing any skills, you MUST first call the `get_skill_index` tool to retrieve the list of available skills and their descriptions, or `search_skills` to find relevant skills by keyword.",
+	lifespan=lifespan,
 )
 
 
-def skills_index() -> str:
+def skills_index(offset: int = 0, limit: int | None = None) -> str:
 	summaries = list_skills_summary()
 	if not summaries:
 		return "No skills found."
 
+	total = len(summaries)
+	offset = max(0, offset)
+	page = summaries[offset:offset + limit] if limit else summaries[offset:]
 	lines = ["# Skills", ""]
-	for item in summaries:
+	for item in page:
 		lines.append(f"- {item['name']}: {item['description']}")
+	end = offset + len(page)
+	if not page:
+		return f"No skills at offset {offset}; the index has {total} skills."
+	if len(page) < total:
+		more = f"; call get_skill_index(offset={end}) for more" if end < total else ""
+		lines.extend(["", f"Showing {offset + 1}-{end} of {total} skills{more}."])
 	return "\n".join(lines)
 
+
+def skills_search(query: str, limit: int = 10) -> str:
+	results = search_skills(query, limit)
+	if not results:
+		return f"No skills match {query!r}."
+
+	lines = [f"# Skills matching {query!r}", ""]
+	for item in results:
+		lines.append(f"- {item['name']}: {item['description']}")
+	return "\n".join(lines)
+
+def server_stats() -> dict:
+	from .worker_pool import get_worker_pool
+
+	pool = get_worker_pool()
+	return {
+		"prewarm": prewarm_status.as_dict(),
+		"registry": get_skill_registry().stats(),
+		"search_index": get_search_index().stats(),
+		"schema_cache": schema_cache.stats(),
+		"render_cache": render_cache.stats(),
+		"result_cache": memo_cache.stats(),
+		"environments": environment_registry.stats(),
+		"workers": pool.stats() if pool is not None else None,
+		"concurrency": {"global": limiter.global_limit, "per_skill": limiter.skill_limit},
+		"clients": scheduler.stats(),
+		"metrics": metrics.snapshot(),
+	}
+
 @mcp.tool(name="get_skill_index")
-def get_skill_index() -> str:
-	"""Get the skill index. You MUST first call this tool to retrieve the list of available skills"""
-	return skills_index()
+def get_skill_index(offset: int = 0, limit: int | None = None) -> str:
+	"""Get the skill index. You MUST first call this tool to retrieve the list of available skills. With many skills, page through it with offset/limit."""
+	return skills_index(offset, limit)
+
+@mcp.tool(name="search_skills")
+async def search_skills_tool(query: str, limit: int = 10) -> str:
+	"""Find skills relevant to a task by keyword. Searches skill names, descriptions, SKILL.md text, script names and argument help; returns the best matches first."""
+	# 索引刷新会读文件并持有线程锁，放到线程里避免阻塞事件循环
+	return await asyncio.to_thread(skills_search, query, limit)
 
 @mcp.tool(name="get_skill")
-def get_skill(skill_name: str) -> str:
-	"""Get a specific skill detail by name."""
-	return render_skill_for_client(skill_name)
+async def get_skill(skill_name: str, full: bool = False) -> str:
+	"""Get a specific skill detail by name. Scripts are listed as one-line signatures; pass full=True to include every script's complete argument schema."""
+	return await render_skill_for_client(skill_name, compact=not full)
+
+
+@mcp.tool(name="get_skill_script")
+async def get_skill_script(skill_name: str, script_name: str) -> str:
+	"""Get the complete argument schema (descriptions, types, choices) of one script in a skill."""
+	return await render_script_for_client(skill_name, script_name)
 
 
 @mcp.tool(name="run_skill")
-def run_skill(
+async def run_skill(
 	skill_name: str,
 	script_name: str,
 	argv: list[str] | None = None,
 	stdin: str | None = None,
+	timeout: float | None = None,
+	stream: bool = False,
+	stdin_handle: str | None = None,
+	stdin_base64: str | None = None,
+	binary_stdout: bool = False,
+	ctx: Context | None = None,
 ) -> dict:
-	"""Single entry tool for executing scripts in a skill through uv. You should call get_skill to check the details of the skill before calling this tool, as you need to provide the correct script_name, argv and optional stdin."""
-	return run_skill_script(
-		skill_name=skill_name,
-		script_name=script_name,
-		argv=argv,
-		stdin=stdin,
+	"""Single entry tool for executing scripts in a skill through uv. You should call get_skill to check the details of the skill before calling this tool, as you need to provide the correct script_name, argv and optional stdin. timeout (seconds) kills the script if it runs longer. stream=True forwards output as log/progress notifications while the script runs. Large output is truncated; the result then lists a handle for read_skill_output.
+
+	Binary or large data: upload it with write_payload and pass stdin_handle (or use a "payload://<handle>" argv item, replaced by the file path); small binary input can go inline as stdin_base64. binary_stdout=True returns stdout as stdout_base64 when small, otherwise as stdout_handle to page through with read_skill_output(encoding="base64").
+
+	Scripts marked `-> result` / `-> records` in get_skill return parsed data: `result` holds a JSON value and `records` a list of NDJSON records (with record_count), validated against the declared schema (problems in result_errors). Prefer these fields over parsing stdout. Large results come back as result_handle / records_handle for read_skill_output."""
+	async with scheduler.slot(client_key(ctx)):
+		return await run_skill_script(
+			skill_name=skill_name,
+			script_name=script_name,
+			argv=argv,
+			stdin=stdin,
+			timeout=timeout,
+			on_output=output_forwarder(ctx) if stream and ctx is not None else None,
+			stdin_handle=stdin_handle,
+			stdin_base64=stdin_base64,
+			binary_stdout=binary_stdout,
+		)
+
+
+@mcp.tool(name="run_skill_batch")
+async def run_skill_batch_tool(
+	items: list[dict],
+	max_parallel: int | None = None,
+	fail_fast: bool = False,
+	timeout: float | None = None,
+	ctx: Context | None = None,
+) -> dict:
+	"""Run many skill scripts in one call. items is a list of {"skill_name", "script_name", "argv", "stdin"} objects (argv/stdin optional, per-item "timeout" overrides timeout). Items run in parallel (at most max_parallel at once) and results come back in the same order with a per-item status: ok, failed, error, cancelled or skipped. fail_fast=True stops the batch at the first item that is not ok."""
+	client = client_key(ctx)
+	return await run_skill_batch(
+		items,
+		max_parallel=max_parallel,
+		fail_fast=fail_fast,
+		timeout=timeout,
+		gate=lambda: scheduler.slot(client),
 	)
 
 
+@mcp.tool(name="run_skill_pipeline")
+async def run_skill_pipeline_tool(
+	steps: list[dict],
+	stdin: str | None = None,
+	stdin_handle: str | None = None,
+	timeout: float | None = None,
+	stream: bool = False,
+	ctx: Context | None = None,
+) -> dict:
+	"""Chain skill scripts like a shell pipeline: steps is an ordered list of {"skill_name", "script_name", "argv"} objects, and each step's stdout is piped into the next step's stdin on the server. All steps run at once; stdin (or stdin_handle from write_payload) feeds the first step. Only the last step's stdout is returned, plus per-step returncode, stderr and usage; returncode is that of the last failing step (failed_step). Use this instead of copying one run_skill result into the next call's stdin."""
+	async with scheduler.slot(client_key(ctx)):
+		return await run_skill_pipeline(
+			steps,
+			stdin=stdin,
+			stdin_handle=stdin_handle,
+			timeout=timeout,
+			on_output=output_forwarder(ctx) if stream and ctx is not None else None,
+		)
+
+
+def output_forwarder(ctx: Context):
+	received = 0
+
+	async def forward(stream_name: str, chunk: bytes) -> None:
+		nonlocal received
+		received += len(chunk)
+		await ctx.log("info", chunk.decode("utf-8", errors="replace"), logger_name=stream_name)
+		await ctx.report_progress(received, message=f"{received} bytes of output")
+
+	return forward
+
+
+@mcp.tool(name="read_skill_output")
+def read_skill_output(handle: str, offset: int = 0, limit: int = 65536, encoding: str = "utf-8") -> dict:
+	"""Read a page of full script output that run_skill truncated, or of a stdout_handle / result_handle / records_handle / payload. Pass the handle from the run_skill result and continue from next_offset until eof. encoding="base64" returns raw bytes for binary data. Pages of a records_handle hold whole parsed records in `records`."""
+	return read_skill_output_page(handle, offset, limit, encoding)
+
+
+@mcp.tool(name="write_payload")
+def write_payload(data: str, handle: str | None = None, encoding: str = "base64") -> dict:
+	"""Upload input for run_skill into a server-side payload file. The first call creates it and returns a handle; pass that handle to append further chunks (keep chunks to a few MB). encoding is "base64" (default) or "utf-8". Use the handle as run_skill(stdin_handle=...) or as a "payload://<handle>" argv item. Payloads expire with other scratch files."""
+	return write_payload_chunk(data, handle, encoding)
+
+
+@mcp.tool(name="delete_payload")
+def delete_payload(handle: str) -> dict:
+	"""Delete a payload or output file before it expires."""
+	return {"handle": handle, "deleted": scratch_area.delete(handle)}
+
+
+@mcp.tool(name="get_server_stats")
+def get_server_stats() -> dict:
+	"""Server diagnostics: per-skill/per-script latency, CPU, memory and output histograms, cache hit rates, environment and worker pool state."""
+	return server_stats()
+
+
 if __name__ == "__main__":
 	mcp.run()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .limits import LIMITS_TABLE, ResourceLimits
+from .registry import file_stamp
+from .results import RESULTS_TABLE, ResultSpec
+
+try:
+	import tomllib
+except ImportError:  # Python < 3.11
+	try:
+		import tomli as tomllib
+	except ImportError:
+		tomllib = None
+
+
+TOOL_TABLE = "mcp-multiskill"
+
+logger = logging.getLogger("mcp_multiskill")
+
+
+@dataclass(frozen=True)
+class SkillConfig:
+	"""Per-skill settings from the ``[tool.mcp-multiskill]`` table of the skill's ``pyproject.toml``.
+
+	``cacheable`` is ``true`` for every script or a list of script names;
+	``validate_argv = false`` leaves argument checking to the scripts;
+	``[tool.mcp-multiskill.limits]`` sets resource limits for its runs;
+	``[tool.mcp-multiskill.results.<script>]`` declares a script's structured result.
+	"""
+
+	cacheable: bool | frozenset[str] = False
+	cache_ttl: float | None = None
+	validate_argv: bool = True
+	limits: ResourceLimits | None = None
+	results: dict[str, ResultSpec] = field(default_factory=dict)
+	raw: Any = None
+
+	def is_cacheable(self, script_name: str) -> bool:
+		if isinstance(self.cacheable, frozenset):
+			return script_name in self.cacheable
+		return self.cacheable
+
+	def result_spec(self, script_name: str) -> ResultSpec | None:
+		return self.results.get(script_name)
+
+	@classmethod
+	def from_table(cls, table: dict[str, Any]) -> SkillConfig:
+		cacheable = table.get("cacheable", False)
+		if isinstance(cacheable, list):
+			cacheable = frozenset(str(name).removesuffix(".py") for name in cacheable)
+		else:
+			cacheable = bool(cacheable)
+		ttl = table.get("cache_ttl")
+		return cls(
+			cacheable=cacheable,
+			cache_ttl=float(ttl) if isinstance(ttl, (int, float)) and not isinstance(ttl, bool) else None,
+			validate_argv=bool(table.get("validate_argv", True)),
+			limits=ResourceLimits.from_table(table.get(LIMITS_TABLE)),
+			results=ResultSpec.from_table(table.get(RESULTS_TABLE)),
+			raw=table,
+		)
+
+
+DEFAULT_CONFIG = SkillConfig()
+
+_configs: dict[Path, tuple[Any, SkillConfig]] = {}
+_lock = threading.Lock()
+
+
+def read_tool_table(pyproject: Path) -> dict[str, Any]:
+	"""The ``[tool.mcp-multiskill]`` table, or ``{}``; a table that cannot be read is logged, not silently dropped."""
+	try:
+		content = pyproject.read_bytes()
+	except OSError:
+		return {}
+	declared = f"tool.{TOOL_TABLE}".encode() in content
+	if tomllib is None:
+		# 3.10 上没有 tomllib 又缺少 tomli 时，limits/cacheable 等配置都会失效
+		if declared:
+			logger.warning("%s: cannot read [tool.%s] without tomli on Python < 3.11; using defaults", pyproject, TOOL_TABLE)
+		return {}
+	try:
+		data = tomllib.loads(content.decode("utf-8"))
+	except (UnicodeDecodeError, ValueError) as error:
+		if declared:
+			logger.warning("%s: invalid TOML, [tool.%s] ignored: %s", pyproject, TOOL_TABLE, error)
+		return {}
+	table = data.get("tool", {}).get(TOOL_TABLE, {})
+	return table if isinstance(table, dict) else {}
+
+
+def load_skill_config(skill_dir: Path) -> SkillConfig:
+	"""Config for ``skill_dir``, re-parsed only when ``pyproject.toml`` changes."""
+	pyproject = skill_dir / "pyproject.toml"
+	stamp = file_stamp(pyproject)
+	cached = _configs.get(skill_dir)
+	if cached is not None and cached[0] == stamp:
+		return cached[1]
+	config = SkillConfig.from_table(read_tool_table(pyproject)) if stamp is not None else DEFAULT_CONFIG
+	with _lock:
+		_configs[skill_dir] = (stamp, config)
+	return config
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import ast
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .config import env_flag
+
+
+STATIC_SCHEMA_ENV = "MCP_MULTISKILL_STATIC_SCHEMA"
+HOOK_NAME = "get_parser_json"
+
+# argparse 行为能被静态还原的部分；其余一律视为动态构建，回退到子进程
+_SUPPORTED_ACTIONS = {"store", "store_true", "store_false", "store_const", "append", "append_const"}
+_ARGUMENT_KWARGS = {"action", "type", "choices", "default", "help", "required", "metavar", "dest", "nargs", "const"}
+_PARSER_KWARGS = {"prog", "usage", "description", "epilog", "allow_abbrev", "exit_on_error", "formatter_class"}
+_PARSER_METHODS = {
+	"add_argument",
+	"parse_args",
+	"parse_known_args",
+	"parse_intermixed_args",
+	"print_help",
+	"print_usage",
+	"format_help",
+	"format_usage",
+	"error",
+	"exit",
+}
+_TYPE_NAMES = {"str", "int", "float", "bool"}
+
+
+class DynamicParserError(Exception):
+	pass
+
+
+@dataclass
+class ArgumentSpec:
+	option_strings: list[str]
+	dest: str
+	action: str = "store"
+	type: str | None = None
+	choices: list[Any] | str | None = None
+	default: Any = None
+	help: str | None = None
+	required: bool = False
+	metavar: Any = None
+	nargs: Any = None
+	const: Any = None
+
+	@property
+	def is_positional(self) -> bool:
+		return not self.option_strings
+
+	@property
+	def takes_value(self) -> bool:
+		return self.action in ("store", "append") and self.nargs != 0
+
+
+@dataclass
+class ParserSpec:
+	description: str | None = None
+	allow_abbrev: bool = True
+	arguments: list[ArgumentSpec] = field(default_factory=list)
+	# 脚本调用的 parser 方法（parse_args、parse_known_args 等）
+	methods: set[str] = field(default_factory=set)
+
+
+def static_schema_enabled() -> bool:
+	return env_flag(STATIC_SCHEMA_ENV, True)
+
+
+def extract_parser_spec(script_path: Path) -> ParserSpec | None:
+	try:
+		source = script_path.read_text(encoding="utf-8")
+		tree = ast.parse(source, filename=str(script_path))
+	except (OSError, UnicodeDecodeError, SyntaxError, ValueError):
+		return None
+	try:
+		return _ParserExtractor(tree).extract()
+	except DynamicParserError:
+		return None
+
+
+def extract_static_schema(script_path: Path) -> dict[str, Any] | None:
+	spec = extract_parser_spec(script_path)
+	if spec is None:
+		return None
+	return spec_to_json(spec)
+
+
+def spec_to_json(spec: ParserSpec) -> dict[str, Any]:
+	"""Mirror ``argparse_to_json.convert_parser_to_json`` for a parser spec."""
+	schema: dict[str, Any] = {}
+	for argument in spec.arguments:
+		if argument.action == "store":
+			data: dict[str, Any] = {"type": "integer" if argument.type == "int" else "string"}
+			if argument.help:
+				data["description"] = argument.help
+			if argument.required:
+				data["required"] = argument.required
+			if argument.choices:
+				data["enum"] = argument.choices
+		elif argument.action == "append":
+			data = {"type": "array", "items": {"type": "integer" if argument.type == "int" else "string"}}
+			if argument.help:
+				data["description"] = argument.help
+		elif argument.action == "append_const":
+			data = {"type": "array", "items": {"type": "boolean"}}
+			if argument.help:
+				data["description"] = argument.help
+		else:
+			data = {"type": "boolean"}
+			if argument.help:
+				data["description"] = argument.help
+		if argument.metavar:
+			data["title"] = argument.metavar
+		schema[argument.dest] = data
+	# 与钩子输出经过 json 往返后的形态保持一致（tuple -> list 等）
+	return json.loads(json.dumps({"schema": schema}, ensure_ascii=False))
+
+
+def _literal(node: ast.AST) -> Any:
+	try:
+		return ast.literal_eval(node)
+	except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+		raise DynamicParserError(f"non-literal value at line {getattr(node, 'lineno', '?')}") from None
+
+
+def _is_main_guard(node: ast.If) -> bool:
+	test = node.test
+	if not isinstance(test, ast.Compare) or len(test.ops) != 1 or not isinstance(test.ops[0], ast.Eq):
+		return False
+	left, right = test.left, test.comparators[0]
+	return (
+		isinstance(left, ast.Name)
+		and left.id == "__name__"
+		and isinstance(right, ast.Constant)
+		and right.value == "__main__"
+	)
+
+
+class _ParserExtractor:
+	def __init__(self, tree: ast.Module) -> None:
+		self.tree = tree
+		self.parents: dict[ast.AST, ast.AST] = {}
+		for node in ast.walk(tree):
+			for child in ast.iter_child_nodes(node):
+				self.parents[child] = node
+		self.argparse_modules: set[str] = set()
+		self.parser_classes: set[str] = set()
+		self.hook_names: set[str] = set()
+		self._collect_imports()
+
+	def _collect_imports(self) -> None:
+		for node in ast.walk(self.tree):
+			if isinstance(node, ast.Import):
+				for alias in node.names:
+					if alias.name == "argparse":
+						self.argparse_modules.add(alias.asname or alias.name)
+			elif isinstance(node, ast.ImportFrom):
+				for alias in node.names:
+					if node.module == "argparse" and alias.name == "ArgumentParser":
+						self.parser_classes.add(alias.asname or alias.name)
+					elif alias.name == HOOK_NAME:
+						self.hook_names.add(alias.asname or alias.name)
+
+	def _is_parser_constructor(self, node: ast.AST) -> bool:
+		if not isinstance(node, ast.Call):
+			return False
+		func = node.func
+		if isinstance(func, ast.Name):
+			return func.id in self.parser_classes
+		return (
+			isinstance(func, ast.Attribute)
+			and func.attr == "ArgumentParser"
+			and isinstance(func.value, ast.Name)
+			and func.value.id in self.argparse_modules
+		)
+
+	def _is_hook_call(self, node: ast.AST) -> bool:
+		if not isinstance(node, ast.Call):
+			return False
+		func = node.func
+		if isinstance(func, ast.Name):
+			return func.id in self.hook_names
+		return isinstance(func, ast.Attribute) and func.attr == HOOK_NAME
+
+	def _check_static_context(self, node: ast.AST) -> None:
+		current = self.parents.get(node)
+		while current is not None and not isinstance(current, ast.Module):
+			if isinstance(current, ast.If):
+				if not (_is_main_guard(current) or self._is_hook_guard(current)):
+					raise DynamicParserError(f"conditional parser usage at line {node.lineno}")
+			elif not isinstance(current, (ast.FunctionDef, ast.Expr, ast.Assign, ast.Return, ast.Call, ast.UnaryOp)):
+				raise DynamicParserError(f"parser used inside {type(current).__name__} at line {node.lineno}")
+			current = self.parents.get(current)
+
+	def _is_hook_guard(self, node: ast.If) -> bool:
+		test = node.test
+		if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+			test = test.operand
+		return self._is_hook_call(test)
+
+	def extract(self) -> ParserSpec:
+		constructors = [node for node in ast.walk(self.tree) if self._is_parser_constructor(node)]
+		if len(constructors) != 1:
+			raise DynamicParserError("expected exactly one ArgumentParser")
+		constructor = constructors[0]
+		assign = self.parents.get(constructor)
+		if (
+			not isinstance(assign, ast.Assign)
+			or len(assign.targets) != 1
+			or not isinstance(assign.targets[0], ast.Name)
+		):
+			raise DynamicParserError("ArgumentParser must be assigned to a plain name")
+		self._check_static_context(assign)
+		parser_name = assign.targets[0].id
+		spec = self._parser_spec(constructor)
+
+		hook_lines: list[int] = []
+		add_calls: list[ast.Call] = []
+		for node in ast.walk(self.tree):
+			if isinstance(node, ast.Name) and node.id == parser_name:
+				if node is assign.targets[0]:
+					continue
+				if not isinstance(node.ctx, ast.Load):
+					raise DynamicParserError(f"parser name rebound at line {node.lineno}")
+				parent = self.parents.get(node)
+				if isinstance(parent, ast.Attribute) and parent.value is node:
+					if parent.attr not in _PARSER_METHODS:
+						raise DynamicParserError(f"unsupported parser usage .{parent.attr}")
+					spec.methods.add(parent.attr)
+					if parent.attr == "add_argument":
+						call = self.parents.get(parent)
+						if not isinstance(call, ast.Call) or call.func is not parent:
+							raise DynamicParserError("add_argument referenced without being called")
+						if not isinstance(self.parents.get(call), ast.Expr):
+							raise DynamicParserError("add_argument result is used")
+						self._check_static_context(call)
+						add_calls.append(call)
+				elif self._is_hook_call(parent) and parent.args and parent.args[0] is node:
+					self._check_static_context(parent)
+					hook_lines.append(parent.lineno)
+				else:
+					raise DynamicParserError(f"parser passed around at line {node.lineno}")
+
+		if not hook_lines:
+			raise DynamicParserError(f"missing {HOOK_NAME} hook")
+		hook_line = min(hook_lines)
+		for call in sorted(add_calls, key=lambda item: (item.lineno, item.col_offset)):
+			if call.lineno > hook_line:
+				raise DynamicParserError("add_argument after the schema hook")
+			spec.arguments.append(self._argument_spec(call))
+		return spec
+
+	def _parser_spec(self, call: ast.Call) -> ParserSpec:
+		spec = ParserSpec()
+		for arg in call.args:
+			_literal(arg)
+		for keyword in call.keywords:
+			if keyword.arg is None or keyword.arg not in _PARSER_KWARGS:
+				raise DynamicParserError(f"unsupported ArgumentParser option {keyword.arg}")
+			if keyword.arg == "formatter_class":
+				continue
+			value = _literal(keyword.value)
+			if keyword.arg == "description":
+				spec.description = value
+			elif keyword.arg == "allow_abbrev":
+				spec.allow_abbrev = bool(value)
+		return spec
+
+	def _argument_spec(self, call: ast.Call) -> ArgumentSpec:
+		names = [_literal(arg) for arg in call.args]
+		if not names or not all(isinstance(name, str) and name for name in names):
+			raise DynamicParserError(f"add_argument names must be string literals (line {call.lineno})")
+
+		options: dict[str, Any] = {}
+		for keyword in call.keywords:
+			if keyword.arg is None or keyword.arg not in _ARGUMENT_KWARGS:
+				raise DynamicParserError(f"unsupported add_argument option {keyword.arg}")
+			if keyword.arg == "type":
+				if not isinstance(keyword.value, ast.Name) or keyword.value.id not in _TYPE_NAMES:
+					raise DynamicParserError(f"unsupported argument type at line {call.lineno}")
+				options["type"] = keyword.value.id
+			else:
+				options[keyword.arg] = _literal(keyword.value)
+
+		action = options.get("action", "store")
+		if action not in _SUPPORTED_ACTIONS:
+			raise DynamicParserError(f"unsupported action {action!r}")
+		if action in ("store_const", "append_const") and "const" not in options:
+			raise DynamicParserError(f"{action} requires const")
+		choices = options.get("choices")
+		if choices is not None and not isinstance(choices, (list, tuple, str)):
+			raise DynamicParserError("choices must be a list, tuple or string literal")
+		if isinstance(choices, tuple):
+			choices = list(choices)
+
+		if names[0].startswith("-"):
+			if not all(name.startswith("-") for name in names):
+				raise DynamicParserError("mixed positional and optional names")
+			dest = options.get("dest")
+			if dest is None:
+				long_names = [name for name in names if name.startswith("--")]
+				dest = (long_names or names)[0].lstrip("-").replace("-", "_")
+			required = bool(options.get("required", False))
+		else:
+			if len(names) != 1 or "dest" in options or "required" in options:
+				raise DynamicParserError("invalid positional argument definition")
+			dest = names[0]
+			nargs = options.get("nargs")
+			required = nargs not in ("?", "*") or (nargs == "*" and "default" not in options)
+			names = []
+
+		if action == "store_true":
+			default = options.get("default", False)
+		elif action == "store_false":
+			default = options.get("default", True)
+		else:
+			default = options.get("default")
+
+		return ArgumentSpec(
+			option_strings=names,
+			dest=dest,
+			action=action,
+			type=options.get("type"),
+			choices=choices,
+			default=default,
+			help=options.get("help"),
+			required=required,
+			metavar=options.get("metavar"),
+			nargs=options.get("nargs"),
+			const=options.get("const"),
+		)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TaskCache:
+	"""One shared asyncio task per key.
+
+	Concurrent callers asking for the same ``(key, version)`` await the same
+	task instead of starting duplicate work. Failed or cancelled tasks are
+	dropped so the next caller retries; a new ``version`` replaces the entry.
+	"""
+
+	def __init__(self) -> None:
+		self._loop: asyncio.AbstractEventLoop | None = None
+		self._tasks: dict[Hashable, tuple[Hashable, asyncio.Task]] = {}
+
+	def task(self, key: Hashable, version: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+		loop = asyncio.get_running_loop()
+		if loop is not self._loop:
+			self._loop = loop
+			self._tasks = {}
+		cached = self._tasks.get(key)
+		if cached is not None and cached[0] == version and not _failed(cached[1]):
+			return cached[1]
+		task = loop.create_task(factory())
+		self._tasks[key] = (version, task)
+		return task
+
+	async def get(self, key: Hashable, version: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+		# shield：单个调用方被取消不影响其他等待同一任务的调用方
+		return await asyncio.shield(self.task(key, version, factory))
+
+	def pending(self) -> int:
+		return sum(1 for _version, task in self._tasks.values() if not task.done())
+
+	def __len__(self) -> int:
+		return len(self._tasks)
+
+	def clear(self) -> None:
+		self._tasks = {}
+
+
+def _failed(task: asyncio.Task) -> bool:
+	return task.done() and (task.cancelled() or task.exception() is not None)
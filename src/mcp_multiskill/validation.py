@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+from .config import env_flag
+from .registry import file_stamp
+from .static_schema import ArgumentSpec, ParserSpec, extract_parser_spec
+
+
+VALIDATE_ENV = "MCP_MULTISKILL_VALIDATE_ARGV"
+
+_HELP_OPTIONS = ("-h", "--help")
+_NEGATIVE_NUMBER = re.compile(r"^-\d+$|^-\d*\.\d+$")
+_CONVERTERS = {"int": int, "float": float, "bool": bool}
+
+_validators: dict[Path, tuple[Any, ArgvValidator | None]] = {}
+_lock = threading.Lock()
+
+
+class _Undecided(Exception):
+	"""argv uses argparse features the validator does not model; let the script decide."""
+
+
+def validation_enabled() -> bool:
+	return env_flag(VALIDATE_ENV, True)
+
+
+def _metavar(argument: ArgumentSpec) -> str:
+	if argument.metavar is not None:
+		return str(argument.metavar)
+	if argument.choices is not None:
+		return "{" + ",".join(map(str, argument.choices)) + "}"
+	return argument.dest if argument.is_positional else argument.dest.upper()
+
+
+def _format_args(argument: ArgumentSpec) -> str:
+	metavar = _metavar(argument)
+	if argument.nargs == "?":
+		return f"[{metavar}]"
+	if argument.nargs == "*":
+		return f"[{metavar} ...]"
+	if argument.nargs == "+":
+		return f"{metavar} [{metavar} ...]"
+	if isinstance(argument.nargs, int):
+		return " ".join([metavar] * argument.nargs)
+	return metavar
+
+
+def format_usage(prog: str, spec: ParserSpec) -> str:
+	"""``parser.format_usage()`` without the ``usage:`` prefix: option strings, then positionals."""
+	parts = [prog, "[-h]"]
+	for argument in spec.arguments:
+		if argument.is_positional:
+			continue
+		text = argument.option_strings[0]
+		if argument.takes_value:
+			text += " " + _format_args(argument)
+		parts.append(text if argument.required else f"[{text}]")
+	parts.extend(_format_args(argument) for argument in spec.arguments if argument.is_positional)
+	return " ".join(parts)
+
+
+class ArgvValidator:
+	"""In-process mirror of ``parser.parse_args`` for a statically extracted parser.
+
+	Only rejects argv that argparse would reject too; anything it cannot model
+	(short option clusters, ``-xVALUE``) is passed through to the script.
+	"""
+
+	def __init__(self, name: str, spec: ParserSpec) -> None:
+		self.allow_abbrev = spec.allow_abbrev
+		self.options: dict[str, ArgumentSpec] = {}
+		self.positionals: list[ArgumentSpec] = []
+		for argument in spec.arguments:
+			if argument.is_positional:
+				self.positionals.append(argument)
+			for option in argument.option_strings:
+				self.options[option] = argument
+		self.negative_options = any(_NEGATIVE_NUMBER.match(option) for option in self.options)
+		self.prog = name
+		self.usage = format_usage(name, spec)
+
+	@classmethod
+	def compile(cls, name: str, spec: ParserSpec) -> ArgvValidator | None:
+		# parse_known_args 允许未知参数、nargs 需要完整的模式匹配，这些脚本不做校验
+		if spec.methods & {"parse_args", "parse_known_args", "parse_intermixed_args"} != {"parse_args"}:
+			return None
+		if any(argument.nargs is not None for argument in spec.arguments):
+			return None
+		if any(option in _HELP_OPTIONS for argument in spec.arguments for option in argument.option_strings):
+			return None
+		return cls(name, spec)
+
+	def validate(self, argv: list[str]) -> list[str]:
+		"""argparse-style error for ``argv`` (argparse exits on the first one); empty when it would parse."""
+		try:
+			return self._validate(argv)[:1]
+		except _Undecided:
+			return []
+
+	def _validate(self, argv: list[str]) -> list[str]:
+		errors: list[str] = []
+		unrecognized: list[str] = []
+		seen: set[str] = set()
+		values: list[str] = []
+		index = 0
+		while index < len(argv):
+			token = argv[index]
+			index += 1
+			if token == "--":
+				values.extend(argv[index:])
+				break
+			if not self._looks_like_option(token):
+				values.append(token)
+				continue
+			argument, explicit = self._resolve(token, errors)
+			if argument is None:
+				unrecognized.append(token)
+				continue
+			if argument == "help":
+				# -h 直接打印帮助并以 0 退出
+				return []
+			if argument == "ambiguous":
+				# argparse 遇到歧义缩写立即退出
+				return errors
+			seen.add(argument.dest)
+			label = "/".join(argument.option_strings)
+			if not argument.takes_value:
+				if explicit is not None:
+					errors.append(f"argument {label}: ignored explicit argument {explicit!r}")
+				continue
+			if explicit is None:
+				if index >= len(argv) or argv[index] == "--" or self._looks_like_option(argv[index]):
+					errors.append(f"argument {label}: expected one argument")
+					continue
+				explicit = argv[index]
+				index += 1
+			self._check_value(argument, label, explicit, errors)
+
+		for argument, value in zip(self.positionals, values):
+			seen.add(argument.dest)
+			self._check_value(argument, argument.metavar or argument.dest, value, errors)
+		unrecognized.extend(values[len(self.positionals):])
+
+		missing = [
+			"/".join(argument.option_strings) or str(argument.metavar or argument.dest)
+			for argument in [*self.options.values(), *self.positionals]
+			if argument.required and argument.dest not in seen
+		]
+		if missing:
+			errors.append(f"the following arguments are required: {', '.join(dict.fromkeys(missing))}")
+		if unrecognized:
+			errors.append(f"unrecognized arguments: {' '.join(unrecognized)}")
+		return errors
+
+	def _looks_like_option(self, token: str) -> bool:
+		# 与 argparse 的 _parse_optional 一致：负数与含空格的参数按值处理
+		if not token.startswith("-") or token == "-":
+			return False
+		if token in self.options or token.split("=", 1)[0] in self.options:
+			return True
+		if _NEGATIVE_NUMBER.match(token) and not self.negative_options:
+			return False
+		return " " not in token
+
+	def _resolve(self, token: str, errors: list[str]) -> tuple[Any, str | None]:
+		if token in _HELP_OPTIONS:
+			return "help", None
+		if token in self.options:
+			return self.options[token], None
+		head, sep, value = token.partition("=")
+		if sep and head in self.options:
+			return self.options[head], value
+		if token.startswith("--"):
+			if not self.allow_abbrev:
+				return None, None
+			matches = [option for option in [*self.options, "--help"] if option.startswith("--") and option.startswith(head)]
+			if len(matches) > 1:
+				errors.append(f"ambiguous option: {head} could match {', '.join(matches)}")
+				return "ambiguous", None
+			if matches:
+				return ("help" if matches[0] == "--help" else self.options[matches[0]]), (value if sep else None)
+			return None, None
+		if any(option[:2] == token[:2] for option in [*self.options, "-h"] if not option.startswith("--")):
+			raise _Undecided
+		return None, None
+
+	def _check_value(self, argument: ArgumentSpec, label: str, value: str, errors: list[str]) -> None:
+		converted: Any = value
+		converter = _CONVERTERS.get(argument.type or "")
+		if converter is not None:
+			try:
+				converted = converter(value)
+			except ValueError:
+				errors.append(f"argument {label}: invalid {argument.type} value: {value!r}")
+				return
+		if isinstance(argument.choices, str) and not isinstance(converted, str):
+			return
+		if argument.choices is not None and converted not in argument.choices:
+			choices = ", ".join(map(repr, argument.choices))
+			errors.append(f"argument {label}: invalid choice: {converted!r} (choose from {choices})")
+
+
+def get_argv_validator(script_path: Path) -> ArgvValidator | None:
+	"""Compiled validator for ``script_path``, rebuilt only when the script changes."""
+	stamp = file_stamp(script_path)
+	cached = _validators.get(script_path)
+	if cached is not None and cached[0] == stamp:
+		return cached[1]
+	spec = extract_parser_spec(script_path) if stamp is not None else None
+	validator = ArgvValidator.compile(script_path.name, spec) if spec is not None else None
+	with _lock:
+		_validators[script_path] = (stamp, validator)
+	return validator
@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from .config import env_float, env_int
+from .environments import build_command, resolve_for_launch
+
+
+WORKERS_ENV = "MCP_MULTISKILL_WORKERS"
+WORKER_IDLE_ENV = "MCP_MULTISKILL_WORKER_IDLE_SECONDS"
+WORKER_MAX_REQUESTS_ENV = "MCP_MULTISKILL_WORKER_MAX_REQUESTS"
+WORKER_SCRIPT = Path(__file__).resolve().with_name("_skill_worker.py")
+
+DEFAULT_IDLE_SECONDS = 300.0
+DEFAULT_MAX_REQUESTS = 100
+# 等待 worker 输出或空闲 worker 时，隔多久检查一次取消与超时
+POLL_SECONDS = 0.1
+READ_BYTES = 64 * 1024
+
+WorkerLauncher = Callable[[Path], "tuple[list[str], dict[str, str]]"]
+# 在执行 worker 的线程里按到达顺序收到 (stream, chunk)
+ChunkCallback = Callable[[str, bytes], None]
+
+
+class WorkerCrashed(RuntimeError):
+	pass
+
+
+class WorkerTimeout(WorkerCrashed):
+	pass
+
+
+class WorkerCancelled(WorkerCrashed):
+	pass
+
+
+class WorkerLost(WorkerCrashed):
+	"""The worker died after it took the request, so the script may have partly run."""
+
+	def __init__(self, message: str, stdout: str = "", stderr: str = "") -> None:
+		super().__init__(message)
+		self.stdout = stdout
+		self.stderr = stderr
+
+
+def default_worker_command(skill_dir: Path) -> tuple[list[str], dict[str, str]]:
+	return build_command(resolve_for_launch(skill_dir), skill_dir, WORKER_SCRIPT)
+
+
+class SkillWorker:
+	def __init__(self, skill_dir: Path, launcher: WorkerLauncher) -> None:
+		command, env = launcher(skill_dir)
+		self.skill_dir = skill_dir
+		self.requests = 0
+		self.last_used = time.monotonic()
+		self.process = subprocess.Popen(
+			command,
+			stdin=subprocess.PIPE,
+			stdout=subprocess.PIPE,
+			env=env,
+			start_new_session=True,
+		)
+		self._pending = bytearray()
+
+	@property
+	def alive(self) -> bool:
+		return self.process.poll() is None
+
+	def execute(
+		self,
+		script_path: Path,
+		argv: list[str],
+		stdin: str | None,
+		timeout: float | None = None,
+		cancel: threading.Event | None = None,
+		env: dict[str, str] | None = None,
+		on_output: ChunkCallback | None = None,
+	) -> dict[str, Any]:
+		"""Run one script; output goes to ``on_output`` as it arrives, or into the response if none is given."""
+		request = json.dumps({"script": str(script_path), "argv": argv, "stdin": stdin, "env": env or {}})
+		deadline = None if timeout is None else time.monotonic() + timeout
+		collected = {"stdout": bytearray(), "stderr": bytearray()} if on_output is None else None
+		try:
+			self.process.stdin.write(request.encode("utf-8") + b"\n")
+			self.process.stdin.flush()
+		except (OSError, ValueError) as exc:
+			raise WorkerCrashed(f"worker for {self.skill_dir.name} is gone: {exc}") from exc
+		try:
+			with selectors.DefaultSelector() as selector:
+				selector.register(self.process.stdout, selectors.EVENT_READ)
+				while True:
+					message = self._read_message(selector, deadline, timeout, cancel)
+					if "stream" not in message:
+						break
+					chunk = message["data"].encode("utf-8", errors="surrogateescape")
+					if collected is not None:
+						collected[message["stream"]] += chunk
+					else:
+						on_output(message["stream"], chunk)
+		except (WorkerTimeout, WorkerCancelled):
+			raise
+		except (WorkerCrashed, OSError, ValueError) as exc:
+			# 请求已交给 worker，脚本可能已部分执行，不能再冷启动重跑一次
+			output = {name: data.decode("utf-8", errors="replace") for name, data in (collected or {}).items()}
+			raise WorkerLost(
+				f"worker for {self.skill_dir.name} exited while running {script_path.name}: {exc}", **output
+			) from exc
+		self.requests += 1
+		self.last_used = time.monotonic()
+		if collected is not None:
+			for name, data in collected.items():
+				message[name] = data.decode("utf-8", errors="replace")
+		return message
+
+	def _read_message(
+		self,
+		selector: selectors.BaseSelector,
+		deadline: float | None,
+		timeout: float | None,
+		cancel: threading.Event | None,
+	) -> dict[str, Any]:
+		# 自己切行：一次读到的数据可能包含多条消息，不能只靠 select 判断是否还有
+		while b"\n" not in self._pending:
+			if deadline is not None or cancel is not None:
+				self._wait_readable(selector, deadline, timeout, cancel)
+			data = os.read(self.process.stdout.fileno(), READ_BYTES)
+			if not data:
+				raise WorkerCrashed(f"worker for {self.skill_dir.name} exited with {self.process.poll()}")
+			self._pending += data
+		end = self._pending.index(b"\n")
+		line = bytes(self._pending[:end])
+		del self._pending[: end + 1]
+		try:
+			return json.loads(line)
+		except ValueError as exc:
+			raise WorkerCrashed(f"worker for {self.skill_dir.name} sent an invalid response") from exc
+
+	def _wait_readable(
+		self,
+		selector: selectors.BaseSelector,
+		deadline: float | None,
+		timeout: float | None,
+		cancel: threading.Event | None,
+	) -> None:
+		while True:
+			remaining = None if deadline is None else deadline - time.monotonic()
+			if remaining is not None and remaining <= 0:
+				self.kill()
+				raise WorkerTimeout(f"script in {self.skill_dir.name} timed out after {timeout}s")
+			if cancel is not None and cancel.is_set():
+				self.kill()
+				raise WorkerCancelled(f"execution in {self.skill_dir.name} was cancelled")
+			step = POLL_SECONDS if remaining is None else min(remaining, POLL_SECONDS)
+			if selector.select(step):
+				return
+
+	def kill(self) -> None:
+		try:
+			os.killpg(self.process.pid, signal.SIGKILL)
+		except (ProcessLookupError, PermissionError, AttributeError):
+			self.process.kill()
+
+	def close(self, timeout: float = 2.0) -> None:
+		try:
+			self.process.stdin.close()
+		except OSError:
+			pass
+		try:
+			self.process.wait(timeout=timeout)
+		except subprocess.TimeoutExpired:
+			self.process.kill()
+			self.process.wait()
+		if self.process.stdout is not None:
+			self.process.stdout.close()
+
+
+class WorkerPool:
+	"""Up to ``size`` warm interpreters per skill dir, handed out one request at a time.
+
+	``execute`` returns ``None`` when no worker could take the request (spawn
+	failure, a dead worker, cancellation); callers then fall back to a cold
+	subprocess. A worker that dies while running the script yields a failed
+	result (``returncode`` -1 and ``worker_error``) instead, so the script is
+	never run twice.
+	"""
+
+	def __init__(
+		self,
+		size: int,
+		idle_timeout: float = DEFAULT_IDLE_SECONDS,
+		max_requests: int = DEFAULT_MAX_REQUESTS,
+		launcher: WorkerLauncher = default_worker_command,
+	) -> None:
+		self.size = max(1, size)
+		self.idle_timeout = idle_timeout
+		self.max_requests = max(1, max_requests)
+		self.launcher = launcher
+		self._cond = threading.Condition()
+		self._idle: dict[Path, list[SkillWorker]] = {}
+		self._live: dict[Path, int] = {}
+		self._closed = False
+		self._reaper: threading.Thread | None = None
+		self._stop = threading.Event()
+		self.spawned = 0
+		self.recycled = 0
+		self.evicted = 0
+		self.crashed = 0
+
+	def execute(
+		self,
+		skill_dir: Path,
+		script_path: Path,
+		argv: list[str],
+		stdin: str | None = None,
+		timeout: float | None = None,
+		cancel: threading.Event | None = None,
+		env: dict[str, str] | None = None,
+		on_output: ChunkCallback | None = None,
+	) -> dict[str, Any] | None:
+		# 等待空闲 worker 的时间也算在 timeout 内
+		deadline = None if timeout is None else time.monotonic() + timeout
+		try:
+			worker = self._acquire(skill_dir, deadline, cancel)
+		except WorkerTimeout:
+			return {"returncode": -signal.SIGKILL, "stdout": "", "stderr": "", "timed_out": True}
+		if worker is None:
+			return None
+		remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+		try:
+			result = worker.execute(script_path, argv, stdin, timeout=remaining, cancel=cancel, env=env, on_output=on_output)
+		except WorkerTimeout:
+			self._retire(worker)
+			return {"returncode": -signal.SIGKILL, "stdout": "", "stderr": "", "timed_out": True}
+		except WorkerCancelled:
+			self._retire(worker)
+			return None
+		except WorkerLost as exc:
+			with self._cond:
+				self.crashed += 1
+			self._retire(worker)
+			return {"returncode": -1, "stdout": exc.stdout, "stderr": exc.stderr, "worker_error": str(exc)}
+		except WorkerCrashed:
+			# 请求还没送达：调用方可以放心回退到冷启动
+			with self._cond:
+				self.crashed += 1
+			self._retire(worker)
+			return None
+		self._release(worker)
+		return result
+
+	def _acquire(
+		self,
+		skill_dir: Path,
+		deadline: float | None = None,
+		cancel: threading.Event | None = None,
+	) -> SkillWorker | None:
+		"""An idle or newly spawned worker; ``None`` when closed, cancelled or unable to spawn.
+
+		Raises ``WorkerTimeout`` when ``deadline`` passes while every worker is busy.
+		"""
+		dead: list[SkillWorker] = []
+		worker: SkillWorker | None = None
+		spawn = False
+		timed_out = False
+		with self._cond:
+			while worker is None and not spawn and not self._closed:
+				idle = self._idle.get(skill_dir, [])
+				while idle and worker is None:
+					candidate = idle.pop()
+					if candidate.alive:
+						worker = candidate
+					else:
+						self._live[skill_dir] -= 1
+						self.crashed += 1
+						dead.append(candidate)
+				if worker is None:
+					if self._live.get(skill_dir, 0) < self.size:
+						self._live[skill_dir] = self._live.get(skill_dir, 0) + 1
+						spawn = True
+					elif cancel is not None and cancel.is_set():
+						break
+					else:
+						# 在线程里等待：按间隔醒来检查取消与超时，调用方取消后不会一直占着线程
+						remaining = None if deadline is None else deadline - time.monotonic()
+						if remaining is not None and remaining <= 0:
+							timed_out = True
+							break
+						self._cond.wait(POLL_SECONDS if remaining is None else min(remaining, POLL_SECONDS))
+		for candidate in dead:
+			candidate.close(timeout=0)
+		if timed_out:
+			raise WorkerTimeout(f"no idle worker for {skill_dir.name} before the timeout")
+		if not spawn:
+			return worker
+
+		try:
+			worker = SkillWorker(skill_dir, self.launcher)
+		except BaseException as exc:
+			with self._cond:
+				self._live[skill_dir] -= 1
+				self._cond.notify()
+			if isinstance(exc, OSError):
+				return None
+			raise
+		with self._cond:
+			self.spawned += 1
+		self._ensure_reaper()
+		return worker
+
+	def _release(self, worker: SkillWorker) -> None:
+		if worker.requests >= self.max_requests or not worker.alive:
+			with self._cond:
+				self.recycled += 1
+			self._retire(worker)
+			return
+		with self._cond:
+			if self._closed:
+				retire = True
+			else:
+				retire = False
+				self._idle.setdefault(worker.skill_dir, []).append(worker)
+				self._cond.notify()
+		if retire:
+			self._retire(worker)
+
+	def _retire(self, worker: SkillWorker) -> None:
+		with self._cond:
+			self._live[worker.skill_dir] -= 1
+			self._cond.notify()
+		worker.close()
+
+	def evict_idle(self, now: float | None = None) -> int:
+		now = time.monotonic() if now is None else now
+		expired: list[SkillWorker] = []
+		with self._cond:
+			for workers in self._idle.values():
+				keep = [worker for worker in workers if now - worker.last_used < self.idle_timeout]
+				expired.extend(worker for worker in workers if worker not in keep)
+				workers[:] = keep
+			self.evicted += len(expired)
+		for worker in expired:
+			self._retire(worker)
+		return len(expired)
+
+	def _ensure_reaper(self) -> None:
+		with self._cond:
+			if self._reaper is not None or self.idle_timeout <= 0:
+				return
+			self._reaper = threading.Thread(target=self._reap_loop, name="skill-worker-reaper", daemon=True)
+			self._reaper.start()
+
+	def _reap_loop(self) -> None:
+		interval = min(max(self.idle_timeout / 4, 0.5), 30.0)
+		while not self._stop.wait(interval):
+			self.evict_idle()
+
+	def shutdown(self) -> None:
+		with self._cond:
+			self._closed = True
+			workers = [worker for idle in self._idle.values() for worker in idle]
+			self._idle.clear()
+			self._cond.notify_all()
+		self._stop.set()
+		for worker in workers:
+			self._retire(worker)
+
+	def stats(self) -> dict[str, Any]:
+		with self._cond:
+			return {
+				"size": self.size,
+				"live": {path.name: count for path, count in self._live.items() if count},
+				"idle": sum(len(workers) for workers in self._idle.values()),
+				"spawned": self.spawned,
+				"recycled": self.recycled,
+				"evicted": self.evicted,
+				"crashed": self.crashed,
+			}
+
+
+_pool: WorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool | None:
+	"""The process-wide pool, or ``None`` unless ``MCP_MULTISKILL_WORKERS`` > 0."""
+	global _pool
+	size = env_int(WORKERS_ENV, 0)
+	if size <= 0:
+		return None
+	with _pool_lock:
+		if _pool is None:
+			_pool = WorkerPool(
+				size,
+				idle_timeout=env_float(WORKER_IDLE_ENV, DEFAULT_IDLE_SECONDS),
+				max_requests=env_int(WORKER_MAX_REQUESTS_ENV, DEFAULT_MAX_REQUESTS),
+			)
+			atexit.register(_pool.shutdown)
+		return _pool
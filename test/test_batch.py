@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ConcurrencyLimiter, ProcessResult
+
+
+async def fake_run_process(command, **kwargs):
+    # argv: [delay, returncode]
+    delay, returncode = float(command[-2]), int(command[-1])
+    await asyncio.sleep(delay)
+    return ProcessResult(returncode=returncode, stdout=f"slept {delay}", stderr="")
+
+
+class TestRunSkillBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        skill_dir = self.root / "demo"
+        skill_dir.mkdir()
+        (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
+        (skill_dir / "main.py").write_text("", encoding="utf-8")
+
+    def _item(self, delay: float, returncode: int = 0) -> dict:
+        return {"skill_name": "demo", "script_name": "main", "argv": [str(delay), str(returncode)]}
+
+    def _run(self, items, **kwargs):
+        with patch("mcp_multiskill.load_skill.run_process", side_effect=fake_run_process):
+            return asyncio.run(load_skill.run_skill_batch(items, skills_root=self.root, **kwargs))
+
+    def test_results_keep_order_and_report_status(self) -> None:
+        items = [
+            self._item(0.2),
+            self._item(0.0, returncode=3),
+            {"skill_name": "missing", "script_name": "main"},
+            {"skill_name": "demo"},
+            self._item(0.1),
+        ]
+
+        batch = self._run(items, max_parallel=4)
+
+        statuses = [result["status"] for result in batch["results"]]
+        self.assertEqual(statuses, ["ok", "failed", "error", "error", "ok"])
+        self.assertEqual([result["index"] for result in batch["results"]], [0, 1, 2, 3, 4])
+        self.assertEqual(batch["results"][0]["stdout"], "slept 0.2")
+        self.assertIn("Skill not found", batch["results"][2]["error"])
+        self.assertEqual(batch["summary"], {"total": 5, "ok": 2, "failed": 1, "error": 2})
+
+    def test_bad_timeout_and_unexpected_errors_are_reported_per_item(self) -> None:
+        items = [
+            {**self._item(0.0), "timeout": "5"},
+            {**self._item(0.0), "timeout": True},
+            {**self._item(0.0), "timeout": 5},
+            self._item(0.0),
+        ]
+        calls = []
+
+        async def flaky_run_process(command, **kwargs):
+            calls.append(command)
+            if len(calls) == 2:
+                raise KeyError("boom")
+            return await fake_run_process(command, **kwargs)
+
+        with patch("mcp_multiskill.load_skill.run_process", side_effect=flaky_run_process):
+            batch = asyncio.run(load_skill.run_skill_batch(items, skills_root=self.root, max_parallel=1))
+
+        statuses = [result["status"] for result in batch["results"]]
+        self.assertEqual(statuses, ["error", "error", "ok", "error"])
+        self.assertIn("timeout must be a number", batch["results"][0]["error"])
+        self.assertIn("boom", batch["results"][3]["error"])
+
+    def test_runs_items_in_parallel(self) -> None:
+        items = [self._item(0.3) for _ in range(6)]
+
+        with patch("mcp_multiskill.load_skill.limiter", ConcurrencyLimiter(global_limit=6)):
+            begin = time.monotonic()
+            batch = self._run(items, max_parallel=6)
+            elapsed = time.monotonic() - begin
+
+        self.assertEqual(batch["summary"]["ok"], 6)
+        self.assertLess(elapsed, 1.2)
+
+    def test_fail_fast_cancels_running_and_skips_queued(self) -> None:
+        items = [self._item(0.0, returncode=1), self._item(5.0), self._item(0.0), self._item(0.0)]
+
+        batch = self._run(items, max_parallel=2, fail_fast=True)
+
+        statuses = [result["status"] for result in batch["results"]]
+        self.assertEqual(statuses, ["failed", "cancelled", "skipped", "skipped"])
+
+
+if __name__ == "__main__":
+    unittest.main()
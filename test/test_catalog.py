@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.catalog import RootConfig, SkillCatalog, parse_roots
+
+
+class TestParseRoots(unittest.TestCase):
+    def test_plain_paths_and_json_with_policies(self) -> None:
+        self.assertEqual(parse_roots("/a:/b"), [RootConfig(Path("/a")), RootConfig(Path("/b"))])
+        roots = parse_roots(json.dumps([{"path": "/local", "watch": True}, {"path": "/mnt/team", "poll_seconds": 600, "snapshot": True}]))
+        self.assertEqual(roots, [
+            RootConfig(Path("/local"), watch=True),
+            RootConfig(Path("/mnt/team"), poll_seconds=600.0, snapshot=True),
+        ])
+        with self.assertRaisesRegex(ValueError, "Invalid skill root"):
+            parse_roots('[{"poll_seconds": 1}]')
+
+
+class TestSkillCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        tmp = Path(self._tmp.name)
+        self.local = tmp / "local"
+        self.team = tmp / "team"
+        self.snapshot = tmp / "catalog.json"
+        self._make_skill(self.local, "shared", "Local override.")
+        self._make_skill(self.team, "shared", "Team version.")
+        self._make_skill(self.team, "report", "Team report.")
+
+    def _make_skill(self, root: Path, name: str, description: str) -> None:
+        skill_dir = root / name
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(f"{description}\n", encoding="utf-8")
+        (skill_dir / "main.py").write_text("", encoding="utf-8")
+
+    def _catalog(self, loader=load_skill.load_skill_entry) -> SkillCatalog:
+        roots = [
+            RootConfig(self.local, poll_seconds=3600, watch=False),
+            RootConfig(self.team, poll_seconds=3600, watch=False, snapshot=True),
+        ]
+        catalog = SkillCatalog(roots, loader, snapshot_file=self.snapshot)
+        self.addCleanup(catalog.close)
+        return catalog
+
+    def test_earlier_roots_shadow_later_ones(self) -> None:
+        catalog = self._catalog()
+
+        self.assertEqual([(entry.name, entry.description) for entry in catalog.entries()], [
+            ("report", "Team report."),
+            ("shared", "Local override."),
+        ])
+        self.assertEqual(catalog.get("shared").path, self.local / "shared")
+        self.assertEqual(catalog.stats()["shadowed"], {"shared": [str(self.team / "shared")]})
+
+        (self.local / "shared" / "SKILL.md").unlink()
+        catalog.invalidate("shared")
+
+        self.assertEqual(catalog.get("shared").description, "Team version.")
+        self.assertEqual(catalog.stats()["shadowed"], {})
+
+    def test_lookup_misses_do_not_invalidate_the_merge(self) -> None:
+        catalog = self._catalog()
+        generation = catalog.generation()
+
+        self.assertIsNone(catalog.get("missing"))
+        self.assertEqual(catalog.get("report").description, "Team report.")
+
+        self.assertEqual(catalog.generation(), generation)
+
+    def test_snapshot_roots_start_without_scanning(self) -> None:
+        self._catalog().entries()
+        self.assertTrue(self.snapshot.exists())
+
+        def loader(skill_dir: Path):
+            if skill_dir.parent == self.team:
+                raise AssertionError(f"team root was read: {skill_dir}")
+            return load_skill.load_skill_entry(skill_dir)
+
+        catalog = self._catalog(loader)
+
+        self.assertEqual([entry.name for entry in catalog.entries()], ["report", "shared"])
+        self.assertEqual(catalog.get("report").scripts, [self.team / "report" / "main.py"])
+        stats = catalog.stats()
+        self.assertEqual(stats["snapshot_loads"], 1)
+        self.assertEqual([root["scans"] for root in stats["roots"]], [1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from mcp_multiskill.clients import FairScheduler, ShuttingDown, client_key
+
+
+async def hold(scheduler: FairScheduler, client: str, order: list[str], release: asyncio.Event) -> None:
+    async with scheduler.slot(client):
+        order.append(client)
+        await release.wait()
+
+
+class TestFairScheduler(unittest.TestCase):
+    def test_slots_rotate_between_waiting_clients(self) -> None:
+        async def scenario() -> list[str]:
+            scheduler = FairScheduler(capacity=1)
+            order: list[str] = []
+            release = asyncio.Event()
+            # heavy 先排队 4 个调用，light 后到的 2 个仍应与其交替执行
+            tasks = [asyncio.ensure_future(hold(scheduler, "heavy", order, release)) for _ in range(4)]
+            await asyncio.sleep(0)
+            tasks += [asyncio.ensure_future(hold(scheduler, "light", order, release)) for _ in range(2)]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*tasks)
+            return order
+
+        order = asyncio.run(scenario())
+
+        self.assertEqual(order, ["heavy", "light", "heavy", "light", "heavy", "heavy"])
+
+    def test_client_limit_leaves_room_for_others(self) -> None:
+        async def scenario() -> tuple[list[str], dict]:
+            scheduler = FairScheduler(capacity=4, client_limit=2)
+            order: list[str] = []
+            release = asyncio.Event()
+            tasks = [asyncio.ensure_future(hold(scheduler, "heavy", order, release)) for _ in range(4)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.ensure_future(hold(scheduler, "light", order, release)))
+            await asyncio.sleep(0.01)
+            stats = scheduler.stats()
+            release.set()
+            await asyncio.gather(*tasks)
+            return order, stats
+
+        order, stats = asyncio.run(scenario())
+
+        self.assertEqual(order[:3], ["heavy", "heavy", "light"])
+        self.assertEqual((stats["running"], stats["waiting"], stats["clients"]), (3, 2, 2))
+
+    def test_cancelled_waiter_gives_up_its_place(self) -> None:
+        async def scenario() -> dict:
+            scheduler = FairScheduler(capacity=1)
+            order: list[str] = []
+            release = asyncio.Event()
+            first = asyncio.ensure_future(hold(scheduler, "a", order, release))
+            waiter = asyncio.ensure_future(hold(scheduler, "b", order, release))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            release.set()
+            await first
+            self.assertTrue(await scheduler.wait_idle(1))
+            return scheduler.stats()
+
+        stats = asyncio.run(scenario())
+
+        self.assertEqual((stats["running"], stats["waiting"], stats["granted"]), (0, 0, 1))
+
+    def test_drain_rejects_new_calls_and_waits_for_running(self) -> None:
+        async def scenario() -> tuple[bool, bool, bool]:
+            scheduler = FairScheduler(capacity=2)
+            order: list[str] = []
+            release = asyncio.Event()
+            running = asyncio.ensure_future(hold(scheduler, "a", order, release))
+            await asyncio.sleep(0)
+            scheduler.begin_drain()
+            with self.assertRaises(ShuttingDown):
+                async with scheduler.slot("b"):
+                    pass
+            timed_out = await scheduler.wait_idle(0.01)
+            asyncio.get_running_loop().call_later(0.01, release.set)
+            idle = await scheduler.wait_idle(1)
+            return timed_out, idle, running.done()
+
+        self.assertEqual(asyncio.run(scenario()), (False, True, True))
+
+    def test_client_key_prefers_http_session_id(self) -> None:
+        class Request:
+            headers = {"mcp-session-id": "abc"}
+
+        class RequestContext:
+            request = Request()
+            session = object()
+
+        class Context:
+            request_context = RequestContext()
+
+        self.assertEqual(client_key(Context()), "abc")
+        Context.request_context.request = None
+        self.assertTrue(client_key(Context()).startswith("session-"))
+        self.assertEqual(client_key(None), "local")
+
+
+CLIENT_SCRIPT = """
+import asyncio, json, os, signal, sys
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+async def main(url, pid, marker):
+    report = {}
+    try:
+        async with streamablehttp_client(url) as (read, write, _session_id):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                # call_tool 首次收到结果时会再请求 tools/list，须在服务端关闭前缓存
+                await session.list_tools()
+                call = {"skill_name": "slow", "script_name": "main", "argv": ["1.0", marker]}
+                running = asyncio.ensure_future(session.call_tool("run_skill", call))
+                while not os.path.exists(marker):
+                    await asyncio.sleep(0.05)
+                os.kill(pid, signal.SIGTERM)
+                await asyncio.sleep(0.1)
+                late = await session.call_tool("run_skill", call)
+                result = await running
+                report = {"result": json.loads(result.content[0].text), "late_error": late.isError}
+    except BaseException:
+        # 服务端排空后即关闭，客户端退出时结束会话的请求可能被拒绝
+        if not report:
+            raise
+    print(json.dumps(report))
+
+asyncio.run(main(sys.argv[1], int(sys.argv[2]), sys.argv[3]))
+"""
+
+SLOW_SCRIPT = """
+import argparse
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("seconds", type=float)
+parser.add_argument("marker", nargs="?")
+args = parser.parse_args()
+if args.marker:
+    open(args.marker, "w").close()
+time.sleep(args.seconds)
+print("done")
+"""
+
+
+class TestHttpDrain(unittest.TestCase):
+    def setUp(self) -> None:
+        # 其他测试会往 sys.modules 塞入假的 mcp，服务端与客户端都在子进程里运行
+        if subprocess.run([sys.executable, "-c", "import mcp, uvicorn"], capture_output=True).returncode != 0:
+            self.skipTest("mcp is not installed")
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = Path(self._tmp.name)
+
+    def _environment(self) -> dict[str, str]:
+        skill = self.tmp / "skills" / "slow"
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text("Sleeps.\n", encoding="utf-8")
+        (skill / "pyproject.toml").write_text('[project]\nname = "slow"\nversion = "0.1.0"\n', encoding="utf-8")
+        (skill / "main.py").write_text(SLOW_SCRIPT, encoding="utf-8")
+        bin_dir = self.tmp / "bin"
+        bin_dir.mkdir()
+        uv = bin_dir / "uv"
+        # uv 替身：丢掉 run --project <dir> python，直接执行脚本
+        uv.write_text(textwrap.dedent(f"""\
+            #!/bin/sh
+            shift 3
+            [ "$1" = python ] && shift
+            exec {sys.executable} "$@"
+        """), encoding="utf-8")
+        uv.chmod(0o755)
+        env = os.environ.copy()
+        env.update({
+            "PATH": os.pathsep.join([str(bin_dir), env.get("PATH", "")]),
+            "PYTHONPATH": str(SRC),
+            "MCP_MULTISKILL_SKILL_ROOTS": str(self.tmp / "skills"),
+            "MCP_MULTISKILL_CACHE_DIR": str(self.tmp / "cache"),
+            "MCP_MULTISKILL_SCRATCH_DIR": str(self.tmp / "scratch"),
+            "MCP_MULTISKILL_PREWARM": "0",
+            "MCP_MULTISKILL_VALIDATE_ARGV": "0",
+        })
+        return env
+
+    def test_sigterm_finishes_running_calls_and_rejects_new_ones(self) -> None:
+        env = self._environment()
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = subprocess.Popen(
+            [sys.executable, "-m", "mcp_multiskill", "serve", "--transport", "streamable-http", "--port", str(port)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.addCleanup(lambda: server.poll() is None and server.kill())
+        deadline = time.monotonic() + 30
+        while True:
+            with socket.socket() as probe:
+                if probe.connect_ex(("127.0.0.1", port)) == 0:
+                    break
+            self.assertIsNone(server.poll())
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.1)
+
+        client = subprocess.run(
+            [sys.executable, "-c", CLIENT_SCRIPT, f"http://127.0.0.1:{port}/mcp", str(server.pid), str(self.tmp / "started")],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=60,
+        )
+        self.assertEqual(client.returncode, 0, client.stderr)
+        report = json.loads(client.stdout)
+        server.wait(timeout=30)
+
+        self.assertEqual(report["result"]["returncode"], 0)
+        self.assertEqual(report["result"]["stdout"].strip(), "done")
+        self.assertTrue(report["late_error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
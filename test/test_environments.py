@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import environments
+from mcp_multiskill.environments import EnvironmentRegistry, EnvironmentSyncError, lock_signature, sync_environments
+
+
+def fake_uv_sync(command, **_kwargs):
+    skill_dir = Path(command[command.index("--project") + 1])
+    python = environments.venv_python(skill_dir / ".venv")
+    python.parent.mkdir(parents=True, exist_ok=True)
+    python.write_text("", encoding="utf-8")
+    return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+
+class TestEnvironmentRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.skill_dir = Path(self._tmp.name) / "demo"
+        self.skill_dir.mkdir()
+        (self.skill_dir / "pyproject.toml").write_text("[project]\nname='demo'", encoding="utf-8")
+        (self.skill_dir / "uv.lock").write_text("version = 1", encoding="utf-8")
+        self.registry = EnvironmentRegistry()
+
+    @patch("mcp_multiskill.environments.subprocess.run", side_effect=fake_uv_sync)
+    def test_resolve_syncs_once_and_records_interpreter(self, mock_run) -> None:
+        first = self.registry.resolve(self.skill_dir)
+        second = self.registry.resolve(self.skill_dir)
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(mock_run.call_args.args[0][:2], ["uv", "sync"])
+        self.assertEqual(first.python, environments.venv_python(self.skill_dir / ".venv"))
+        self.assertEqual(first.env["VIRTUAL_ENV"], str(self.skill_dir / ".venv"))
+        self.assertTrue(first.env["PATH"].startswith(str(first.python.parent)))
+
+    @patch("mcp_multiskill.environments.subprocess.run", side_effect=fake_uv_sync)
+    def test_lockfile_change_triggers_resync(self, mock_run) -> None:
+        self.registry.resolve(self.skill_dir)
+        (self.skill_dir / "uv.lock").write_text("version = 22", encoding="utf-8")
+
+        self.assertIsNone(self.registry.cached(self.skill_dir))
+        self.registry.resolve(self.skill_dir)
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("mcp_multiskill.environments.subprocess.run")
+    def test_sync_failure_raises(self, mock_run) -> None:
+        mock_run.return_value = SimpleNamespace(returncode=1, stdout="", stderr="no solution")
+
+        with self.assertRaisesRegex(EnvironmentSyncError, "no solution"):
+            self.registry.resolve(self.skill_dir)
+        self.assertEqual(self.registry.stats()["sync_failures"], 1)
+
+
+class TestScriptCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.skill_dir = Path(self._tmp.name) / "demo"
+        self.skill_dir.mkdir()
+        self.script = self.skill_dir / "main.py"
+        registry = patch.object(environments, "environment_registry", EnvironmentRegistry())
+        registry.start()
+        self.addCleanup(registry.stop)
+
+    @patch.dict(os.environ, {"MCP_MULTISKILL_ENV_MODE": "uv", "VIRTUAL_ENV": "/server/venv"})
+    def test_uv_mode_uses_uv_run(self) -> None:
+        command, env = asyncio.run(environments.script_command(self.skill_dir, self.script, ["--a", "1"]))
+
+        self.assertEqual(command, ["uv", "run", "--project", str(self.skill_dir), "python", str(self.script), "--a", "1"])
+        self.assertNotIn("VIRTUAL_ENV", env)
+
+    @patch.dict(os.environ, {"MCP_MULTISKILL_ENV_MODE": "direct"})
+    @patch("mcp_multiskill.environments.subprocess.run", side_effect=fake_uv_sync)
+    def test_direct_mode_execs_venv_python(self, _mock_run) -> None:
+        command, env = asyncio.run(environments.script_command(self.skill_dir, self.script, ["--a", "1"]))
+
+        self.assertEqual(command[0], str(environments.venv_python(self.skill_dir / ".venv")))
+        self.assertEqual(command[1:], [str(self.script), "--a", "1"])
+        self.assertEqual(env["VIRTUAL_ENV"], str(self.skill_dir / ".venv"))
+
+    @patch.dict(os.environ, {"MCP_MULTISKILL_ENV_MODE": "uv"})
+    @patch("mcp_multiskill.environments.subprocess.run", side_effect=fake_uv_sync)
+    def test_direct_launch_can_be_forced_in_uv_mode(self, _mock_run) -> None:
+        command, _env = asyncio.run(environments.script_command(self.skill_dir, self.script, direct=True))
+
+        self.assertEqual(command, [str(environments.venv_python(self.skill_dir / ".venv")), str(self.script)])
+
+    @patch.dict(os.environ, {"MCP_MULTISKILL_ENV_MODE": "direct"})
+    @patch("mcp_multiskill.environments.subprocess.run", side_effect=FileNotFoundError("uv"))
+    def test_direct_mode_falls_back_to_uv_run_when_sync_fails(self, _mock_run) -> None:
+        command, _env = asyncio.run(environments.script_command(self.skill_dir, self.script))
+
+        self.assertEqual(command[:2], ["uv", "run"])
+
+
+LOCK = """version = 1
+
+[[package]]
+name = "{name}"
+version = "0.1.0"
+source = {{ virtual = "." }}
+
+[[package]]
+name = "argparse-to-json"
+version = "{version}"
+source = {{ registry = "https://pypi.org/simple" }}
+"""
+
+
+class TestSyncEnvironments(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.dirs = [self._make_skill(name, version) for name, version in (("a", "1"), ("b", "1"), ("c", "2"), ("d", "1"))]
+
+    def _make_skill(self, name: str, version: str) -> Path:
+        skill_dir = self.root / name
+        skill_dir.mkdir()
+        (skill_dir / "pyproject.toml").write_text(f"[project]\nname='{name}'", encoding="utf-8")
+        (skill_dir / "uv.lock").write_text(LOCK.format(name=name, version=version), encoding="utf-8")
+        return skill_dir
+
+    def test_lock_signature_ignores_the_skill_project(self) -> None:
+        self.assertEqual(lock_signature(self.dirs[0]), lock_signature(self.dirs[1]))
+        self.assertNotEqual(lock_signature(self.dirs[0]), lock_signature(self.dirs[2]))
+        self.assertIsNone(lock_signature(self.root))
+
+    def test_syncs_one_skill_per_lockfile_before_the_rest(self) -> None:
+        order = []
+
+        def fake_run(command, **kwargs):
+            skill_dir = Path(command[command.index("--project") + 1])
+            order.append(skill_dir.name)
+            if skill_dir.name == "c":
+                raise ValueError("bad project path")
+            if skill_dir.name == "d":
+                return SimpleNamespace(returncode=1, stdout="", stderr="no solution")
+            return fake_uv_sync(command)
+
+        registry = EnvironmentRegistry()
+        reported = []
+        with patch("mcp_multiskill.environments.subprocess.run", side_effect=fake_run):
+            results = sync_environments(self.dirs, workers=1, registry=registry, on_result=reported.append)
+
+        self.assertEqual(order, ["a", "c", "b", "d"])
+        self.assertEqual([result.skill for result in results], ["a", "b", "c", "d"])
+        self.assertEqual([result.ok for result in results], [True, True, False, False])
+        self.assertEqual(results[2].error, "bad project path")
+        self.assertIn("no solution", results[3].error)
+        self.assertEqual(results[0].group, results[1].group)
+        self.assertEqual(len(reported), 4)
+        self.assertIsNotNone(registry.cached(self.dirs[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
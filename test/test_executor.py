@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill.executor import ConcurrencyLimiter, run_process
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+class TestRunProcess(unittest.TestCase):
+    def test_captures_output_and_stdin(self) -> None:
+        code = "import sys; data = sys.stdin.read(); print(data.upper()); print('err', file=sys.stderr); sys.exit(4)"
+
+        result = asyncio.run(run_process(_python(code), stdin="hello"))
+
+        self.assertEqual(result.returncode, 4)
+        self.assertEqual(result.stdout, "HELLO\n")
+        self.assertEqual(result.stderr, "err\n")
+        self.assertFalse(result.timed_out)
+
+    def test_stdin_defaults_to_devnull(self) -> None:
+        result = asyncio.run(run_process(_python("import sys; print(repr(sys.stdin.read()))")))
+
+        self.assertEqual(result.stdout, "''\n")
+
+    def test_reports_child_resource_usage(self) -> None:
+        code = "data = bytearray(64 * 1024 * 1024); sum(range(2_000_000)); print(len(data))"
+
+        result = asyncio.run(run_process(_python(code)))
+
+        self.assertEqual(result.returncode, 0)
+        self.assertGreater(result.max_rss_bytes, 64 * 1024 * 1024)
+        self.assertGreater(result.cpu_seconds, 0)
+        self.assertGreaterEqual(result.wall_seconds, result.spawn_seconds)
+        self.assertEqual(result.output_bytes, len("67108864\n"))
+
+    def test_signal_exit_is_negative_returncode(self) -> None:
+        result = asyncio.run(run_process(_python("import os, signal; os.kill(os.getpid(), signal.SIGTERM)")))
+
+        self.assertEqual(result.returncode, -15)
+
+    def test_timeout_kills_whole_process_tree(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pid_file = Path(tmp) / "child.pid"
+            code = (
+                "import subprocess, sys, time\n"
+                "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+                f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+                "print('started', flush=True)\n"
+                "time.sleep(30)\n"
+            )
+
+            started = time.monotonic()
+            result = asyncio.run(run_process(_python(code), timeout=1.0))
+
+            self.assertTrue(result.timed_out)
+            self.assertLess(time.monotonic() - started, 10)
+            self.assertEqual(result.stdout, "started\n")
+            child_pid = int(pid_file.read_text())
+            deadline = time.monotonic() + 5
+            while _pid_alive(child_pid) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertFalse(_pid_alive(child_pid))
+
+    def test_cancellation_kills_process(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pid_file = Path(tmp) / "self.pid"
+            code = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+
+            async def scenario() -> None:
+                task = asyncio.ensure_future(run_process(_python(code)))
+                while not pid_file.exists() or not pid_file.read_text():
+                    await asyncio.sleep(0.02)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                await asyncio.sleep(0.2)
+
+            asyncio.run(scenario())
+
+            pid = int(pid_file.read_text())
+            deadline = time.monotonic() + 5
+            while _pid_alive(pid) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertFalse(_pid_alive(pid))
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    def test_global_and_per_skill_limits(self) -> None:
+        limiter = ConcurrencyLimiter(global_limit=3, skill_limit=1)
+        running: dict[str, int] = {}
+        peaks = {"total": 0}
+
+        async def job(key: str) -> None:
+            async with limiter.slot(key):
+                running[key] = running.get(key, 0) + 1
+                self.assertEqual(running[key], 1)
+                peaks["total"] = max(peaks["total"], sum(running.values()))
+                await asyncio.sleep(0.01)
+                running[key] -= 1
+
+        async def scenario() -> None:
+            await asyncio.gather(*(job(f"skill{i % 5}") for i in range(20)))
+
+        asyncio.run(scenario())
+        asyncio.run(scenario())
+
+        self.assertEqual(peaks["total"], 3)
+
+    def test_parallel_processes_do_not_serialize(self) -> None:
+        limiter = ConcurrencyLimiter(global_limit=4, skill_limit=4)
+
+        async def one() -> None:
+            async with limiter.slot("demo"):
+                await run_process(_python("import time; time.sleep(0.5)"))
+
+        async def scenario() -> float:
+            started = time.monotonic()
+            await asyncio.gather(*(one() for _ in range(4)))
+            return time.monotonic() - started
+
+        self.assertLess(asyncio.run(scenario()), 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import run_process
+from mcp_multiskill.limits import ResourceLimits
+from mcp_multiskill.skill_config import SkillConfig
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+class TestResourceLimits(unittest.TestCase):
+    def test_parses_tool_table(self) -> None:
+        config = SkillConfig.from_table({"limits": {"timeout": 5, "memory_mb": 256, "max_processes": 8.0, "cpu_seconds": 0, "bogus": 1}})
+
+        self.assertEqual(config.limits, ResourceLimits(timeout=5, memory_mb=256, max_processes=8))
+        self.assertIsNone(SkillConfig.from_table({"limits": {}}).limits)
+        self.assertEqual(config.limits.cap_timeout(None), 5)
+        self.assertEqual(config.limits.cap_timeout(2), 2)
+        self.assertIsNone(config.limits.cap_output(None))
+
+    def test_cpu_limit_kills_busy_loop(self) -> None:
+        limits = ResourceLimits(cpu_seconds=1)
+
+        result = asyncio.run(run_process(_python("while True: pass"), timeout=30, limits=limits))
+
+        self.assertLess(result.returncode, 0)
+        self.assertFalse(result.timed_out)
+        self.assertEqual(limits.exceeded(result, policy_timeout=False), ["cpu_seconds"])
+
+    def test_memory_limit_fails_allocation(self) -> None:
+        limits = ResourceLimits(memory_mb=200)
+
+        result = asyncio.run(run_process(_python("data = bytearray(400 * 1024 * 1024)"), limits=limits))
+
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("MemoryError", result.stderr)
+        self.assertEqual(limits.exceeded(result, policy_timeout=False), ["memory_mb"])
+
+    def test_rlimits_are_computed_off_the_event_loop(self) -> None:
+        threads = []
+        original = ResourceLimits.preexec_fn
+
+        def record(limits):
+            threads.append(threading.current_thread())
+            return original(limits)
+
+        with patch.object(ResourceLimits, "preexec_fn", record):
+            result = asyncio.run(run_process(_python("pass"), limits=ResourceLimits(max_processes=50)))
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    def test_leftover_children_are_killed_with_the_group(self) -> None:
+        code = (
+            "import subprocess, sys\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'], stdout=subprocess.DEVNULL)\n"
+            "print(child.pid)\n"
+        )
+
+        started = time.monotonic()
+        result = asyncio.run(run_process(_python(code), limits=ResourceLimits(timeout=30)))
+
+        self.assertLess(time.monotonic() - started, 10)
+        pid = int(result.stdout)
+        deadline = time.monotonic() + 2
+        while _pid_alive(pid) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertFalse(_pid_alive(pid))
+
+
+class TestRunSkillLimits(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        skill_dir = self.root / "spin"
+        skill_dir.mkdir()
+        (skill_dir / "SKILL.md").write_text("Spins.", encoding="utf-8")
+        (skill_dir / "main.py").write_text("print('x' * 5000)\nwhile True:\n\tpass\n", encoding="utf-8")
+        (skill_dir / "pyproject.toml").write_text(
+            "[project]\nname = 'spin'\n\n[tool.mcp-multiskill.limits]\ntimeout = 0.5\nmax_output_bytes = 1000\n",
+            encoding="utf-8",
+        )
+
+    async def _direct_command(self, _skill_dir, script_path, argv=None, direct=False):
+        return [sys.executable, str(script_path), *(argv or [])], dict(os.environ)
+
+    def test_reports_hit_limits_with_usage(self) -> None:
+        with patch("mcp_multiskill.load_skill.script_command", side_effect=self._direct_command):
+            result = asyncio.run(load_skill.run_skill_script("spin", "main", skills_root=self.root, timeout=60))
+
+        self.assertTrue(result["timed_out"])
+        exceeded = result["limit_exceeded"]
+        self.assertEqual(exceeded["limits"], ["timeout", "max_output_bytes"])
+        self.assertEqual(exceeded["configured"], {"timeout": 0.5, "max_output_bytes": 1000})
+        self.assertGreater(exceeded["usage"]["cpu_seconds"], 0)
+        self.assertEqual(exceeded["usage"]["output_bytes"], 5001)
+        self.assertIn("max_output_bytes limit (1000) exceeded", result["stderr"])
+
+    def test_limited_skills_launch_the_interpreter_directly(self) -> None:
+        launches = []
+
+        async def record(skill_dir, script_path, argv=None, direct=False):
+            launches.append(direct)
+            return await self._direct_command(skill_dir, script_path, argv)
+
+        with patch("mcp_multiskill.load_skill.script_command", side_effect=record):
+            asyncio.run(load_skill.run_skill_script("spin", "main", skills_root=self.root, timeout=60))
+
+        self.assertEqual(launches, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,58 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import tempfile
+import textwrap
 import unittest
 from pathlib import Path
-from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import sys
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
 
 from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ProcessResult
+
+
+SIGNATURE_SCRIPT = textwrap.dedent(
+    """
+    import argparse
+    from mcp_multiskill.parser_to_schema import get_parser_json
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("-n", "--max-count", type=int, required=True)
+    parser.add_argument("--ratio", type=float)
+    parser.add_argument("--mode", choices=["fast", "slow"])
+    if get_parser_json(parser):
+        exit(0)
+    print(parser.parse_args())
+    """
+)
+SAMPLE_VALUES = {"str": "in.txt", "int": "3", "float": "0.5"}
+
+
+async def direct_command(_skill_dir, script_path, argv=None, direct=False):
+    return [sys.executable, str(script_path), *(argv or [])], dict(os.environ, PYTHONPATH=str(SRC))
+
+
+def argv_from_signature(signature: str) -> list[str]:
+    """Fill every argument of a rendered signature with a sample value."""
+    argv: list[str] = []
+    for token in signature.split()[1:]:
+        token = token.strip("[]").removesuffix("...")
+        name, _, kind = token.strip("<>").partition(":")
+        kind = kind or "str"
+        value = kind.strip("{}").split(",")[0] if kind.startswith("{") else SAMPLE_VALUES[kind]
+        if token.startswith("<"):
+            argv.append(value)
+        else:
+            argv.extend([name, value] if ":" in token else [name])
+    return argv
 
 
 class TestLoadSkill(unittest.TestCase):
@@ -74,33 +116,41 @@ class TestLoadSkill(unittest.TestCase):
 
             self.assertEqual([s.name for s in scripts], ["helper.py", "main.py"])
 
-    @patch("mcp_multiskill.load_skill.subprocess.run")
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
     def test_get_script_schema_parses_json_output(self, mock_run) -> None:
-        mock_run.return_value = SimpleNamespace(returncode=0, stdout='{"a": 1}', stderr="")
+        mock_run.return_value = ProcessResult(returncode=0, stdout='{"a": 1}', stderr="")
         skill_dir = Path("/tmp/skill")
         script_path = skill_dir / "main.py"
 
-        schema = load_skill._get_script_schema(script_path, skill_dir)
+        schema = asyncio.run(load_skill._get_script_schema(script_path, skill_dir))
 
         self.assertEqual(schema, {"a": 1})
         mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args.kwargs["env"]["PRINT_MCP_SCHEMA"], "1")
 
-    @patch("mcp_multiskill.load_skill.subprocess.run")
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
     def test_get_script_schema_returns_raw_text_when_not_json(self, mock_run) -> None:
-        mock_run.return_value = SimpleNamespace(returncode=0, stdout="not-json", stderr="")
+        mock_run.return_value = ProcessResult(returncode=0, stdout="not-json", stderr="")
 
-        schema = load_skill._get_script_schema(Path("/tmp/skill/main.py"), Path("/tmp/skill"))
+        schema = asyncio.run(load_skill._get_script_schema(Path("/tmp/skill/main.py"), Path("/tmp/skill")))
 
         self.assertEqual(schema, "not-json")
 
-    @patch("mcp_multiskill.load_skill.subprocess.run")
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
     def test_get_script_schema_raises_on_subprocess_error(self, mock_run) -> None:
-        mock_run.return_value = SimpleNamespace(returncode=1, stdout="", stderr="boom")
+        mock_run.return_value = ProcessResult(returncode=1, stdout="", stderr="boom")
 
         with self.assertRaisesRegex(RuntimeError, "Failed to extract parser schema"):
-            load_skill._get_script_schema(Path("/tmp/skill/main.py"), Path("/tmp/skill"))
+            asyncio.run(load_skill._get_script_schema(Path("/tmp/skill/main.py"), Path("/tmp/skill")))
 
-    @patch("mcp_multiskill.load_skill._get_script_schema", return_value={"type": "object"})
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_get_script_schema_raises_on_timeout(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=-9, stdout="", stderr="", timed_out=True)
+
+        with self.assertRaisesRegex(RuntimeError, "Timed out"):
+            asyncio.run(load_skill._get_script_schema(Path("/tmp/skill/main.py"), Path("/tmp/skill")))
+
+    @patch("mcp_multiskill.load_skill._get_script_schema", new_callable=AsyncMock, return_value={"type": "object"})
     def test_render_skill_for_client_renders_tool_docs(self, _mock_schema) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -109,13 +159,62 @@ class TestLoadSkill(unittest.TestCase):
             (skill_dir / "SKILL.md").write_text("desc line\nmore", encoding="utf-8")
             (skill_dir / "main.py").write_text("", encoding="utf-8")
 
-            text = load_skill.render_skill_for_client("demo", root)
+            text = asyncio.run(load_skill.render_skill_for_client("demo", root))
 
             self.assertIn("## Tool Invocation", text)
             self.assertIn("### main.py", text)
             self.assertIn("- script_name: `main`", text)
             self.assertIn("Argument schema:", text)
 
+    @patch(
+        "mcp_multiskill.load_skill._get_script_schema",
+        new_callable=AsyncMock,
+        return_value={
+            "schema": {
+                "a": {"type": "integer", "description": "First"},
+                "o": {"type": "string", "enum": ["+", "-"], "required": True},
+                "verbose": {"type": "boolean"},
+                "tag": {"type": "array", "items": {"type": "string"}},
+            }
+        },
+    )
+    def test_render_skill_for_client_compact_uses_signatures(self, _mock_schema) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            skill_dir = root / "demo"
+            skill_dir.mkdir()
+            (skill_dir / "SKILL.md").write_text("desc line", encoding="utf-8")
+            (skill_dir / "main.py").write_text("", encoding="utf-8")
+
+            compact = asyncio.run(load_skill.render_skill_for_client("demo", root, compact=True))
+            detail = asyncio.run(load_skill.render_script_for_client("demo", "main", root))
+
+            self.assertIn("- `main [--a:int] --o:{+,-} [--verbose] [--tag:str...]`", compact)
+            self.assertNotIn("```json", compact)
+            self.assertIn("### main.py", detail)
+            self.assertIn('"description": "First"', detail)
+            with self.assertRaisesRegex(ValueError, "Script not found"):
+                asyncio.run(load_skill.render_script_for_client("demo", "missing", root))
+
+    @patch("mcp_multiskill.load_skill.script_command", side_effect=direct_command)
+    def test_rendered_signature_is_accepted_by_run_skill(self, _mock_command) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            skill_dir = root / "demo"
+            skill_dir.mkdir()
+            (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
+            (skill_dir / "main.py").write_text(SIGNATURE_SCRIPT, encoding="utf-8")
+
+            compact = asyncio.run(load_skill.render_skill_for_client("demo", root, compact=True))
+            signature = compact.split("- `", 1)[1].split("`", 1)[0]
+            result = asyncio.run(
+                load_skill.run_skill_script("demo", "main", argv_from_signature(signature), skills_root=root)
+            )
+
+            self.assertEqual(signature, "main <path> [--dry-run] --max-count:int [--ratio:float] [--mode:{fast,slow}]")
+            self.assertEqual(result["returncode"], 0, result["stderr"])
+            self.assertIn("max_count=3", result["stdout"])
+
     def test_render_skill_for_client_without_scripts(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -123,7 +222,7 @@ class TestLoadSkill(unittest.TestCase):
             skill_dir.mkdir()
             (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
 
-            text = load_skill.render_skill_for_client("demo", root)
+            text = asyncio.run(load_skill.render_skill_for_client("demo", root))
 
             self.assertIn("No runnable python scripts found in this skill.", text)
 
@@ -145,9 +244,9 @@ class TestLoadSkill(unittest.TestCase):
                 ],
             )
 
-    @patch("mcp_multiskill.load_skill.subprocess.run")
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
     def test_run_skill_script_invokes_uv_run_and_returns_result(self, mock_run) -> None:
-        mock_run.return_value = SimpleNamespace(returncode=0, stdout="ok", stderr="")
+        mock_run.return_value = ProcessResult(returncode=0, stdout="ok", stderr="")
 
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -156,7 +255,7 @@ class TestLoadSkill(unittest.TestCase):
             (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
             (skill_dir / "main.py").write_text("", encoding="utf-8")
 
-            result = load_skill.run_skill_script("demo", "main", ["--x", "1"], skills_root=root)
+            result = asyncio.run(load_skill.run_skill_script("demo", "main", ["--x", "1"], skills_root=root))
 
             self.assertEqual(result["returncode"], 0)
             self.assertEqual(result["stdout"], "ok")
@@ -164,12 +263,12 @@ class TestLoadSkill(unittest.TestCase):
             self.assertIn("--x", result["command"])
             mock_run.assert_called_once()
             kwargs = mock_run.call_args.kwargs
-            self.assertEqual(kwargs["stdin"], load_skill.subprocess.DEVNULL)
-            self.assertIsNone(kwargs["input"])
+            self.assertIsNone(kwargs["stdin"])
+            self.assertNotIn("VIRTUAL_ENV", kwargs["env"])
 
-    @patch("mcp_multiskill.load_skill.subprocess.run")
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
     def test_run_skill_script_passes_stdin_when_provided(self, mock_run) -> None:
-        mock_run.return_value = SimpleNamespace(returncode=0, stdout="ok", stderr="")
+        mock_run.return_value = ProcessResult(returncode=0, stdout="ok", stderr="")
 
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -178,18 +277,36 @@ class TestLoadSkill(unittest.TestCase):
             (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
             (skill_dir / "main.py").write_text("", encoding="utf-8")
 
-            load_skill.run_skill_script(
-                "demo",
-                "main",
-                ["--x", "1"],
-                skills_root=root,
-                stdin="hello stdin",
+            asyncio.run(
+                load_skill.run_skill_script(
+                    "demo",
+                    "main",
+                    ["--x", "1"],
+                    skills_root=root,
+                    stdin="hello stdin",
+                )
             )
 
             mock_run.assert_called_once()
             kwargs = mock_run.call_args.kwargs
-            self.assertIsNone(kwargs["stdin"])
-            self.assertEqual(kwargs["input"], "hello stdin")
+            self.assertEqual(kwargs["stdin"], "hello stdin")
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_run_skill_script_reports_timeout(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=-9, stdout="partial", stderr="", timed_out=True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            skill_dir = root / "demo"
+            skill_dir.mkdir()
+            (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
+            (skill_dir / "main.py").write_text("", encoding="utf-8")
+
+            result = asyncio.run(load_skill.run_skill_script("demo", "main", [], skills_root=root, timeout=0.5))
+
+            self.assertTrue(result["timed_out"])
+            self.assertIn("0.5s timeout", result["stderr"])
+            self.assertEqual(mock_run.call_args.kwargs["timeout"], 0.5)
 
     def test_run_skill_script_raises_when_script_missing(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
@@ -199,7 +316,7 @@ class TestLoadSkill(unittest.TestCase):
             (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
 
             with self.assertRaisesRegex(ValueError, "Script not found"):
-                load_skill.run_skill_script("demo", "missing", [], skills_root=root)
+                asyncio.run(load_skill.run_skill_script("demo", "missing", [], skills_root=root))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ProcessResult
+from mcp_multiskill.memo import MEMO_DISK_ENV, MemoCache, compute_result_key
+from mcp_multiskill.skill_config import load_skill_config, read_tool_table
+
+
+def _result(stdout: str = "ok") -> dict:
+    return {"command": ["python", "main.py"], "returncode": 0, "stdout": stdout, "stderr": ""}
+
+
+class TestMemoCache(unittest.TestCase):
+    def test_lru_evicts_by_entries_and_bytes(self) -> None:
+        cache = MemoCache(max_entries=2, max_bytes=10_000)
+        cache.store("a", _result(), ttl=60)
+        cache.store("b", _result(), ttl=60)
+        cache.lookup("a")
+        cache.store("c", _result(), ttl=60)
+
+        self.assertIsNotNone(cache.lookup("a"))
+        self.assertIsNone(cache.lookup("b"))
+
+        small = MemoCache(max_entries=10, max_bytes=1000)
+        small.store("big1", _result("x" * 600), ttl=60)
+        small.store("big2", _result("y" * 600), ttl=60)
+        self.assertIsNone(small.lookup("big1"))
+        self.assertEqual(small.stats()["evictions"], 1)
+
+    def test_entries_expire_after_ttl(self) -> None:
+        cache = MemoCache()
+        cache.store("k", _result(), ttl=10, now=1000.0)
+
+        self.assertIsNotNone(cache.lookup("k", now=1005.0))
+        self.assertIsNone(cache.lookup("k", now=1011.0))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_disk_persistence_survives_new_instance(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ, {MEMO_DISK_ENV: "1"}):
+            MemoCache(cache_dir=Path(tmp)).store("k", _result("persisted"), ttl=60)
+
+            restored = MemoCache(cache_dir=Path(tmp)).lookup("k")
+
+        self.assertEqual(restored["stdout"], "persisted")
+
+    def test_returned_results_are_isolated(self) -> None:
+        cache = MemoCache()
+        cache.store("k", _result(), ttl=60)
+        first = cache.lookup("k")
+        first["command"].append("mutated")
+        first["cached"] = True
+
+        self.assertEqual(cache.lookup("k"), _result())
+
+    def test_nested_fields_are_isolated_and_sized(self) -> None:
+        nested = dict(_result(), result={"items": [1, 2]}, records=[{"n": 1}], truncated={"stdout": False})
+        cache = MemoCache(max_entries=10, max_bytes=10_000)
+        cache.store("k", nested, ttl=60)
+        nested["result"]["items"].append(3)
+        first = cache.lookup("k")
+        first["records"][0]["n"] = 99
+        first["truncated"]["stdout"] = True
+
+        again = cache.lookup("k")
+        self.assertEqual(again["result"], {"items": [1, 2]})
+        self.assertEqual(again["records"], [{"n": 1}])
+        self.assertEqual(again["truncated"], {"stdout": False})
+
+        small = MemoCache(max_entries=10, max_bytes=1000)
+        small.store("big", dict(_result(), records=[{"line": "z" * 100}] * 20), ttl=60)
+        self.assertIsNone(small.lookup("big"))
+
+
+class TestResultMemoization(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.skill_dir = self.root / "demo"
+        self.skill_dir.mkdir()
+        (self.skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
+        (self.skill_dir / "main.py").write_text("print(1)\n", encoding="utf-8")
+        (self.skill_dir / "other.py").write_text("print(2)\n", encoding="utf-8")
+        (self.skill_dir / "pyproject.toml").write_text(
+            '[project]\nname = "demo"\n\n[tool.mcp-multiskill]\ncacheable = ["main"]\ncache_ttl = 30\n',
+            encoding="utf-8",
+        )
+        cache = MemoCache()
+        patcher = patch("mcp_multiskill.load_skill.memo_cache", cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_config_reads_tool_table(self) -> None:
+        config = load_skill_config(self.skill_dir)
+
+        self.assertTrue(config.is_cacheable("main"))
+        self.assertFalse(config.is_cacheable("other"))
+        self.assertEqual(config.cache_ttl, 30.0)
+        self.assertFalse(load_skill_config(self.root / "missing").is_cacheable("main"))
+
+    def test_unreadable_tool_table_is_logged(self) -> None:
+        pyproject = self.skill_dir / "pyproject.toml"
+
+        with patch("mcp_multiskill.skill_config.tomllib", None), self.assertLogs("mcp_multiskill", "WARNING") as logs:
+            self.assertEqual(read_tool_table(pyproject), {})
+        self.assertIn("without tomli", logs.output[0])
+
+        pyproject.write_text("[tool.mcp-multiskill]\ncacheable = [\n", encoding="utf-8")
+        with self.assertLogs("mcp_multiskill", "WARNING") as logs:
+            self.assertEqual(read_tool_table(pyproject), {})
+        self.assertIn("invalid TOML", logs.output[0])
+
+    def test_key_covers_script_argv_and_stdin(self) -> None:
+        script = self.skill_dir / "main.py"
+        base = compute_result_key(script, self.skill_dir, ["--a", "1"], None)
+
+        self.assertEqual(base, compute_result_key(script, self.skill_dir, ["--a", "1"], None))
+        self.assertNotEqual(base, compute_result_key(script, self.skill_dir, ["--a", "2"], None))
+        self.assertNotEqual(base, compute_result_key(script, self.skill_dir, ["--a", "1"], ""))
+        script.write_text("print('changed')\n", encoding="utf-8")
+        self.assertNotEqual(base, compute_result_key(script, self.skill_dir, ["--a", "1"], None))
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_repeated_calls_hit_cache_only_for_cacheable_scripts(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=0, stdout="3", stderr="")
+
+        async def scenario():
+            run = load_skill.run_skill_script
+            first = await run("demo", "main", ["--a", "1"], skills_root=self.root)
+            second = await run("demo", "main", ["--a", "1"], skills_root=self.root)
+            different = await run("demo", "main", ["--a", "2"], skills_root=self.root)
+            other = [await run("demo", "other", [], skills_root=self.root) for _ in range(2)]
+            return first, second, different, other
+
+        first, second, different, other = asyncio.run(scenario())
+
+        self.assertNotIn("cached", first)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["stdout"], "3")
+        self.assertNotIn("cached", different)
+        self.assertFalse(any("cached" in result for result in other))
+        self.assertEqual(mock_run.call_count, 4)
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_failures_are_not_cached(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=1, stdout="", stderr="boom")
+
+        for _ in range(2):
+            asyncio.run(load_skill.run_skill_script("demo", "main", [], skills_root=self.root))
+
+        self.assertEqual(mock_run.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
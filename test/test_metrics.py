@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill.executor import ProcessResult
+from mcp_multiskill.metrics import METRICS_JSONL_ENV, METRICS_PROM_ENV, Histogram, Metrics
+
+
+def _result(**kwargs) -> ProcessResult:
+    values = dict(returncode=0, stdout="", stderr="", wall_seconds=0.04, spawn_seconds=0.002, cpu_seconds=0.03, max_rss_bytes=20 * 1024 * 1024, output_bytes=10)
+    values.update(kwargs)
+    return ProcessResult(**values)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_quantiles_use_bucket_upper_bounds(self) -> None:
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 3, 4, 5, 250):
+            histogram.observe(value)
+
+        data = histogram.as_dict()
+
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(data["p50"], 10)
+        self.assertEqual(data["p95"], 250)
+        self.assertEqual((data["min"], data["max"]), (0.5, 250))
+
+
+class TestMetrics(unittest.TestCase):
+    def test_record_run_aggregates_per_skill_and_script(self) -> None:
+        metrics = Metrics()
+        metrics.record_run("cal", "main", queue_seconds=0.0, env_seconds=0.001, wall_seconds=0.05, result=_result(), warm=False)
+        metrics.record_run("cal", "other", queue_seconds=0.0, env_seconds=0.001, wall_seconds=0.05, result=_result(returncode=2), warm=False)
+
+        snapshot = metrics.snapshot()
+        calls = {tuple(sorted((k, v) for k, v in item.items() if k != "value")): item["value"] for item in snapshot["counters"]["run_calls"]}
+        errors = snapshot["counters"]["run_errors"]
+
+        self.assertEqual(calls[(("skill", "cal"),)], 2)
+        self.assertEqual(calls[(("script", "main"), ("skill", "cal"))], 1)
+        self.assertIn({"skill": "cal", "script": "other", "value": 1}, errors)
+        rss = next(item for item in snapshot["histograms"]["run_max_rss_bytes"] if "script" not in item)
+        self.assertEqual(rss["max"], 20 * 1024 * 1024)
+
+    def test_exports_jsonl_and_prometheus_text(self) -> None:
+        metrics = Metrics()
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl = Path(tmp) / "events.jsonl"
+            prom = Path(tmp) / "metrics.prom"
+            with patch.dict(os.environ, {METRICS_JSONL_ENV: str(jsonl), METRICS_PROM_ENV: str(prom)}):
+                metrics.record_run("cal", "main", queue_seconds=0.0, env_seconds=0.001, wall_seconds=0.05, result=_result(), warm=True)
+                metrics.record_timing("schema_ms", 0.002, source="static")
+
+            events = [json.loads(line) for line in jsonl.read_text(encoding="utf-8").splitlines()]
+            text = prom.read_text(encoding="utf-8")
+
+        self.assertEqual([event["event"] for event in events], ["run", "schema_ms"])
+        self.assertEqual(events[0]["max_rss_bytes"], 20 * 1024 * 1024)
+        self.assertIn('mcp_multiskill_run_calls{script="main",skill="cal"} 1', text)
+        self.assertIn('mcp_multiskill_run_wall_ms_bucket{skill="cal",le="+Inf"} 1', text)
+
+    def test_disabled_metrics_record_nothing(self) -> None:
+        metrics = Metrics()
+        with patch.dict(os.environ, {"MCP_MULTISKILL_METRICS": "0"}):
+            metrics.record_run("cal", "main", queue_seconds=0.0, env_seconds=0.0, wall_seconds=0.0, result=_result(), warm=False)
+
+        self.assertEqual(metrics.snapshot(), {"counters": {}, "histograms": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
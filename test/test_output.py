@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill.executor import run_process
+from mcp_multiskill.output import OutputCapture
+from mcp_multiskill.scratch import ScratchArea
+
+
+
+class TestOutputCapture(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.scratch = ScratchArea(root=Path(self._tmp.name))
+
+    def test_small_output_is_kept_verbatim(self) -> None:
+        capture = OutputCapture("stdout", limit=100, scratch=self.scratch)
+        capture.feed(b"hello\n")
+
+        self.assertFalse(capture.truncated)
+        self.assertEqual(capture.text(), "hello\n")
+        self.assertIsNone(capture.info())
+
+    def test_overflow_keeps_head_and_tail_and_spills_everything(self) -> None:
+        data = b"".join(f"line {index}\n".encode() for index in range(1000))
+        capture = OutputCapture("stdout", limit=200, scratch=self.scratch)
+        for start in range(0, len(data), 37):
+            capture.feed(data[start : start + 37])
+
+        text = capture.text()
+        info = capture.info()
+
+        self.assertTrue(text.startswith("line 0\n"))
+        self.assertTrue(text.endswith("line 999\n"))
+        self.assertIn(f'read_skill_output(handle="{info["handle"]}")', text)
+        self.assertEqual(info["total_bytes"], len(data))
+        self.assertEqual(info["kept_bytes"], 200)
+        self.assertEqual(self.scratch.path_for(info["handle"]).read_bytes(), data)
+
+    def test_spill_can_be_disabled(self) -> None:
+        capture = OutputCapture("stderr", limit=10, spill=False, scratch=self.scratch)
+        capture.feed(b"x" * 50)
+
+        self.assertIn("40 bytes of stderr truncated ...]", capture.text())
+        self.assertNotIn("handle", capture.info())
+
+
+class TestScratchArea(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.scratch = ScratchArea(root=Path(self._tmp.name), ttl=60)
+
+    def test_pages_do_not_split_multibyte_characters(self) -> None:
+        handle, path = self.scratch.new_file("stdout")
+        path.write_bytes("数据分页".encode("utf-8"))
+
+        pages = []
+        offset = 0
+        while True:
+            page = self.scratch.read_page(handle, offset, limit=4)
+            pages.append(page["data"])
+            offset = page["next_offset"]
+            if page["eof"]:
+                break
+
+        self.assertEqual(pages, ["数", "据", "分", "页"])
+
+    def test_invalid_and_expired_handles_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.scratch.read_page("../etc/passwd")
+        with self.assertRaises(ValueError):
+            self.scratch.read_page("stdout-" + "0" * 32)
+
+        handle, _path = self.scratch.new_file("stdout")
+        self.assertEqual(self.scratch.sweep(now=float("inf")), 1)
+        with self.assertRaises(ValueError):
+            self.scratch.read_page(handle)
+
+
+class TestRunProcessStreaming(unittest.TestCase):
+    def test_chunks_are_forwarded_and_output_capped(self) -> None:
+        received: list[tuple[str, bytes]] = []
+
+        async def on_output(name: str, chunk: bytes) -> None:
+            received.append((name, chunk))
+
+        code = "import sys; sys.stdout.write('a' * 5000); sys.stderr.write('oops')"
+        with tempfile.TemporaryDirectory() as tmp, patch(
+            "mcp_multiskill.output.scratch_area", ScratchArea(root=Path(tmp))
+        ):
+            result = asyncio.run(
+                run_process([sys.executable, "-c", code], max_output_bytes=1024, on_output=on_output)
+            )
+
+        self.assertEqual(b"".join(chunk for name, chunk in received if name == "stdout"), b"a" * 5000)
+        self.assertEqual(b"".join(chunk for name, chunk in received if name == "stderr"), b"oops")
+        self.assertEqual(result.stderr, "oops")
+        self.assertEqual(result.truncated["stdout"]["total_bytes"], 5000)
+        self.assertNotIn("stderr", result.truncated)
+        self.assertLess(len(result.stdout), 1200)
+
+
+if __name__ == "__main__":
+    unittest.main()
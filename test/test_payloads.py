@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.payloads import write_payload
+from mcp_multiskill.scratch import ScratchArea
+
+COPY_SCRIPT = """import argparse, shutil, sys
+parser = argparse.ArgumentParser()
+parser.add_argument("--input")
+args = parser.parse_args()
+source = open(args.input, "rb") if args.input else sys.stdin.buffer
+shutil.copyfileobj(source, sys.stdout.buffer)
+"""
+
+
+async def direct_command(_skill_dir, script_path, argv=None, direct=False):
+    return [sys.executable, str(script_path), *(argv or [])], dict(os.environ)
+
+
+class TestPayloadTransport(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        tmp = Path(self._tmp.name)
+        self.root = tmp / "skills"
+        (self.root / "copy").mkdir(parents=True)
+        (self.root / "copy" / "SKILL.md").write_text("Copies bytes.", encoding="utf-8")
+        (self.root / "copy" / "main.py").write_text(COPY_SCRIPT, encoding="utf-8")
+        self.scratch = ScratchArea(root=tmp / "scratch", ttl=3600)
+        for target in ("mcp_multiskill.load_skill.scratch_area", "mcp_multiskill.payloads.scratch_area"):
+            patcher = patch(target, self.scratch)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("mcp_multiskill.load_skill.script_command", side_effect=direct_command)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, **kwargs):
+        return asyncio.run(load_skill.run_skill_script("copy", "main", skills_root=self.root, **kwargs))
+
+    def _upload(self, data: bytes, chunk: int = 300_000) -> str:
+        handle = None
+        for start in range(0, len(data), chunk):
+            handle = write_payload(base64.b64encode(data[start:start + chunk]).decode("ascii"), handle)["handle"]
+        return handle
+
+    def test_large_binary_round_trip_through_handles(self) -> None:
+        data = bytes(range(256)) * 4096
+        handle = self._upload(data)
+
+        result = self._run(stdin_handle=handle, binary_stdout=True)
+
+        self.assertEqual(result["returncode"], 0)
+        self.assertEqual(result["stdout"], "")
+        self.assertEqual(result["stdout_bytes"], len(data))
+        self.assertEqual(self.scratch.path_for(result["stdout_handle"]).read_bytes(), data)
+        page = self.scratch.read_page(result["stdout_handle"], 255, 3, encoding="base64")
+        self.assertEqual(base64.b64decode(page["data"]), b"\xff\x00\x01")
+
+    def test_small_binary_output_comes_back_inline(self) -> None:
+        result = self._run(stdin_base64=base64.b64encode(b"\x00\xffpng").decode("ascii"), binary_stdout=True)
+
+        self.assertEqual(base64.b64decode(result["stdout_base64"]), b"\x00\xffpng")
+        self.assertNotIn("stdout_handle", result)
+        self.assertEqual(list(self.scratch.root.iterdir()), [])
+
+    def test_payload_argv_is_replaced_by_its_path(self) -> None:
+        handle = write_payload("hello", encoding="utf-8")["handle"]
+
+        result = self._run(argv=["--input", f"payload://{handle}"])
+
+        self.assertEqual(result["stdout"], "hello")
+
+    def test_rejects_conflicting_or_unknown_inputs(self) -> None:
+        with self.assertRaisesRegex(ValueError, "only one"):
+            self._run(stdin="x", stdin_base64="eA==")
+        with self.assertRaisesRegex(ValueError, "Unknown or expired"):
+            self._run(stdin_handle="payload-" + "0" * 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ConcurrencyLimiter, PipelineStep, run_pipeline
+
+
+SCRIPTS = {
+    "generate": "import sys\nsize = int(sys.argv[1])\nline = b'x' * 99 + b'\\n'\nfor _ in range(size // 100):\n    sys.stdout.buffer.write(line)\n",
+    "upper": "import sys\nfor chunk in iter(lambda: sys.stdin.buffer.read(65536), b''):\n    sys.stdout.buffer.write(chunk.upper())\n",
+    "count": "import sys\ndata = sys.stdin.buffer.read()\nprint(len(data), data.count(b'X'))\n",
+    "fail": "import sys\nsys.stdin.read()\nprint('bad input', file=sys.stderr)\nsys.exit(3)\n",
+    "sleep": "import sys, time\ntime.sleep(float(sys.argv[1]))\nsys.stdout.write(sys.stdin.read() + 'z')\n",
+}
+
+
+async def direct_command(skill_dir: Path, script_path: Path, argv: list[str] | None, direct: bool = False):
+    return [sys.executable, str(script_path), *(argv or [])], dict(os.environ)
+
+
+class TestRunPipeline(unittest.TestCase):
+    def test_steps_run_concurrently(self) -> None:
+        steps = [PipelineStep([sys.executable, "-c", SCRIPTS["sleep"], "0.5"]) for _ in range(3)]
+
+        started = time.perf_counter()
+        results = asyncio.run(run_pipeline(steps, stdin="a"))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([result.returncode for result in results], [0, 0, 0])
+        self.assertEqual(results[-1].stdout, "azzz")
+        self.assertEqual(results[0].stdout, "")
+        self.assertLess(elapsed, 1.4)
+
+    def test_timeout_kills_every_step(self) -> None:
+        steps = [PipelineStep([sys.executable, "-c", SCRIPTS["sleep"], "5"], timeout=0.3) for _ in range(2)]
+
+        results = asyncio.run(run_pipeline(steps))
+
+        self.assertTrue(all(result.timed_out for result in results))
+
+
+class TestRunSkillPipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        skill_dir = self.root / "text"
+        skill_dir.mkdir()
+        (skill_dir / "SKILL.md").write_text("Text tools.", encoding="utf-8")
+        for name, source in SCRIPTS.items():
+            (skill_dir / f"{name}.py").write_text(source, encoding="utf-8")
+
+    def _run(self, steps, **kwargs):
+        with patch("mcp_multiskill.load_skill.script_command", side_effect=direct_command):
+            return asyncio.run(load_skill.run_skill_pipeline(steps, skills_root=self.root, **kwargs))
+
+    @staticmethod
+    def _step(script: str, *argv: str) -> dict:
+        return {"skill_name": "text", "script_name": script, "argv": list(argv)}
+
+    def test_large_output_flows_between_steps(self) -> None:
+        size = 8_000_000
+
+        result = self._run([self._step("generate", str(size)), self._step("upper"), self._step("count")])
+
+        self.assertEqual(result["returncode"], 0)
+        self.assertEqual(result["stdout"].split(), [str(size), str(size // 100 * 99)])
+        self.assertEqual([step["script_name"] for step in result["steps"]], ["generate", "upper", "count"])
+        self.assertNotIn("stdout", result["steps"][0])
+        self.assertEqual(result["steps"][0]["usage"]["output_bytes"], 0)
+        self.assertNotIn("failed_step", result)
+
+    def test_failing_step_sets_pipefail_returncode(self) -> None:
+        result = self._run([self._step("upper"), self._step("fail"), self._step("count")], stdin="hello")
+
+        self.assertEqual(result["returncode"], 3)
+        self.assertEqual(result["failed_step"], 1)
+        self.assertEqual(result["steps"][1]["stderr"].strip(), "bad input")
+        self.assertEqual(result["stdout"].split(), ["0", "0"])
+
+    def test_every_skill_takes_a_slot_without_deadlock(self) -> None:
+        other = self.root / "other"
+        other.mkdir()
+        (other / "SKILL.md").write_text("Other tools.", encoding="utf-8")
+        (other / "sleep.py").write_text(SCRIPTS["sleep"], encoding="utf-8")
+        forward = [self._step("sleep", "0.3"), {"skill_name": "other", "script_name": "sleep", "argv": ["0.3"]}]
+        backward = list(reversed(forward))
+
+        async def crossed():
+            return await asyncio.gather(
+                load_skill.run_skill_pipeline(forward, skills_root=self.root),
+                load_skill.run_skill_pipeline(backward, skills_root=self.root),
+            )
+
+        async def blocked():
+            pipeline = asyncio.ensure_future(load_skill.run_skill_pipeline(forward, skills_root=self.root))
+            await asyncio.sleep(0.1)
+            started = time.perf_counter()
+            # 管道的第二步也占着 "other" 的配额，单独调用要等管道结束
+            single = await load_skill.run_skill_script("other", "sleep", ["0"], skills_root=self.root)
+            waited = time.perf_counter() - started
+            await pipeline
+            return single, waited
+
+        with (
+            patch("mcp_multiskill.load_skill.script_command", side_effect=direct_command),
+            patch("mcp_multiskill.load_skill.limiter", ConcurrencyLimiter(global_limit=2, skill_limit=1)),
+        ):
+            results = asyncio.run(asyncio.wait_for(crossed(), 10))
+            single, waited = asyncio.run(blocked())
+
+        self.assertEqual([result["returncode"] for result in results], [0, 0])
+        self.assertEqual(single["returncode"], 0)
+        self.assertGreater(waited, 0.3)
+
+    def test_metrics_record_each_step_wall_time(self) -> None:
+        recorder = MagicMock()
+
+        with patch("mcp_multiskill.load_skill.metrics", recorder):
+            self._run([self._step("generate", "100"), self._step("sleep", "0.5")])
+
+        walls = [call.kwargs["wall_seconds"] for call in recorder.record_run.call_args_list]
+        self.assertLess(walls[0], 0.4)
+        self.assertGreaterEqual(walls[1], 0.5)
+
+    def test_invalid_steps_raise_before_running(self) -> None:
+        with self.assertRaisesRegex(ValueError, "non-empty"):
+            self._run([])
+        with self.assertRaisesRegex(ValueError, "step 1"):
+            self._run([self._step("upper"), {"skill_name": "text"}])
+        with self.assertRaisesRegex(ValueError, "Script not found"):
+            self._run([self._step("upper"), self._step("missing")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ConcurrencyLimiter, ProcessResult
+from mcp_multiskill.prewarm import PREWARM_CONCURRENCY_ENV, PrewarmStatus, prewarm_skills
+from mcp_multiskill.schema_cache import SCHEMA_CACHE_ENV
+from mcp_multiskill.tasks import TaskCache
+
+
+class TestTaskCache(unittest.TestCase):
+    def test_shares_tasks_and_retries_failures(self) -> None:
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            if value == "bad":
+                raise RuntimeError("boom")
+            return value
+
+        async def scenario():
+            cache = TaskCache()
+            first = await asyncio.gather(*(cache.get("k", 1, lambda: work("a")) for _ in range(3)))
+            again = await cache.get("k", 1, lambda: work("unused"))
+            bumped = await cache.get("k", 2, lambda: work("b"))
+            with self.assertRaises(RuntimeError):
+                await cache.get("x", 1, lambda: work("bad"))
+            retried = await cache.get("x", 1, lambda: work("good"))
+            return first, again, bumped, retried
+
+        first, again, bumped, retried = asyncio.run(scenario())
+
+        self.assertEqual(first, ["a", "a", "a"])
+        self.assertEqual(again, "a")
+        self.assertEqual(bumped, "b")
+        self.assertEqual(retried, "good")
+        self.assertEqual(calls, ["a", "b", "bad", "good"])
+
+
+class TestPrewarm(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        for name, scripts in (("alpha", ["one.py", "two.py"]), ("beta", ["broken.py"])):
+            skill_dir = self.root / name
+            skill_dir.mkdir()
+            (skill_dir / "SKILL.md").write_text(f"{name} skill", encoding="utf-8")
+            for script in scripts:
+                (skill_dir / script).write_text("", encoding="utf-8")
+        self.extracted: list[str] = []
+
+    async def _fake_schema(self, script_path: Path, _skill_dir: Path, _gate=None):
+        self.extracted.append(script_path.name)
+        await asyncio.sleep(0.05)
+        if script_path.name == "broken.py":
+            raise RuntimeError("no parser")
+        return {"script": script_path.stem}
+
+    def test_prewarm_fills_caches_and_shares_in_flight_work(self) -> None:
+        progress = []
+
+        async def scenario():
+            status = PrewarmStatus()
+            warm = asyncio.ensure_future(
+                prewarm_skills(self.root, on_progress=lambda s: progress.append(s.done), status=status)
+            )
+            await asyncio.sleep(0)
+            # 预热进行中的 get_skill 等待同一批任务，而不是重复提取
+            rendered = await load_skill.render_skill_for_client("alpha", self.root)
+            await warm
+            again = await load_skill.render_skill_for_client("alpha", self.root)
+            return status, rendered, again
+
+        with patch("mcp_multiskill.load_skill._get_script_schema", side_effect=self._fake_schema):
+            status, rendered, again = asyncio.run(scenario())
+
+        self.assertEqual(sorted(self.extracted), ["broken.py", "one.py", "two.py"])
+        self.assertIn('"script": "two"', rendered)
+        self.assertEqual(rendered, again)
+        self.assertEqual(status.state, "ready")
+        self.assertEqual((status.skills, status.scripts, status.done), (2, 3, 3))
+        self.assertEqual(sorted(progress), [1, 2, 3])
+        self.assertIn("beta/broken.py", status.failed)
+
+    def test_failures_and_cancellation_are_reported_apart(self) -> None:
+        async def cancel_midway(status):
+            warm = asyncio.ensure_future(prewarm_skills(self.root, status=status))
+            await asyncio.sleep(0.01)
+            warm.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await warm
+
+        failed, cancelled = PrewarmStatus(), PrewarmStatus()
+        with patch("mcp_multiskill.load_skill._get_script_schema", side_effect=self._fake_schema):
+            with patch("mcp_multiskill.prewarm.get_search_index", side_effect=OSError("index unreadable")):
+                with self.assertRaises(OSError):
+                    asyncio.run(prewarm_skills(self.root, status=failed))
+            asyncio.run(cancel_midway(cancelled))
+
+        self.assertEqual((failed.state, failed.as_dict()["error"]), ("failed", "index unreadable"))
+        self.assertEqual((cancelled.state, cancelled.error), ("cancelled", None))
+
+    def test_run_skill_does_not_queue_behind_prewarm(self) -> None:
+        for index in range(4):
+            (self.root / "alpha" / f"slow_{index}.py").write_text("", encoding="utf-8")
+        running = {"schema": 0, "peak": 0}
+
+        async def direct_command(_skill_dir, script_path, argv=None, direct=False):
+            return [sys.executable, str(script_path), *(argv or [])], dict(os.environ)
+
+        async def fake_run_process(command, env=None, **kwargs):
+            if not (env or {}).get("PRINT_MCP_SCHEMA"):
+                return ProcessResult(returncode=0, stdout="ran", stderr="")
+            running["schema"] += 1
+            running["peak"] = max(running["peak"], running["schema"])
+            await asyncio.sleep(0.4)
+            running["schema"] -= 1
+            return ProcessResult(returncode=0, stdout="{}", stderr="")
+
+        async def scenario():
+            warm = asyncio.ensure_future(prewarm_skills(self.root, status=PrewarmStatus()))
+            await asyncio.sleep(0.05)
+            started = time.monotonic()
+            result = await load_skill.run_skill_script("alpha", "one", [], skills_root=self.root)
+            elapsed = time.monotonic() - started
+            await warm
+            return result, elapsed
+
+        with (
+            patch.dict(os.environ, {SCHEMA_CACHE_ENV: "0", PREWARM_CONCURRENCY_ENV: "2"}),
+            patch("mcp_multiskill.load_skill.limiter", ConcurrencyLimiter(global_limit=1)),
+            patch("mcp_multiskill.load_skill.script_command", side_effect=direct_command),
+            patch("mcp_multiskill.load_skill.run_process", side_effect=fake_run_process),
+        ):
+            result, elapsed = asyncio.run(scenario())
+
+        self.assertEqual(result["stdout"], "ran")
+        # 七个脚本各提取 0.4s；若与 run_skill 共用唯一的名额，至少要等一轮提取
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual(running["peak"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.registry import SkillRegistry
+
+
+class TestSkillRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.loaded: list[str] = []
+        self._make_skill("alpha", "alpha skill", ["main.py", "_helper.py"])
+        self._make_skill("beta", "beta skill", [])
+        (self.root / "no_markdown").mkdir()
+
+    def _make_skill(self, name: str, description: str, scripts: list[str]) -> Path:
+        skill_dir = self.root / name
+        skill_dir.mkdir(exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(description + "\nbody", encoding="utf-8")
+        for script in scripts:
+            (skill_dir / script).write_text("", encoding="utf-8")
+        return skill_dir
+
+    def _loader(self, skill_dir: Path):
+        self.loaded.append(skill_dir.name)
+        return load_skill.load_skill_entry(skill_dir)
+
+    def _registry(self, poll_interval: float = 0.0) -> SkillRegistry:
+        registry = SkillRegistry(self.root, self._loader, poll_interval=poll_interval, watch=False)
+        self.addCleanup(registry.close)
+        return registry
+
+    def test_scans_once_and_serves_from_memory(self) -> None:
+        registry = self._registry(poll_interval=3600)
+
+        names = [entry.name for entry in registry.entries()]
+        for _ in range(5):
+            registry.entries()
+            registry.get("alpha")
+
+        self.assertEqual(names, ["alpha", "beta"])
+        self.assertEqual(sorted(self.loaded), ["alpha", "beta"])
+        alpha = registry.get("alpha")
+        self.assertEqual(alpha.description, "alpha skill")
+        self.assertEqual([path.name for path in alpha.scripts], ["main.py"])
+
+    def test_poll_reloads_only_changed_skills(self) -> None:
+        registry = self._registry()
+        registry.entries()
+        self.loaded.clear()
+
+        (self.root / "alpha" / "SKILL.md").write_text("alpha changed description\nbody", encoding="utf-8")
+        (self.root / "alpha" / "extra.py").write_text("", encoding="utf-8")
+        alpha = registry.get("alpha")
+
+        self.assertEqual(self.loaded, ["alpha"])
+        self.assertEqual(alpha.description, "alpha changed description")
+        self.assertEqual([path.name for path in alpha.scripts], ["extra.py", "main.py"])
+
+    def test_poll_picks_up_added_and_removed_skills(self) -> None:
+        registry = self._registry()
+        registry.entries()
+
+        self._make_skill("gamma", "gamma skill", [])
+        shutil.rmtree(self.root / "beta")
+
+        self.assertEqual([entry.name for entry in registry.entries()], ["alpha", "gamma"])
+
+    def test_new_skill_is_found_before_next_poll(self) -> None:
+        registry = self._registry(poll_interval=3600)
+        registry.entries()
+
+        self._make_skill("gamma", "gamma skill", [])
+
+        self.assertEqual(registry.get("gamma").description, "gamma skill")
+        self.assertIsNone(registry.get("no_markdown"))
+        self.assertIsNone(registry.get("../alpha"))
+
+    def test_watch_events_wait_for_the_lock_and_are_not_lost(self) -> None:
+        registry = self._registry(poll_interval=3600)
+        registry.entries()
+        self.loaded.clear()
+        (self.root / "alpha" / "SKILL.md").write_text("alpha edited\nbody", encoding="utf-8")
+        marker = threading.Thread(target=registry._mark, args=(registry._watch_root / "alpha" / "SKILL.md",))
+
+        with registry._lock:
+            marker.start()
+            marker.join(0.2)
+            self.assertTrue(marker.is_alive())
+        marker.join(5)
+
+        self.assertEqual(registry.get("alpha").description, "alpha edited")
+        self.assertEqual(self.loaded, ["alpha"])
+
+    def test_lookup_skill_keeps_error_messages(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Skill not found"):
+            load_skill.lookup_skill("missing", self.root)
+        with self.assertRaisesRegex(ValueError, "Skill missing SKILL.md"):
+            load_skill.lookup_skill("no_markdown", self.root)
+        self.assertEqual(load_skill.lookup_skill("alpha", self.root).path, self.root / "alpha")
+
+
+if __name__ == "__main__":
+    unittest.main()
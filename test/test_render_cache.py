@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.render_cache import RenderCache, render_cache
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        skill_dir = self.root / "demo"
+        skill_dir.mkdir()
+        (skill_dir / "SKILL.md").write_text("desc line", encoding="utf-8")
+        (skill_dir / "a.py").write_text("print('a')\n", encoding="utf-8")
+        (skill_dir / "b.py").write_text("print('b')\n", encoding="utf-8")
+        self.skill_dir = skill_dir
+        render_cache.clear()
+        self.addCleanup(render_cache.clear)
+        patcher = patch(
+            "mcp_multiskill.load_skill.get_script_schema",
+            new_callable=AsyncMock,
+            return_value={"schema": {"n": {"type": "integer"}}},
+        )
+        self.schema = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _render(self, compact: bool = False) -> str:
+        return asyncio.run(load_skill.render_skill_for_client("demo", self.root, compact=compact))
+
+    def _bump_mtime(self, path: Path) -> None:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        load_skill.get_skill_registry(self.root).invalidate()
+
+    def test_unchanged_skill_is_served_after_a_stat_pass(self) -> None:
+        first = self._render()
+        stats = render_cache.stats()
+
+        self.assertEqual(self._render(), first)
+        self.assertEqual(self.schema.await_count, 2)
+        self.assertEqual(render_cache.stat_hits, stats["stat_hits"] + 1)
+        self.assertEqual(render_cache.rehashes, stats["rehashes"])
+
+    def test_touched_files_keep_the_rendered_document(self) -> None:
+        first = self._render()
+        stats = render_cache.stats()
+        self._bump_mtime(self.skill_dir / "a.py")
+        self._bump_mtime(self.skill_dir / "SKILL.md")
+
+        self.assertEqual(self._render(), first)
+        self.assertEqual(self.schema.await_count, 2)
+        self.assertEqual(render_cache.rehashes, stats["rehashes"] + 1)
+        self.assertEqual(render_cache.hits, stats["hits"] + 1)
+
+    def test_edited_script_rerenders_only_its_section(self) -> None:
+        self._render()
+        self._render(compact=True)
+        self.schema.reset_mock()
+        (self.skill_dir / "b.py").write_text("print('bb')\n", encoding="utf-8")
+        self._bump_mtime(self.skill_dir / "b.py")
+
+        self._render()
+        self._render(compact=True)
+        detail = asyncio.run(load_skill.render_script_for_client("demo", "a", self.root))
+
+        self.assertEqual([call.args[0].name for call in self.schema.await_args_list], ["b.py", "b.py"])
+        self.assertIn("### a.py", detail)
+
+    def test_lru_evicts_oldest_entries(self) -> None:
+        cache = RenderCache(max_entries=2)
+        cache.store("a", "1")
+        cache.store("b", "2")
+        cache.get("a")
+        cache.store("c", "3")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), ("1", "3"))
+        self.assertEqual(cache.stats()["entries"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.results import RESULT_PATH_ENV, compile_check, validate
+from mcp_multiskill.scratch import ScratchArea
+from mcp_multiskill.skill_config import SkillConfig
+from mcp_multiskill.worker_pool import WORKER_SCRIPT, WorkerPool
+
+SCRIPTS = {
+    "total": """
+        import sys
+        from mcp_multiskill.parser_to_schema import emit_result
+        values = [float(arg) for arg in sys.argv[1:]]
+        print("adding", len(values), "values")
+        emit_result({"total": sum(values), "count": len(values)})
+    """,
+    "bad": """
+        from mcp_multiskill.parser_to_schema import emit_result
+        emit_result({"total": "n/a"})
+    """,
+    "silent": """
+        print("no result")
+    """,
+    "rows": """
+        import sys
+        from mcp_multiskill.parser_to_schema import emit_records
+        count = int(sys.argv[1])
+        emit_records({"id": index, "name": f"row-{index}"} for index in range(count))
+        emit_records([{"id": "last"}] if "--bad" in sys.argv else [])
+    """,
+}
+
+PYPROJECT = """
+[project]
+name = "report"
+
+[tool.mcp-multiskill]
+validate_argv = false
+
+[tool.mcp-multiskill.results.total]
+schema = { type = "object", required = ["total", "count"], properties = { total = { type = "number" }, count = { type = "integer" } } }
+
+[tool.mcp-multiskill.results.bad]
+schema = { type = "object", required = ["total", "count"], properties = { total = { type = "number" } } }
+
+[tool.mcp-multiskill.results.silent]
+format = "json"
+
+[tool.mcp-multiskill.results.rows]
+format = "ndjson"
+schema = { type = "object", required = ["id"], properties = { id = { type = "integer" } } }
+"""
+
+
+async def direct_command(_skill_dir, script_path, argv=None, direct=False):
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return [sys.executable, str(script_path), *(argv or [])], env
+
+
+class TestValidate(unittest.TestCase):
+    def test_reports_paths_of_nested_errors(self) -> None:
+        schema = {
+            "type": "object",
+            "required": ["items"],
+            "additionalProperties": False,
+            "properties": {
+                "items": {"type": "array", "items": {"type": "integer", "minimum": 0}},
+                "mode": {"enum": ["a", "b"]},
+            },
+        }
+
+        errors = validate({"items": [1, True, -2, 3.0], "mode": "c", "extra": 1}, schema)
+
+        self.assertEqual(errors, [
+            "$.items[1]: expected integer, got boolean",
+            "$.items[2]: -2 is less than 0",
+            "$.mode: 'c' is not one of ['a', 'b']",
+            "$: unexpected property 'extra'",
+        ])
+        self.assertEqual(validate({}, schema), ["$: missing required property 'items'"])
+        self.assertEqual(validate(None, {"type": ["string", "null"]}), [])
+
+    def test_compiled_check_agrees_with_validate(self) -> None:
+        schema = {
+            "type": "object",
+            "required": ["id"],
+            "properties": {"id": {"type": "integer"}, "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2}},
+            "additionalProperties": {"type": ["number", "null"], "minimum": 0},
+        }
+        check = compile_check(schema)
+        values = [
+            {"id": 1},
+            {"id": 2.0, "tags": ["a"], "score": 0.5, "note": None},
+            {"id": True},
+            {"id": 1, "tags": ["a", "b", "c"]},
+            {"id": 1, "tags": [1]},
+            {"id": 1, "score": -1},
+            {"tags": []},
+            [1],
+        ]
+
+        self.assertEqual([check(value) for value in values], [not validate(value, schema) for value in values])
+        self.assertEqual([check(value) for value in values], [True, True, False, False, False, False, False, False])
+
+    def test_result_specs_come_from_pyproject_table(self) -> None:
+        config = SkillConfig.from_table({"results": {"rows.py": {"format": "ndjson"}, "main": {"schema": {"type": "string"}}, "x": 1}})
+
+        self.assertEqual(config.result_spec("rows").format, "ndjson")
+        self.assertEqual(config.result_spec("main").schema, {"type": "string"})
+        self.assertEqual(config.result_spec("main").field, "result")
+        self.assertIsNone(config.result_spec("x"))
+
+
+class TestStructuredResults(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        tmp = Path(self._tmp.name)
+        self.root = tmp / "skills"
+        skill_dir = self.root / "report"
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text("Reports.", encoding="utf-8")
+        (skill_dir / "pyproject.toml").write_text(PYPROJECT, encoding="utf-8")
+        for name, source in SCRIPTS.items():
+            (skill_dir / f"{name}.py").write_text(textwrap.dedent(source), encoding="utf-8")
+        self.skill_dir = skill_dir
+        self.scratch = ScratchArea(root=tmp / "scratch", ttl=3600)
+        for target, value in (
+            ("mcp_multiskill.load_skill.scratch_area", self.scratch),
+            ("mcp_multiskill.load_skill.script_command", AsyncMock(side_effect=direct_command)),
+            ("mcp_multiskill.worker_pool.get_worker_pool", lambda: None),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, script: str, *argv: str, **kwargs):
+        return asyncio.run(load_skill.run_skill_script("report", script, list(argv), skills_root=self.root, **kwargs))
+
+    def test_json_result_is_returned_next_to_logs(self) -> None:
+        result = self._run("total", "1", "2.5")
+
+        self.assertEqual(result["result"], {"total": 3.5, "count": 2})
+        self.assertEqual(result["stdout"], "adding 2 values\n")
+        self.assertNotIn("result_errors", result)
+        self.assertEqual(list(self.scratch.root.iterdir()), [])
+
+    def test_schema_violations_and_missing_results_are_reported(self) -> None:
+        bad = self._run("bad")
+        silent = self._run("silent")
+
+        self.assertEqual(bad["result"], {"total": "n/a"})
+        self.assertEqual(bad["result_errors"], [
+            "$: missing required property 'count'",
+            "$.total: expected number, got string",
+        ])
+        self.assertNotIn("result", silent)
+        self.assertEqual(silent["result_errors"], ["script declares a json result but did not call emit_result"])
+
+    def test_small_record_sets_come_back_inline(self) -> None:
+        result = self._run("rows", "3", "--bad")
+
+        self.assertEqual(result["record_count"], 4)
+        self.assertEqual([record["id"] for record in result["records"]], [0, 1, 2, "last"])
+        self.assertEqual(result["result_errors"], ["records[3].id: expected integer, got string"])
+
+    def test_large_record_sets_are_paged_as_records(self) -> None:
+        result = self._run("rows", "5000", max_output_bytes=10_000)
+
+        self.assertEqual(result["record_count"], 5000)
+        self.assertNotIn("records", result)
+        handle = result["records_handle"]
+        offset, seen = 0, []
+        while True:
+            page = load_skill.read_skill_output_page(handle, offset, 4096)
+            seen.extend(record["id"] for record in page["records"])
+            offset = page["next_offset"]
+            if page["eof"]:
+                break
+        self.assertEqual(seen, list(range(5000)))
+        self.assertEqual(offset, result["records_bytes"])
+
+    def test_warm_worker_receives_and_clears_result_paths(self) -> None:
+        def launcher(_skill_dir):
+            return [sys.executable, str(WORKER_SCRIPT)], dict(os.environ, PYTHONPATH=str(SRC))
+
+        pool = WorkerPool(1, launcher=launcher)
+        self.addCleanup(pool.shutdown)
+        probe = self.skill_dir / "probe.py"
+        probe.write_text(f"import os\nprint(os.environ.get({RESULT_PATH_ENV!r}))\n", encoding="utf-8")
+
+        with patch("mcp_multiskill.worker_pool.get_worker_pool", return_value=pool):
+            result = self._run("total", "4")
+        leftover = pool.execute(self.skill_dir, probe, [])
+
+        self.assertEqual(result["result"], {"total": 4.0, "count": 1})
+        self.assertEqual(pool.stats()["spawned"], 1)
+        self.assertEqual(leftover["stdout"].strip(), "None")
+
+    @patch("mcp_multiskill.load_skill._get_script_schema", new_callable=AsyncMock, return_value=None)
+    def test_get_skill_marks_structured_scripts(self, _mock_schema) -> None:
+        compact = asyncio.run(load_skill.render_skill_for_client("report", self.root, compact=True))
+        detail = asyncio.run(load_skill.render_script_for_client("report", "rows", self.root))
+
+        self.assertIn("- `rows -> records`", compact)
+        self.assertIn("- `total -> result`", compact)
+        self.assertIn("NDJSON records in `records`", detail)
+        self.assertIn("Record schema:", detail)
+
+
+if __name__ == "__main__":
+    unittest.main()
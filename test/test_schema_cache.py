@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ProcessResult
+from mcp_multiskill.schema_cache import SchemaCache, compute_schema_key
+
+
+def _make_skill(root: Path) -> Path:
+    skill_dir = root / "demo"
+    skill_dir.mkdir()
+    (skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
+    (skill_dir / "main.py").write_text("print('v1')", encoding="utf-8")
+    (skill_dir / "pyproject.toml").write_text("[project]\nname='demo'", encoding="utf-8")
+    (skill_dir / "uv.lock").write_text("version = 1", encoding="utf-8")
+    return skill_dir
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.cache = SchemaCache(self.root / "cache")
+        patcher = patch.object(load_skill, "schema_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_key_changes_with_script_and_lockfiles(self) -> None:
+        skill_dir = _make_skill(self.root)
+        script = skill_dir / "main.py"
+
+        first = compute_schema_key(script, skill_dir)
+        self.assertEqual(first, compute_schema_key(script, skill_dir))
+
+        (skill_dir / "uv.lock").write_text("version = 2", encoding="utf-8")
+        second = compute_schema_key(script, skill_dir)
+        self.assertNotEqual(first, second)
+
+        (skill_dir / "pyproject.toml").unlink()
+        third = compute_schema_key(script, skill_dir)
+        self.assertNotEqual(second, third)
+
+        script.write_text("print('v2')", encoding="utf-8")
+        self.assertNotEqual(third, compute_schema_key(script, skill_dir))
+
+    def test_key_is_none_for_missing_script(self) -> None:
+        self.assertIsNone(compute_schema_key(self.root / "nope.py", self.root))
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_get_script_schema_runs_subprocess_only_on_miss(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=0, stdout='{"a": 1}', stderr="")
+        skill_dir = _make_skill(self.root)
+        script = skill_dir / "main.py"
+
+        self.assertEqual(asyncio.run(load_skill._get_script_schema(script, skill_dir)), {"a": 1})
+        self.assertEqual(asyncio.run(load_skill._get_script_schema(script, skill_dir)), {"a": 1})
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        (skill_dir / "uv.lock").write_text("version = 2", encoding="utf-8")
+        asyncio.run(load_skill._get_script_schema(script, skill_dir))
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_corrupted_entry_is_treated_as_miss(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=0, stdout='{"a": 1}', stderr="")
+        skill_dir = _make_skill(self.root)
+        script = skill_dir / "main.py"
+        key = compute_schema_key(script, skill_dir)
+        self.cache.cache_dir.mkdir(parents=True)
+        (self.cache.cache_dir / f"{key}.json").write_text("{not json", encoding="utf-8")
+
+        self.assertEqual(asyncio.run(load_skill._get_script_schema(script, skill_dir)), {"a": 1})
+        self.assertEqual(self.cache.corrupt, 1)
+        self.assertEqual(asyncio.run(load_skill._get_script_schema(script, skill_dir)), {"a": 1})
+        self.assertEqual(mock_run.call_count, 1)
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_unwritable_cache_still_returns_schema(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=0, stdout='{"a": 1}', stderr="")
+        skill_dir = _make_skill(self.root)
+        blocker = self.root / "blocked"
+        blocker.write_text("file, not dir", encoding="utf-8")
+        cache = SchemaCache(blocker)
+
+        with patch.object(load_skill, "schema_cache", cache):
+            self.assertEqual(asyncio.run(load_skill._get_script_schema(skill_dir / "main.py", skill_dir)), {"a": 1})
+            self.assertEqual(asyncio.run(load_skill._get_script_schema(skill_dir / "main.py", skill_dir)), {"a": 1})
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(cache.write_errors, 2)
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_failed_extraction_is_not_cached(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=1, stdout="", stderr="boom")
+        skill_dir = _make_skill(self.root)
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(load_skill._get_script_schema(skill_dir / "main.py", skill_dir))
+
+        self.assertEqual(list(self.cache.cache_dir.glob("*.json")), [])
+
+    @patch.dict(os.environ, {"MCP_MULTISKILL_SCHEMA_CACHE": "0"})
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_cache_can_be_disabled(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=0, stdout='{"a": 1}', stderr="")
+        skill_dir = _make_skill(self.root)
+
+        asyncio.run(load_skill._get_script_schema(skill_dir / "main.py", skill_dir))
+        asyncio.run(load_skill._get_script_schema(skill_dir / "main.py", skill_dir))
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(self.cache.stats()["misses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.registry import SkillRegistry
+from mcp_multiskill.search import SkillSearchIndex, tokenize
+
+
+class TestTokenize(unittest.TestCase):
+    def test_latin_words_compounds_and_cjk_bigrams(self) -> None:
+        self.assertEqual(
+            tokenize("Save memory_name 保存记忆"),
+            ["save", "memory", "name", "memory_name", "保存", "存记", "记忆"],
+        )
+        self.assertEqual(tokenize("存"), ["存"])
+
+
+class TestSkillSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self._make_skill("cal", "A simple calculator.", "Adds or subtracts two numbers.", {"main.py": 'help="Operation to perform"'})
+        self._make_skill("simple_memory", "保存与读取记忆", "把记忆写入 memorys 目录。", {"save.py": 'help="记忆名"'})
+        self._make_skill("weather", "Weather forecast lookup.", "Queries a forecast API.", {})
+        registry = SkillRegistry(self.root, load_skill.load_skill_entry, poll_interval=3600, watch=False)
+        self.addCleanup(registry.close)
+        self.registry = registry
+        self.index = SkillSearchIndex(registry)
+
+    def _make_skill(self, name: str, description: str, body: str, scripts: dict[str, str]) -> None:
+        skill_dir = self.root / name
+        skill_dir.mkdir(exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(f"{description}\n\n{body}\n", encoding="utf-8")
+        for script, source in scripts.items():
+            (skill_dir / script).write_text(f"parser.add_argument('--x', {source})\n", encoding="utf-8")
+
+    def _names(self, query: str) -> list[str]:
+        return [item["name"] for item in self.index.search(query)]
+
+    def test_matches_description_body_scripts_and_help(self) -> None:
+        self.assertEqual(self._names("calculator"), ["cal"])
+        self.assertEqual(self._names("subtracts"), ["cal"])
+        self.assertEqual(self._names("operation perform"), ["cal"])
+        self.assertEqual(self._names("save"), ["simple_memory"])
+        self.assertEqual(self._names("记忆"), ["simple_memory"])
+        self.assertEqual(self._names("nothing here"), [])
+
+    def test_ranks_by_relevance_and_respects_limit(self) -> None:
+        self._make_skill("forecast_tools", "Forecast charts.", "forecast forecast forecast", {})
+        self.registry.invalidate()
+
+        results = self.index.search("forecast weather")
+
+        self.assertEqual([item["name"] for item in results], ["weather", "forecast_tools"])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+        self.assertEqual(len(self.index.search("forecast", limit=1)), 1)
+
+    def test_updates_incrementally_when_skills_change(self) -> None:
+        self.index.search("calculator")
+        updates = self.index.updates
+
+        (self.root / "cal" / "SKILL.md").write_text("A unit converter.\n", encoding="utf-8")
+        shutil.rmtree(self.root / "weather")
+        self.registry.invalidate()
+
+        self.assertEqual(self._names("calculator"), [])
+        self.assertEqual(self._names("converter"), ["cal"])
+        self.assertEqual(self._names("forecast"), [])
+        self.assertEqual(self.index.updates, updates + 1)
+        self.assertEqual(self.index.stats()["skills"], 2)
+
+    def test_search_waits_for_a_refresh_in_progress(self) -> None:
+        self.index.search("calculator")
+        results = []
+        searcher = threading.Thread(target=lambda: results.append(self._names("calculator")))
+
+        with self.index._lock:
+            searcher.start()
+            searcher.join(0.2)
+            self.assertTrue(searcher.is_alive())
+        searcher.join(5)
+
+        self.assertEqual(results, [["cal"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, AsyncMock, patch
 
 import sys
 import types
@@ -27,7 +29,12 @@ class DummyFastMCP:
         return None
 
 
+class DummyContext:
+    pass
+
+
 fake_fastmcp_module.FastMCP = DummyFastMCP
+fake_fastmcp_module.Context = DummyContext
 fake_server_module = types.ModuleType("mcp.server")
 fake_server_module.fastmcp = fake_fastmcp_module
 fake_mcp_module = types.ModuleType("mcp")
@@ -59,31 +66,127 @@ class TestServer(unittest.TestCase):
         self.assertIn("- cal: calculator", text)
         self.assertIn("- time: clock", text)
 
+    @patch(
+        "mcp_multiskill.server.list_skills_summary",
+        return_value=[{"name": f"s{index}", "description": f"d{index}"} for index in range(5)],
+    )
+    def test_skills_index_pages(self, _mock_summary) -> None:
+        first = server.skills_index(0, 2)
+        last = server.skills_index(4, 2)
+
+        self.assertIn("- s1: d1", first)
+        self.assertNotIn("- s2: d2", first)
+        self.assertIn("Showing 1-2 of 5 skills; call get_skill_index(offset=2) for more.", first)
+        self.assertIn("Showing 5-5 of 5 skills.", last)
+        self.assertNotIn("Showing", server.skills_index())
+        self.assertIn("No skills at offset 9", server.skills_index(9, 2))
+
+    @patch("mcp_multiskill.server.search_skills", return_value=[{"name": "cal", "description": "calculator", "score": 1.5}])
+    def test_search_skills_lists_matches(self, mock_search) -> None:
+        text = asyncio.run(server.search_skills_tool("add numbers", limit=3))
+
+        self.assertIn("- cal: calculator", text)
+        mock_search.assert_called_once_with("add numbers", 3)
+        mock_search.return_value = []
+        self.assertEqual(asyncio.run(server.search_skills_tool("zzz")), "No skills match 'zzz'.")
+
     @patch("mcp_multiskill.server.skills_index", return_value="# Skills")
     def test_get_skill_index_delegates(self, mock_skills_index) -> None:
         result = server.get_skill_index()
 
         self.assertEqual(result, "# Skills")
-        mock_skills_index.assert_called_once_with()
+        mock_skills_index.assert_called_once_with(0, None)
 
-    @patch("mcp_multiskill.server.render_skill_for_client", return_value="skill detail")
+    @patch("mcp_multiskill.server.render_skill_for_client", new_callable=AsyncMock, return_value="skill detail")
     def test_get_skill_delegates(self, mock_render) -> None:
-        result = server.get_skill("cal")
+        result = asyncio.run(server.get_skill("cal"))
 
         self.assertEqual(result, "skill detail")
-        mock_render.assert_called_once_with("cal")
+        mock_render.assert_called_once_with("cal", compact=True)
+
+    @patch("mcp_multiskill.server.render_skill_for_client", new_callable=AsyncMock, return_value="full detail")
+    def test_get_skill_full_renders_schemas(self, mock_render) -> None:
+        self.assertEqual(asyncio.run(server.get_skill("cal", full=True)), "full detail")
+        mock_render.assert_called_once_with("cal", compact=False)
+
+    @patch("mcp_multiskill.server.render_script_for_client", new_callable=AsyncMock, return_value="### main.py")
+    def test_get_skill_script_delegates(self, mock_render) -> None:
+        self.assertEqual(asyncio.run(server.get_skill_script("cal", "main")), "### main.py")
+        mock_render.assert_called_once_with("cal", "main")
 
-    @patch("mcp_multiskill.server.run_skill_script", return_value={"returncode": 0})
+    @patch("mcp_multiskill.server.run_skill_script", new_callable=AsyncMock, return_value={"returncode": 0})
     def test_run_skill_delegates(self, mock_run_skill_script) -> None:
-        result = server.run_skill("cal", "main", ["--x", "1"])
+        result = asyncio.run(server.run_skill("cal", "main", ["--x", "1"]))
 
         self.assertEqual(result, {"returncode": 0})
         mock_run_skill_script.assert_called_once_with(
             skill_name="cal",
             script_name="main",
             argv=["--x", "1"],
+            stdin=None,
+            timeout=None,
+            on_output=None,
+            stdin_handle=None,
+            stdin_base64=None,
+            binary_stdout=False,
         )
 
+    def test_run_skill_stream_forwards_to_context(self) -> None:
+        ctx = AsyncMock()
+
+        async def fake_run(**kwargs):
+            await kwargs["on_output"]("stdout", "第一行\n".encode("utf-8"))
+            await kwargs["on_output"]("stderr", b"warn\n")
+            return {"returncode": 0}
+
+        with patch("mcp_multiskill.server.run_skill_script", side_effect=fake_run):
+            result = asyncio.run(server.run_skill("cal", "main", stream=True, ctx=ctx))
+
+        self.assertEqual(result, {"returncode": 0})
+        ctx.log.assert_any_call("info", "第一行\n", logger_name="stdout")
+        ctx.log.assert_any_call("info", "warn\n", logger_name="stderr")
+        self.assertEqual(ctx.report_progress.call_args_list[-1].args, (15,))
+
+    @patch("mcp_multiskill.server.run_skill_batch", new_callable=AsyncMock, return_value={"results": []})
+    def test_run_skill_batch_delegates(self, mock_batch) -> None:
+        items = [{"skill_name": "cal", "script_name": "main"}]
+
+        result = asyncio.run(server.run_skill_batch_tool(items, fail_fast=True))
+
+        self.assertEqual(result, {"results": []})
+        mock_batch.assert_called_once_with(items, max_parallel=None, fail_fast=True, timeout=None, gate=ANY)
+
+    @patch("mcp_multiskill.server.run_skill_pipeline", new_callable=AsyncMock, return_value={"returncode": 0})
+    def test_run_skill_pipeline_delegates(self, mock_pipeline) -> None:
+        steps = [{"skill_name": "simple_memory", "script_name": "load"}, {"skill_name": "simple_memory", "script_name": "save"}]
+
+        result = asyncio.run(server.run_skill_pipeline_tool(steps, stdin="x"))
+
+        self.assertEqual(result, {"returncode": 0})
+        mock_pipeline.assert_called_once_with(steps, stdin="x", stdin_handle=None, timeout=None, on_output=None)
+
+    @patch("mcp_multiskill.server.read_skill_output_page", return_value={"eof": True})
+    def test_read_skill_output_delegates(self, mock_read) -> None:
+        self.assertEqual(server.read_skill_output("stdout-abc", 10), {"eof": True})
+        mock_read.assert_called_once_with("stdout-abc", 10, 65536, "utf-8")
+
+    def test_write_and_delete_payload(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, patch.object(server.scratch_area, "_root", Path(tmp)):
+            first = server.write_payload("AAEC")
+            second = server.write_payload("aGk=", handle=first["handle"])
+
+            self.assertEqual(second, {"handle": first["handle"], "total_bytes": 5})
+            self.assertEqual((Path(tmp) / first["handle"]).read_bytes(), b"\x00\x01\x02hi")
+            self.assertEqual(server.delete_payload(first["handle"]), {"handle": first["handle"], "deleted": True})
+            with self.assertRaisesRegex(ValueError, "Invalid base64"):
+                server.write_payload("not base64!")
+
+    def test_get_server_stats_collects_sections(self) -> None:
+        stats = server.get_server_stats()
+
+        for section in ("prewarm", "registry", "schema_cache", "environments", "workers", "concurrency", "metrics"):
+            self.assertIn(section, stats)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "skills" / "simple_memory"))
+
+from _store import MemoryStore
+
+
+class TestMemoryStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = Path(self._tmp.name)
+        self.legacy = self.tmp / "memorys"
+        self.legacy.mkdir()
+        (self.legacy / "old_note.md").write_text("旧的记忆：向量数据库选型", encoding="utf-8")
+        (self.legacy / "trip.md").write_text("Trip to Kyoto in spring", encoding="utf-8")
+
+    def _store(self) -> MemoryStore:
+        store = MemoryStore(self.tmp / "memorys.sqlite3", self.legacy)
+        self.addCleanup(store.close)
+        return store
+
+    def test_migrates_legacy_directory_once(self) -> None:
+        store = self._store()
+
+        self.assertEqual(store.load(["old_note", "trip"])["trip"], "Trip to Kyoto in spring")
+        (self.legacy / "late.md").write_text("added after migration", encoding="utf-8")
+        self.assertEqual(store.migrate(self.legacy), 0)
+        self.assertEqual(store.list_names()[1], 2)
+
+    def test_save_overwrites_and_bulk_load_skips_missing(self) -> None:
+        store = self._store()
+        store.save("trip", "Trip to Osaka")
+        store.save("new", "fresh")
+
+        found = store.load(["trip", "new", "missing"])
+
+        self.assertEqual(found, {"trip": "Trip to Osaka", "new": "fresh"})
+
+    def test_list_pages_and_filters_by_prefix(self) -> None:
+        store = self._store()
+        for index in range(5):
+            store.save(f"log_{index}", "x")
+
+        self.assertEqual(store.list_names("log_", 1, 2), (["log_1", "log_2"], 5))
+        self.assertEqual(store.list_names(offset=6)[0], ["trip"])
+
+    def test_search_full_text_and_short_queries(self) -> None:
+        store = self._store()
+
+        self.assertEqual([name for name, _snippet in store.search("kyoto")], ["trip"])
+        name, snippet = store.search("向量数据")[0]
+        self.assertEqual(name, "old_note")
+        self.assertIn("[向量数据]", snippet)
+        self.assertEqual([name for name, _snippet in store.search("记忆")], ["old_note"])
+
+
+if __name__ == "__main__":
+    unittest.main()
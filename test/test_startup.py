@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# 本包自身模块（不含 mcp 依赖）的导入耗时上限，留足余量避免在慢机器上误报
+SERVER_IMPORT_BUDGET_MS = 150
+HOOK_IMPORT_BUDGET_MS = 20
+
+
+def import_times(code: str) -> dict[str, tuple[int, int]]:
+    """Module -> (self_us, cumulative_us) from ``python -X importtime``."""
+    env = os.environ.copy()
+    env.pop("PRINT_MCP_SCHEMA", None)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def own_modules(times: dict[str, tuple[int, int]]) -> set[str]:
+    return {name for name in times if name == "mcp_multiskill" or name.startswith("mcp_multiskill.")}
+
+
+class TestStartupImports(unittest.TestCase):
+    def test_skill_hook_imports_nothing_else(self) -> None:
+        times = import_times(
+            "import argparse\n"
+            "from mcp_multiskill.parser_to_schema import get_parser_json\n"
+            "get_parser_json(argparse.ArgumentParser())\n"
+        )
+
+        self.assertEqual(own_modules(times), {"mcp_multiskill", "mcp_multiskill.parser_to_schema"})
+        self.assertNotIn("json", times)
+        self.assertNotIn("argparse_to_json", times)
+        self.assertLess(times["mcp_multiskill.parser_to_schema"][1] / 1000, HOOK_IMPORT_BUDGET_MS)
+
+    def test_server_defers_heavy_modules(self) -> None:
+        # 其他测试会往 sys.modules 塞入假的 mcp，只能在子进程里判断是否真的安装了
+        if subprocess.run([sys.executable, "-c", "import mcp"], capture_output=True).returncode != 0:
+            self.skipTest("mcp is not installed")
+        times = import_times("import mcp_multiskill.server")
+        loaded = own_modules(times)
+
+        for lazy in ("search", "static_schema", "validation", "worker_pool"):
+            self.assertNotIn(f"mcp_multiskill.{lazy}", loaded)
+        own_ms = sum(times[name][0] for name in loaded) / 1000
+        self.assertLess(own_ms, SERVER_IMPORT_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import os
+import subprocess
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ProcessResult
+from mcp_multiskill.static_schema import extract_parser_spec, extract_static_schema
+
+
+HAS_CONVERTER = importlib.util.find_spec("argparse_to_json") is not None
+
+BUNDLED_SCRIPTS = [
+    REPO_ROOT / "skills" / "cal" / "main.py",
+    REPO_ROOT / "skills" / "simple_memory" / "load.py",
+    REPO_ROOT / "skills" / "simple_memory" / "save.py",
+    REPO_ROOT / "skills" / "simple_memory" / "search.py",
+]
+
+HEADER = """\
+import argparse
+from mcp_multiskill.parser_to_schema import get_parser_json
+"""
+
+PARITY_CASES = {
+    "positional_and_types": """
+        parser = argparse.ArgumentParser(description="demo")
+        parser.add_argument("path", help="input path")
+        parser.add_argument("extra", nargs="?", default="x")
+        parser.add_argument("rest", nargs="*")
+        parser.add_argument("-n", "--count", type=int, default=3, help="how many")
+        parser.add_argument("--ratio", type=float, required=True)
+        if get_parser_json(parser):
+            exit(0)
+    """,
+    "actions": """
+        def build():
+            parser = argparse.ArgumentParser()
+            parser.add_argument("--verbose", action="store_true", help="talk more")
+            parser.add_argument("--quiet", action="store_false")
+            parser.add_argument("--mode", action="store_const", const="fast")
+            parser.add_argument("--tag", action="append", type=int, help="tags")
+            parser.add_argument("--flag", action="append_const", const=1)
+            parser.add_argument("--dry-run", dest="dry", action="store_true")
+            if get_parser_json(parser):
+                exit(0)
+            return parser.parse_args()
+
+        if __name__ == "__main__":
+            build()
+    """,
+    "choices_and_metavar": """
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--op", choices=("add", "sub"), metavar="OP", help="operation")
+        parser.add_argument("--level", choices=[1, 2, 3], type=int)
+        parser.add_argument("--empty", choices=[])
+        parser.add_argument("--pair", nargs=2, metavar=("A", "B"))
+        parser.add_argument("-x")
+        if get_parser_json(parser):
+            exit(0)
+    """,
+}
+
+DYNAMIC_CASES = {
+    "loop": """
+        parser = argparse.ArgumentParser()
+        for name in ("a", "b"):
+            parser.add_argument(f"--{name}")
+        get_parser_json(parser)
+    """,
+    "subparsers": """
+        parser = argparse.ArgumentParser()
+        sub = parser.add_subparsers()
+        get_parser_json(parser)
+    """,
+    "helper": """
+        parser = argparse.ArgumentParser()
+        configure(parser)
+        get_parser_json(parser)
+    """,
+    "non_literal_help": """
+        HELP = "computed"
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--a", help=HELP)
+        get_parser_json(parser)
+    """,
+    "custom_type": """
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--when", type=parse_date)
+        get_parser_json(parser)
+    """,
+    "count_action": """
+        parser = argparse.ArgumentParser()
+        parser.add_argument("-v", action="count")
+        get_parser_json(parser)
+    """,
+    "without_hook": """
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--a")
+        parser.parse_args()
+    """,
+    "argument_after_hook": """
+        parser = argparse.ArgumentParser()
+        get_parser_json(parser)
+        parser.add_argument("--a")
+    """,
+    "two_parsers": """
+        parser = argparse.ArgumentParser()
+        other = argparse.ArgumentParser()
+        get_parser_json(parser)
+    """,
+}
+
+
+def _write_script(directory: Path, name: str, body: str) -> Path:
+    path = directory / f"{name}.py"
+    path.write_text(HEADER + textwrap.dedent(body), encoding="utf-8")
+    return path
+
+
+def _hook_schema(script: Path):
+    env = os.environ.copy()
+    env["PRINT_MCP_SCHEMA"] = "1"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT / "src"), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, str(script)],
+        capture_output=True,
+        text=True,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        cwd=script.parent,
+    )
+    if result.returncode != 0:
+        raise AssertionError(f"hook failed for {script}: {result.stderr}")
+    return json.loads(result.stdout)
+
+
+class TestStaticSchemaParity(unittest.TestCase):
+    @unittest.skipUnless(HAS_CONVERTER, "argparse_to_json is not installed")
+    def test_bundled_skills_match_hook_output(self) -> None:
+        for script in BUNDLED_SCRIPTS:
+            with self.subTest(script=script.name):
+                static = extract_static_schema(script)
+                self.assertIsNotNone(static)
+                self.assertEqual(static, _hook_schema(script))
+
+    @unittest.skipUnless(HAS_CONVERTER, "argparse_to_json is not installed")
+    def test_synthetic_parsers_match_hook_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, body in PARITY_CASES.items():
+                with self.subTest(case=name):
+                    script = _write_script(Path(tmp), name, body)
+                    static = extract_static_schema(script)
+                    self.assertIsNotNone(static)
+                    self.assertEqual(static, _hook_schema(script))
+
+
+class TestStaticSchemaExtraction(unittest.TestCase):
+    def test_dynamic_parsers_are_not_extracted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, body in DYNAMIC_CASES.items():
+                with self.subTest(case=name):
+                    script = _write_script(Path(tmp), name, body)
+                    self.assertIsNone(extract_static_schema(script))
+
+    def test_unparseable_or_missing_script(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            broken = Path(tmp) / "broken.py"
+            broken.write_text("def (:\n", encoding="utf-8")
+
+            self.assertIsNone(extract_static_schema(broken))
+            self.assertIsNone(extract_static_schema(Path(tmp) / "missing.py"))
+
+    def test_parser_spec_keeps_types_and_defaults(self) -> None:
+        spec = extract_parser_spec(REPO_ROOT / "skills" / "cal" / "main.py")
+
+        self.assertEqual(spec.description, "A simple calculator.")
+        self.assertEqual([arg.option_strings for arg in spec.arguments], [["--a"], ["--b"], ["--o"]])
+        self.assertEqual([arg.type for arg in spec.arguments], ["float", "float", None])
+        self.assertEqual(spec.arguments[2].choices, ["+", "-"])
+
+        load_spec = extract_parser_spec(REPO_ROOT / "skills" / "simple_memory" / "load.py")
+        self.assertEqual(load_spec.arguments[0].action, "append")
+        self.assertEqual(load_spec.arguments[1].action, "store_true")
+        self.assertIs(load_spec.arguments[1].default, False)
+        self.assertEqual(load_spec.arguments[2].default, "")
+        self.assertEqual(load_spec.arguments[3].type, "int")
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_get_script_schema_skips_subprocess_for_static_parsers(self, mock_run) -> None:
+        script = REPO_ROOT / "skills" / "cal" / "main.py"
+
+        schema = asyncio.run(load_skill._get_script_schema(script, script.parent))
+
+        self.assertEqual(schema["schema"]["o"]["enum"], ["+", "-"])
+        mock_run.assert_not_called()
+
+    @patch.dict(os.environ, {"MCP_MULTISKILL_STATIC_SCHEMA": "0", "MCP_MULTISKILL_SCHEMA_CACHE": "0"})
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_static_extraction_can_be_disabled(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=0, stdout="{}", stderr="")
+        script = REPO_ROOT / "skills" / "cal" / "main.py"
+
+        asyncio.run(load_skill._get_script_schema(script, script.parent))
+
+        mock_run.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
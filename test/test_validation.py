@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ProcessResult
+from mcp_multiskill.validation import VALIDATE_ENV, get_argv_validator
+
+
+SCRIPT = textwrap.dedent(
+    """
+    import argparse
+    from mcp_multiskill.parser_to_schema import get_parser_json
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--ratio", type=float)
+    parser.add_argument("--mode", choices=["fast", "slow"])
+    parser.add_argument("-v", "--verbose", action="store_true")
+    if get_parser_json(parser):
+        exit(0)
+    args = parser.parse_args()
+    """
+)
+
+
+class TestArgvValidator(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.script = Path(self._tmp.name) / "main.py"
+        self.script.write_text(SCRIPT, encoding="utf-8")
+        self.validator = get_argv_validator(self.script)
+
+    def test_accepts_what_argparse_accepts(self) -> None:
+        for argv in (
+            ["in.txt", "--count", "3"],
+            ["--count=3", "in.txt", "--ratio", "-0.5", "--mode", "slow", "-v"],
+            ["--cou", "3", "--", "-in.txt"],
+            ["--help"],
+        ):
+            with self.subTest(argv=argv):
+                self.assertEqual(self.validator.validate(argv), [])
+
+    def test_defers_short_option_clusters_to_the_script(self) -> None:
+        self.assertEqual(self.validator.validate(["-vx", "in.txt", "--count", "1"]), [])
+
+    def test_reports_argparse_errors(self) -> None:
+        cases = {
+            ("in.txt", "--count", "x"): ["argument --count: invalid int value: 'x'"],
+            ("in.txt", "--count", "1", "--ratio", "abc"): ["argument --ratio: invalid float value: 'abc'"],
+            ("in.txt", "--count", "1", "--mode", "warp"): ["argument --mode: invalid choice: 'warp' (choose from 'fast', 'slow')"],
+            ("in.txt",): ["the following arguments are required: --count"],
+            ("--count", "1"): ["the following arguments are required: path"],
+            ("in.txt", "--count", "1", "--depth", "2"): ["unrecognized arguments: --depth 2"],
+            ("in.txt", "--count"): ["argument --count: expected one argument"],
+            ("in.txt", "--count", "1", "--verbose=yes"): ["argument -v/--verbose: ignored explicit argument 'yes'"],
+        }
+        for argv, expected in cases.items():
+            with self.subTest(argv=argv):
+                self.assertEqual(self.validator.validate(list(argv)), expected)
+
+    def test_reports_only_the_first_error(self) -> None:
+        self.assertEqual(
+            self.validator.validate(["--count", "x", "--ratio", "y", "--depth"]),
+            ["argument --count: invalid int value: 'x'"],
+        )
+
+    def test_suggested_usage_passes_validation(self) -> None:
+        usage = self.validator.usage
+        argv = []
+        for token in usage.split()[2:]:
+            token = token.strip("[]")
+            if token.startswith("{"):
+                argv.append(token.strip("{}").split(",")[0])
+            elif token.isupper():
+                argv.append("1")
+            else:
+                argv.append(token)
+
+        self.assertEqual(usage, "main.py [-h] --count COUNT [--ratio RATIO] [--mode {fast,slow}] [-v] path")
+        self.assertEqual(self.validator.validate(argv), [])
+
+    def test_validator_is_cached_until_script_changes(self) -> None:
+        self.assertIs(get_argv_validator(self.script), self.validator)
+
+        self.script.write_text(SCRIPT.replace("args = parser.parse_args()", "args, _ = parser.parse_known_args()") + "\n", encoding="utf-8")
+
+        self.assertIsNone(get_argv_validator(self.script))
+
+
+class TestRunSkillValidation(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.skill_dir = self.root / "demo"
+        self.skill_dir.mkdir()
+        (self.skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
+        (self.skill_dir / "main.py").write_text(SCRIPT, encoding="utf-8")
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_invalid_argv_is_rejected_without_spawning(self, mock_run) -> None:
+        result = asyncio.run(load_skill.run_skill_script("demo", "main", ["in.txt", "--count", "x"], skills_root=self.root))
+
+        mock_run.assert_not_called()
+        self.assertEqual(result["returncode"], 2)
+        self.assertEqual(result["argv_errors"], ["argument --count: invalid int value: 'x'"])
+        self.assertEqual(
+            result["stderr"],
+            f"usage: {result['usage']}\nmain.py: error: argument --count: invalid int value: 'x'\n",
+        )
+        self.assertTrue(result["usage"].startswith("main.py [-h] "))
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_opt_out_passes_argv_to_script(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=2, stdout="", stderr="usage: ...")
+        (self.skill_dir / "pyproject.toml").write_text(
+            '[project]\nname = "demo"\n\n[tool.mcp-multiskill]\nvalidate_argv = false\n',
+            encoding="utf-8",
+        )
+
+        asyncio.run(load_skill.run_skill_script("demo", "main", ["--bogus"], skills_root=self.root))
+        (self.skill_dir / "pyproject.toml").unlink()
+        with patch.dict(os.environ, {VALIDATE_ENV: "0"}):
+            asyncio.run(load_skill.run_skill_script("demo", "main", ["--bogus"], skills_root=self.root))
+
+        self.assertEqual(mock_run.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mcp_multiskill import load_skill
+from mcp_multiskill.executor import ProcessResult
+from mcp_multiskill.output import SPILL_OUTPUT_ENV
+from mcp_multiskill.worker_pool import WORKER_SCRIPT, WorkerCrashed, WorkerLost, WorkerPool
+
+
+def local_launcher(_skill_dir: Path):
+    return [sys.executable, str(WORKER_SCRIPT)], os.environ.copy()
+
+
+ECHO_SCRIPT = """
+import os
+import sys
+
+data = sys.stdin.read()
+print("argv=" + ",".join(sys.argv[1:]))
+print("stdin=" + data)
+print("pid=" + str(os.getpid()))
+print("to-stderr", file=sys.stderr)
+if "--fail" in sys.argv:
+    sys.exit(3)
+if "--raise" in sys.argv:
+    raise ValueError("bad input")
+if "--crash" in sys.argv:
+    os._exit(9)
+if "--sleep" in sys.argv:
+    import time
+    time.sleep(30)
+if "--flood" in sys.argv:
+    line = "x" * 99 + "\\n"
+    for _ in range(50_000):
+        sys.stdout.write(line)
+"""
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.skill_dir = Path(self._tmp.name) / "demo"
+        self.skill_dir.mkdir()
+        (self.skill_dir / "SKILL.md").write_text("desc", encoding="utf-8")
+        self.script = self.skill_dir / "echo.py"
+        self.script.write_text(textwrap.dedent(ECHO_SCRIPT), encoding="utf-8")
+
+    def _pool(self, **kwargs) -> WorkerPool:
+        pool = WorkerPool(1, launcher=local_launcher, **kwargs)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    @staticmethod
+    def _pid(result) -> str:
+        return next(line for line in result["stdout"].splitlines() if line.startswith("pid="))
+
+    def test_execute_captures_argv_stdin_and_streams(self) -> None:
+        pool = self._pool()
+
+        result = pool.execute(self.skill_dir, self.script, ["--x", "1"], "hello")
+
+        self.assertEqual(result["returncode"], 0)
+        self.assertIn("argv=--x,1", result["stdout"])
+        self.assertIn("stdin=hello", result["stdout"])
+        self.assertEqual(result["stderr"], "to-stderr\n")
+
+    def test_exit_codes_follow_interpreter_semantics(self) -> None:
+        pool = self._pool()
+
+        self.assertEqual(pool.execute(self.skill_dir, self.script, ["--fail"])["returncode"], 3)
+        raised = pool.execute(self.skill_dir, self.script, ["--raise"])
+        self.assertEqual(raised["returncode"], 1)
+        self.assertIn("ValueError: bad input", raised["stderr"])
+
+    def test_worker_is_reused_and_state_is_fresh(self) -> None:
+        pool = self._pool()
+
+        first = pool.execute(self.skill_dir, self.script, ["a"], "one")
+        second = pool.execute(self.skill_dir, self.script, ["b"])
+
+        self.assertEqual(self._pid(first), self._pid(second))
+        self.assertIn("argv=b", second["stdout"])
+        self.assertIn("stdin=\n", second["stdout"])
+        self.assertEqual(pool.stats()["spawned"], 1)
+
+    def test_worker_recycled_after_max_requests(self) -> None:
+        pool = self._pool(max_requests=2)
+
+        pids = [self._pid(pool.execute(self.skill_dir, self.script, [])) for _ in range(3)]
+
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(pool.stats()["recycled"], 1)
+
+    def test_idle_workers_are_evicted(self) -> None:
+        pool = self._pool(idle_timeout=60)
+        pool.execute(self.skill_dir, self.script, [])
+
+        self.assertEqual(pool.evict_idle(), 0)
+        self.assertEqual(pool.evict_idle(now=float("inf")), 1)
+        self.assertEqual(pool.stats()["idle"], 0)
+
+    def test_crash_while_running_fails_and_replaces_worker(self) -> None:
+        pool = self._pool()
+
+        crashed = pool.execute(self.skill_dir, self.script, ["--crash"])
+
+        self.assertEqual(crashed["returncode"], -1)
+        self.assertIn("exited while running echo.py", crashed["worker_error"])
+        self.assertEqual(pool.stats()["crashed"], 1)
+        self.assertEqual(pool.execute(self.skill_dir, self.script, [])["returncode"], 0)
+
+    def test_only_undelivered_requests_fall_back_and_cancel_is_not_a_crash(self) -> None:
+        pool = self._pool()
+        pool.execute(self.skill_dir, self.script, [])
+        worker = pool._idle[self.skill_dir][0]
+        worker.process.stdin.close()
+
+        with self.assertRaises(WorkerCrashed) as raised:
+            worker.execute(self.script, [], None)
+        self.assertNotIsInstance(raised.exception, WorkerLost)
+        pool._idle[self.skill_dir].clear()
+        pool._retire(worker)
+
+        cancel = threading.Event()
+        threading.Timer(0.2, cancel.set).start()
+        self.assertIsNone(pool.execute(self.skill_dir, self.script, ["--sleep"], cancel=cancel))
+        self.assertEqual(pool.stats()["crashed"], 0)
+
+    def test_launcher_errors_release_the_slot(self) -> None:
+        def failing_launcher(_skill_dir):
+            raise RuntimeError("no interpreter")
+
+        pool = WorkerPool(1, launcher=failing_launcher)
+
+        with self.assertRaisesRegex(RuntimeError, "no interpreter"):
+            pool.execute(self.skill_dir, self.script, [])
+        self.assertEqual(pool.stats()["live"], {})
+
+    def test_timeout_kills_worker_and_reports(self) -> None:
+        pool = self._pool()
+
+        result = pool.execute(self.skill_dir, self.script, ["--sleep"], timeout=0.3)
+
+        self.assertTrue(result["timed_out"])
+        self.assertEqual(pool.stats()["live"], {})
+        self.assertEqual(pool.execute(self.skill_dir, self.script, [])["returncode"], 0)
+
+    def test_waiting_for_a_busy_worker_honours_cancel_and_timeout(self) -> None:
+        pool = self._pool()
+        busy = threading.Thread(target=pool.execute, args=(self.skill_dir, self.script, ["--sleep"]), kwargs={"timeout": 1.5})
+        busy.start()
+        self.addCleanup(busy.join)
+        time.sleep(0.3)
+
+        started = time.monotonic()
+        timed_out = pool.execute(self.skill_dir, self.script, [], timeout=0.2)
+        waited = time.monotonic() - started
+        cancel = threading.Event()
+        threading.Timer(0.2, cancel.set).start()
+        started = time.monotonic()
+        cancelled = pool.execute(self.skill_dir, self.script, [], cancel=cancel)
+        cancelled_after = time.monotonic() - started
+
+        self.assertTrue(timed_out["timed_out"])
+        self.assertLess(waited, 0.6)
+        self.assertIsNone(cancelled)
+        self.assertLess(cancelled_after, 0.6)
+
+    def test_output_streams_in_chunks(self) -> None:
+        pool = self._pool()
+        chunks = []
+
+        result = pool.execute(self.skill_dir, self.script, ["--flood"], on_output=lambda name, chunk: chunks.append((name, len(chunk))))
+
+        self.assertEqual(result["returncode"], 0)
+        self.assertNotIn("stdout", result)
+        stdout_sizes = [size for name, size in chunks if name == "stdout"]
+        self.assertGreater(len(stdout_sizes), 10)
+        self.assertLessEqual(max(stdout_sizes), 64 * 1024)
+        self.assertGreater(sum(stdout_sizes), 5_000_000)
+
+    def test_spawn_failure_returns_none(self) -> None:
+        def broken_launcher(_skill_dir):
+            return ["/nonexistent/python"], os.environ.copy()
+
+        pool = WorkerPool(1, launcher=broken_launcher)
+
+        self.assertIsNone(pool.execute(self.skill_dir, self.script, []))
+        self.assertEqual(pool.stats()["live"], {})
+
+    @patch("mcp_multiskill.load_skill.run_process", new_callable=AsyncMock)
+    def test_run_skill_script_uses_pool_and_falls_back(self, mock_run) -> None:
+        mock_run.return_value = ProcessResult(returncode=9, stdout="cold", stderr="")
+        pool = self._pool()
+
+        broken = WorkerPool(1, launcher=lambda _skill_dir: (["/nonexistent/python"], os.environ.copy()))
+
+        with patch("mcp_multiskill.worker_pool.get_worker_pool", return_value=pool):
+            warm = asyncio.run(load_skill.run_skill_script("demo", "echo", ["x"], skills_root=self.skill_dir.parent))
+            crashed = asyncio.run(load_skill.run_skill_script("demo", "echo", ["--crash"], skills_root=self.skill_dir.parent))
+        with patch("mcp_multiskill.worker_pool.get_worker_pool", return_value=broken):
+            cold = asyncio.run(load_skill.run_skill_script("demo", "echo", ["x"], skills_root=self.skill_dir.parent))
+
+        self.assertEqual(warm["returncode"], 0)
+        self.assertIn("argv=x", warm["stdout"])
+        self.assertIn("echo.py", " ".join(warm["command"]))
+        # 脚本已在 worker 里开始执行，崩溃后不再冷启动重跑
+        self.assertEqual(crashed["returncode"], -1)
+        self.assertIn("[mcp-multiskill] worker for demo exited", crashed["stderr"])
+        self.assertEqual(cold["stdout"], "cold")
+        mock_run.assert_called_once()
+
+    def test_warm_runs_apply_output_caps(self) -> None:
+        pool = self._pool()
+
+        with (
+            patch("mcp_multiskill.worker_pool.get_worker_pool", return_value=pool),
+            patch.dict(os.environ, {SPILL_OUTPUT_ENV: "0"}),
+        ):
+            result = asyncio.run(
+                load_skill.run_skill_script(
+                    "demo", "echo", ["--flood"], skills_root=self.skill_dir.parent, max_output_bytes=4096
+                )
+            )
+
+        self.assertEqual(result["returncode"], 0)
+        self.assertEqual(pool.stats()["spawned"], 1)
+        self.assertGreater(result["truncated"]["stdout"]["total_bytes"], 5_000_000)
+        self.assertLess(len(result["stdout"]), 4096 + 200)
+
+
+if __name__ == "__main__":
+    unittest.main()